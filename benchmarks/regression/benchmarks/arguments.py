@@ -9,7 +9,7 @@ timeout = 600.0
 class Processing:
 
     def setup(self):
-        grid = Grid(shape=(5, 5, 5))
+        grid = self.grid = Grid(shape=(5, 5, 5))
 
         funcs = [Function(name='f%d' % n, grid=grid) for n in range(30)]
         tfuncs = [TimeFunction(name='u%d' % n, grid=grid) for n in range(30)]
@@ -27,3 +27,26 @@ class Processing:
 
     def time_processing(self):
         self.op.arguments(time_M=98)
+
+
+class Apply(Processing):
+
+    def time_processing(self):
+        # Full arguments processing, followed by the (tiny) execution
+        self.op.apply(time_M=98)
+
+
+class BoundApply(Processing):
+
+    def setup(self):
+        super().setup()
+
+        self.bop = self.op.bind(time_M=98)
+
+        self.tfuncs = [TimeFunction(name='w%d' % n, grid=self.grid) for n in range(30)]
+
+    def time_processing(self):
+        # The overrides are patched into the bound arguments, followed by the
+        # same execution as in `Apply`
+        self.bop.apply(**{'u%d' % n: f for n, f in enumerate(self.tfuncs)},
+                       time_M=98)
@@ -1,15 +1,32 @@
+from devito import switchconfig
 from examples.seismic.tti.tti_example import tti_setup
+from examples.seismic.elastic.elastic_example import elastic_setup
+from examples.seismic.viscoacoustic.viscoacoustic_example import viscoacoustic_setup
 
 
 repeat = 3
 
 
-class TTI:
+class Codegen:
+
+    """
+    Base class for the code generation benchmarks. These only time the
+    construction of an Operator (i.e., the lowering), not its jit-compilation
+    nor its execution, so that compile-time regressions are caught in isolation.
+    """
 
     # ASV config
     repeat = 1
+    number = 1
     timeout = 600.0
 
+    def _build_profile(self, op_maker):
+        with switchconfig(profiling_build=True):
+            return op_maker().build_profile
+
+
+class TTI(Codegen):
+
     space_order = 12
 
     def setup(self):
@@ -20,3 +37,54 @@ class TTI:
 
     def time_adjoint(self):
         self.solver.op_adj()
+
+    def track_forward_peakmem(self):
+        return self._build_profile(self.solver.op_fwd).memory
+
+    track_forward_peakmem.unit = 'bytes'
+
+
+class Elastic(Codegen):
+
+    # ASV parametrization
+    params = ([(50, 50), (50, 50, 50)],)
+    param_names = ['shape']
+
+    space_order = 8
+
+    def setup(self, shape):
+        self.solver = elastic_setup(shape=shape, spacing=(15.0,)*len(shape),
+                                    space_order=Elastic.space_order)
+
+    def time_forward(self, shape):
+        self.solver.op_fwd()
+
+    def track_forward_peakmem(self, shape):
+        return self._build_profile(self.solver.op_fwd).memory
+
+    track_forward_peakmem.unit = 'bytes'
+
+
+class Viscoacoustic(Codegen):
+
+    # ASV parametrization
+    params = (['sls', 'kv', 'maxwell'],)
+    param_names = ['kernel']
+
+    space_order = 8
+
+    def setup(self, kernel):
+        self.solver = viscoacoustic_setup(shape=(50, 50, 50), spacing=(15.0,)*3,
+                                          space_order=Viscoacoustic.space_order,
+                                          kernel=kernel)
+
+    def time_forward(self, kernel):
+        self.solver.op_fwd()
+
+    def time_adjoint(self, kernel):
+        self.solver.op_adj()
+
+    def track_forward_peakmem(self, kernel):
+        return self._build_profile(self.solver.op_fwd).memory
+
+    track_forward_peakmem.unit = 'bytes'
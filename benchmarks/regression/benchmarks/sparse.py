@@ -0,0 +1,60 @@
+import numpy as np
+
+from devito import Grid, TimeFunction, SparseTimeFunction, Operator
+
+
+# ASV config
+repeat = 10
+timeout = 600.0
+
+
+class Ownership:
+
+    params = [10**4, 10**5, 10**6]
+    param_names = ['npoint']
+
+    def setup(self, npoint):
+        self.grid = Grid(shape=(201, 201, 201))
+
+        self.sf = SparseTimeFunction(name='sf', grid=self.grid, npoint=npoint, nt=2)
+        self.sf.coordinates.data[:] = np.random.rand(npoint, 3)
+
+        # Populate the cached MPI metadata
+        self.sf._dist_sync()
+        self.sf._dist_scatter_mask()
+
+    def time_glb_to_rank(self, npoint):
+        self.grid.distributor.glb_to_rank(self.sf._support)
+
+    def time_scatter_mask_cached(self, npoint):
+        self.sf._dist_sync()
+        self.sf._dist_scatter_mask()
+
+    def time_scatter_mask_moved(self, npoint):
+        # Moving the sparse points drops the cached MPI metadata
+        self.sf.coordinates.data[:] = self.sf.coordinates.data[::-1].copy()
+        self.sf._dist_sync()
+        self.sf._dist_scatter_mask()
+
+
+class Interpolation:
+
+    params = ([False, True], ['linear', 'sinc'])
+    param_names = ['tables', 'interpolation']
+
+    def setup(self, tables, interpolation):
+        grid = Grid(shape=(201, 201, 201))
+
+        u = TimeFunction(name='u', grid=grid, space_order=8)
+        rec = SparseTimeFunction(name='rec', grid=grid, npoint=201*201, nt=101,
+                                 interpolation=interpolation)
+        rec.coordinates.data[:] = np.random.rand(rec.npoint, 3)
+
+        self.op = Operator(rec.interpolate(expr=u),
+                           opt=('advanced', {'interp-tables': tables}))
+
+        # Populate the tables, if any
+        self.op.apply(time_M=0)
+
+    def time_interpolate(self, tables, interpolation):
+        self.op.apply(time_M=100)
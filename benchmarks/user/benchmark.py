@@ -1,3 +1,4 @@
+from time import time as seq_time
 import numpy as np
 import click
 import os
@@ -107,6 +108,7 @@ def benchmark():
     run-jit-backdoor: a single run using the DEVITO_JIT_BACKDOOR to
                       experiment with manual customizations
     test: tests numerical correctness with different parameters
+    tune: compares the autotuning levels (e.g., exhaustive vs model-based)
 
     Further, this script can generate a roofline plot from a benchmark
     """
@@ -367,6 +369,59 @@ def run_jit_backdoor(problem, **kwargs):
     return retval
 
 
+@benchmark.command(name='tune')
+@option_simulation
+@option_performance
+@click.option('-l', '--level', 'levels', multiple=True,
+              default=('basic', 'aggressive', 'model'),
+              type=click.Choice([i for i in configuration._accepted['autotuning']
+                                 if type(i) is not list and i != 'off']),
+              help='Autotuning levels to be compared')
+def cli_tune(problem, **kwargs):
+    """`click` interface for the `tune` mode."""
+    configuration['develop-mode'] = False
+
+    tune(problem, **kwargs)
+
+
+def tune(problem, **kwargs):
+    """
+    Compare the autotuning levels, in terms of both autotuning cost and
+    runtime achieved with the selected block shape.
+    """
+    setup = model_type[problem]['setup']
+
+    time_order = kwargs.pop('time_order')[0]
+    space_order = kwargs.pop('space_order')[0]
+    operator = kwargs.pop('operator', 'forward')
+    levels = kwargs.pop('levels')
+    for i in ['autotune', 'block_shape']:
+        kwargs.pop(i)
+
+    solver = setup(space_order=space_order, time_order=time_order, **kwargs)
+
+    # Warm-up run, so that jit-compilation doesn't pollute the measurements
+    info("Performing warm-up run ...")
+    run_op(solver, operator, autotune=False)
+
+    results = []
+    for level in levels:
+        info("Autotuning at level `%s` ..." % level)
+        tic = seq_time()
+        summary = run_op(solver, operator, autotune=(level, 'preemptive'))[-1]
+        elapsed = seq_time() - tic
+        assert isinstance(summary, PerformanceSummary)
+
+        runtime = sum(v.time for v in summary.values())
+        results.append((level, elapsed - runtime, runtime))
+
+    info("%-12s %16s %16s" % ('level', 'autotuning [s]', 'runtime [s]'))
+    for level, attime, runtime in results:
+        info("%-12s %16.2f %16.2f" % (level, attime, runtime))
+
+    return results
+
+
 @benchmark.command(name='test')
 @option_simulation
 @option_performance
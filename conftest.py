@@ -5,8 +5,7 @@ from subprocess import check_call
 import pytest
 from sympy import Add
 
-from devito import Eq, configuration, Revolver  # noqa
-from devito.checkpointing import NoopRevolver
+from devito import Eq, configuration  # noqa
 from devito.finite_differences.differentiable import EvalDerivative
 from devito.arch import Cpu64, Device, sniff_mpi_distro, Arm
 from devito.arch.compiler import (compiler_registry, IntelCompiler, OneapiCompiler,
@@ -33,7 +32,7 @@ def skipif(items, whole_module=False):
     accepted = set()
     accepted.update({'device', 'device-C', 'device-openmp', 'device-openacc',
                      'device-aomp', 'cpu64-icc', 'cpu64-icx', 'cpu64-nvc', 'cpu64-arm',
-                     'cpu64-icpx', 'chkpnt'})
+                     'cpu64-icpx'})
     accepted.update({'nodevice'})
     unknown = sorted(set(items) - accepted)
     if unknown:
@@ -83,10 +82,6 @@ def skipif(items, whole_module=False):
         if i == 'cpu64-arm' and isinstance(configuration['platform'], Arm):
             skipit = "Arm doesn't support x86-specific instructions"
             break
-        # Skip if pyrevolve not installed
-        if i == 'chkpnt' and Revolver is NoopRevolver:
-            skipit = "pyrevolve not installed"
-            break
 
     if skipit is False:
         return pytest.mark.skipif(False, reason='')
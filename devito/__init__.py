@@ -20,26 +20,23 @@ from devito.types.sparse import *  # noqa
 from devito.types.tensor import *  # noqa
 from devito.finite_differences import *  # noqa
 from devito.operations.solve import *
-from devito.operator import Operator  # noqa
+from devito.operator import Operator, BuildProfile, compile_all  # noqa
 from devito.symbolics import CondEq, CondNe  # noqa
 
 # Other stuff exposed to the user
 from devito.builtins import *  # noqa
 from devito.data.allocators import *  # noqa
 from devito.logger import error, warning, info, set_log_level  # noqa
-from devito.mpi import MPI, CustomTopology  # noqa
-try:
-    from devito.checkpointing import DevitoCheckpoint, CheckpointOperator  # noqa
-    from pyrevolve import Revolver
-except ImportError:
-    from devito.checkpointing import NoopCheckpoint as DevitoCheckpoint  # noqa
-    from devito.checkpointing import NoopCheckpointOperator as CheckpointOperator  # noqa
-    from devito.checkpointing import NoopRevolver as Revolver  # noqa
+from devito.mpi import MPI, CustomTopology, AutoTopology  # noqa
+from devito.mpi.io import *  # noqa
+from devito.checkpointing import (DevitoCheckpoint, CheckpointOperator,  # noqa
+                                  NativeRevolver, Revolver)
 
 # Imports required to initialize Devito
 from devito.arch import compiler_registry, platform_registry
 from devito.core import *   # noqa
 from devito.logger import logger_registry, _set_log_level  # noqa
+from devito.mpi.codecs import halo_codec_registry
 from devito.mpi.routines import mpi_registry
 from devito.operator import profiler_registry, operator_registry
 
@@ -78,9 +75,14 @@ preprocessor = lambda i: {0: False, 1: 'basic'}.get(i, i)
 configuration.add('mpi', 0, [0, 1] + list(mpi_registry),
                   preprocessor=preprocessor, callback=reinit_compiler)
 
+# Compression of the halo exchange messages (0 => disabled). Only relevant with MPI
+preprocessor = lambda i: {0: None}.get(i, i)
+configuration.add('mpi-codec', 0, [0] + list(halo_codec_registry),
+                  preprocessor=preprocessor)
+
 # Domain decomposition topology. Only relevant with MPI
-preprocessor = lambda i: CustomTopology._shortcuts.get(i)
-configuration.add('topology', None, [None] + list(CustomTopology._shortcuts),
+preprocessor = lambda i: CustomTopology._shortcuts.get(i, i)
+configuration.add('topology', None, [None, 'auto'] + list(CustomTopology._shortcuts),
                   preprocessor=preprocessor)
 
 # Should Devito run a first-touch Operator upon data allocation?
@@ -138,12 +140,19 @@ def autotune_callback(val):  # noqa
 
 
 # Setup autotuning
-levels = ['off', 'basic', 'aggressive', 'max']
+levels = ['off', 'basic', 'aggressive', 'max', 'model']
 modes = ['preemptive', 'destructive', 'runtime']
 accepted = levels + [list(i) for i in product(levels, modes)]
 configuration.add('autotuning', 'off', accepted, callback=autotune_callback,
                   impacts_jit=False)
 
+# Persistent autotuning database. If enabled, the autotuning results are stored
+# on disk and looked up by later runs, which then skip the autotuning phase. With
+# `autotuning-refine=N`, later runs also explore N new candidates each
+configuration.add('autotuning-db', 0, [0, 1], preprocessor=bool, impacts_jit=False)
+configuration.add('autotuning-db-dir', None, impacts_jit=False)
+configuration.add('autotuning-refine', 0, preprocessor=int, impacts_jit=False)
+
 # In develop-mode:
 # - The ALLOC_GUARD data allocator is used. This will trigger segfaults as soon
 #   as an out-of-bounds memory access is performed
@@ -154,9 +163,25 @@ configuration.add('develop-mode', False, [False, True])
 configuration.add('opt', 'advanced', list(operator_registry._accepted), deprecate='dle')
 configuration.add('opt-options', {}, deprecate='dle-options')
 
+# Persistent Operator cache. If enabled, fully lowered and jit-compiled Operators
+# are stored on disk, so that identical Operators built by other processes (e.g.,
+# later runs, or the workers of a survey) bypass code generation altogether
+configuration.add('opcache', 0, [0, 1], preprocessor=bool, impacts_jit=False)
+configuration.add('opcache-dir', None, impacts_jit=False)
+configuration.add('opcache-maxsize', 2**30, preprocessor=int, impacts_jit=False)
+
+# Content-addressed store of jit-compiled binaries, shared by a fleet of workers
+# (e.g., over a shared file system) so that each kernel is compiled only once
+configuration.add('jit-store', None, impacts_jit=False)
+configuration.add('jit-store-maxsize', 2**32, preprocessor=int, impacts_jit=False)
+
 # Setup Operator profiling
 configuration.add('profiling', 'basic', list(profiler_registry), impacts_jit=False)
 
+# Record a structured compile-time profile (see `Operator.build_profile`) for
+# each Operator. This enables `tracemalloc` while lowering, which slows it down
+configuration.add('profiling-build', 0, [0, 1], preprocessor=bool, impacts_jit=False)
+
 # Initialize `configuration`
 init_configuration()
 
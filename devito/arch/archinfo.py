@@ -657,6 +657,13 @@ class Platform:
         """Physical memory size in bytes, or None if unknown."""
         return None
 
+    @property
+    def cache_sizes(self):
+        """
+        Mapper from cache levels to data cache sizes in bytes, or None if unknown.
+        """
+        return None
+
     def memavail(self, *args, **kwargs):
         """Available physical memory in bytes, or None if unknown."""
         return None
@@ -742,6 +749,34 @@ class Cpu64(Platform):
     def memtotal(self):
         return psutil.virtual_memory().total
 
+    @cached_property
+    def cache_sizes(self):
+        # The size of each data cache instance, e.g. L2 is often private to a
+        # core while L3 is shared by all cores of a socket
+        path = '/sys/devices/system/cpu/cpu0/cache'
+        units = {'K': 2**10, 'M': 2**20, 'G': 2**30}
+        mapper = {}
+        try:
+            for i in sorted(os.listdir(path)):
+                if not i.startswith('index'):
+                    continue
+                with open(os.path.join(path, i, 'type')) as f:
+                    if f.read().strip() == 'Instruction':
+                        continue
+                with open(os.path.join(path, i, 'level')) as f:
+                    level = int(f.read())
+                with open(os.path.join(path, i, 'size')) as f:
+                    size = f.read().strip()
+                mapper[level] = int(size.rstrip('KMG')) * units.get(size[-1], 1)
+        except (OSError, ValueError):
+            pass
+
+        if not mapper:
+            warning("Cache sizes autodetection failed")
+            return None
+
+        return mapper
+
     def memavail(self, *args, **kwargs):
         return psutil.virtual_memory().available
 
@@ -16,6 +16,7 @@ from codepy.toolchain import (GCCToolchain,
 from devito.arch import (AMDGPUX, Cpu64, AppleArm, NVIDIAX, POWER8, POWER9, Graviton,
                          IntelDevice, get_nvidia_cc, check_cuda_runtime,
                          get_m1_llvm_path)
+from devito.arch.store import get_binary_store
 from devito.exceptions import CompilationError
 from devito.logger import debug, warning
 from devito.parameters import configuration
@@ -363,6 +364,17 @@ class Compiler(GCCToolchain):
                 raise ValueError("Trying to use the JIT backdoor for `%s`, but "
                                  "the file isn't present" % src_file)
 
+        # Attempt fetching the binary from the shared binary store, if any
+        store = get_binary_store()
+        if store is not None and configuration['jit-backdoor'] is False:
+            key = self._binary_key(code)
+            if self._store_fetch(store, key, target):
+                with open(src_file, 'w') as f:
+                    f.write(code)
+                return False, src_file
+        else:
+            store = None
+
         # Should the compilation command be emitted?
         debug = configuration['log-level'] == 'DEBUG'
 
@@ -380,8 +392,42 @@ class Compiler(GCCToolchain):
                                                       cache_dir=cache_dir, debug=debug,
                                                       sleep_delay=sleep_delay)
 
+        if store is not None and recompiled:
+            self._store_publish(store, key, target)
+
         return recompiled, src_file
 
+    def _binary_key(self, code):
+        """
+        The key of the binary resulting from the compilation of `code` in a
+        binary store. Besides `code`, it captures everything that may affect
+        the compiler output.
+        """
+        items = [code, self.__class__.__name__, self.cc, self.version,
+                 self.cflags, self.ldflags, self.defines, self.undefines,
+                 self.include_dirs, self.library_dirs, self.libraries,
+                 platform.machine()]
+        return sha1(''.join(str(i) for i in items).encode()).hexdigest()
+
+    def _store_fetch(self, store, key, target):
+        try:
+            fetched = store.fetch(key, '%s%s' % (target, self.so_ext))
+        except Exception as e:
+            warning("%s: couldn't access the binary store `%s` [%s]; "
+                    "falling back to local jit-compilation" % (self, store, e))
+            return False
+        if fetched:
+            debug("%s: fetched `%s` from the binary store `%s`"
+                  % (self, path.basename(target), store))
+        return fetched
+
+    def _store_publish(self, store, key, target):
+        try:
+            store.publish(key, '%s%s' % (target, self.so_ext))
+        except Exception as e:
+            warning("%s: couldn't publish `%s` to the binary store `%s` [%s]"
+                    % (self, path.basename(target), store, e))
+
     def __lookup_cmds__(self):
         self.CC = 'unknown'
         self.CXX = 'unknown'
@@ -0,0 +1,190 @@
+"""
+Content-addressed stores of jit-compiled binaries.
+
+A binary store allows a fleet of processes, possibly running on different
+machines, to compile each kernel only once: upon JIT compilation, the store is
+looked up first, and a binary is published to the store after it is compiled.
+The key of a binary is the hash of the generated code and of everything that
+may affect the compiler output (compiler, version, flags, ...).
+"""
+
+from shutil import copyfile
+import os
+import tempfile
+
+from devito.logger import warning
+from devito.parameters import configuration
+from devito.tools import memoized_func
+
+__all__ = ['BinaryStore', 'LocalBinaryStore', 'binary_store_registry',
+           'get_binary_store']
+
+
+class BinaryStore:
+
+    """
+    Abstract base class for content-addressed binary stores.
+
+    Any exception raised by a BinaryStore is interpreted by the caller as the
+    store being unreachable, in which case JIT compilation simply proceeds as
+    if there were no store.
+    """
+
+    def fetch(self, key, filename):
+        """
+        Copy the binary stored under `key` into `filename`. Return True on
+        success, False if no binary is stored under `key`.
+        """
+        raise NotImplementedError
+
+    def publish(self, key, filename):
+        """
+        Store the binary `filename` under `key`.
+        """
+        raise NotImplementedError
+
+
+class LocalBinaryStore(BinaryStore):
+
+    """
+    A BinaryStore backed by a directory, typically on a shared file system.
+
+    Both `fetch` and `publish` are atomic, that is the binary is first copied
+    into a temporary file, which is then renamed, so that readers never
+    observe partially written binaries. When the store exceeds its maximum
+    size, the least recently used binaries are evicted.
+
+    Parameters
+    ----------
+    path : str or Path
+        The store directory.
+    maxsize : int, optional
+        The maximum size of the store, in bytes. Defaults to
+        `configuration['jit-store-maxsize']`.
+    """
+
+    _suffix = '.so'
+
+    def __init__(self, path, maxsize=None):
+        self.path = str(path)
+        self._maxsize = maxsize
+
+    def __repr__(self):
+        return "LocalBinaryStore[%s]" % self.path
+
+    @property
+    def maxsize(self):
+        return self._maxsize or configuration['jit-store-maxsize']
+
+    @property
+    def entries(self):
+        """The stored binaries, from the least to the most recently used."""
+        entries = []
+        for i in os.scandir(self.path):
+            if not i.name.endswith(self._suffix):
+                continue
+            try:
+                stat = i.stat()
+            except FileNotFoundError:
+                # Concurrently evicted
+                continue
+            entries.append((stat.st_mtime, stat.st_size, i.path))
+        return [(path, size) for _, size, path in sorted(entries)]
+
+    def _file(self, key):
+        return os.path.join(self.path, '%s%s' % (key, self._suffix))
+
+    def _copy(self, src, dst):
+        """Atomically copy `src` into `dst`."""
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(dst), prefix='.tmp-',
+                                         delete=False) as f:
+            tmpname = f.name
+        try:
+            copyfile(src, tmpname)
+            os.replace(tmpname, dst)
+        except BaseException:
+            try:
+                os.remove(tmpname)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def fetch(self, key, filename):
+        try:
+            self._copy(self._file(key), filename)
+        except FileNotFoundError:
+            if not os.path.isdir(self.path):
+                # Rather than a miss, the store is unreachable
+                raise
+            return False
+
+        # Mark as most recently used
+        try:
+            os.utime(self._file(key))
+        except OSError:
+            pass
+
+        return True
+
+    def publish(self, key, filename):
+        os.makedirs(self.path, exist_ok=True)
+
+        if os.path.exists(self._file(key)):
+            # E.g., published by another process in the meanwhile
+            return
+
+        self._copy(filename, self._file(key))
+        self.evict()
+
+    def evict(self, maxsize=None):
+        """
+        Evict the least recently used binaries until the store size drops
+        below `maxsize`, which defaults to `self.maxsize`.
+        """
+        maxsize = self.maxsize if maxsize is None else maxsize
+
+        entries = self.entries
+        nbytes = sum(size for _, size in entries)
+        for path, size in entries:
+            if nbytes <= maxsize:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Concurrently evicted
+                pass
+            nbytes -= size
+
+
+binary_store_registry = {
+    'file': LocalBinaryStore
+}
+"""
+The available BinaryStore backends. `configuration['jit-store']` selects one
+of them through the scheme of its location, e.g. `file:///shared/devito`;
+a plain path selects the `file` backend. Third-party backends may be added
+to this registry.
+"""
+
+
+def get_binary_store():
+    """
+    The BinaryStore selected via `configuration['jit-store']`, or None.
+    """
+    location = configuration['jit-store']
+    if not location:
+        return None
+    return _get_binary_store(str(location))
+
+
+@memoized_func
+def _get_binary_store(location):
+    scheme, sep, path = location.partition('://')
+    if not sep:
+        scheme, path = 'file', location
+
+    try:
+        return binary_store_registry[scheme](path)
+    except KeyError:
+        warning("Unknown binary store `%s`, ignoring it" % location)
+        return None
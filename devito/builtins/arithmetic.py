@@ -1,9 +1,11 @@
 import numpy as np
 
 import devito as dv
-from devito.builtins.utils import make_retval
+from devito.builtins.utils import accumulator_mapper, make_retval
+from devito.symbolics import limits_mapper
+from devito.tools import as_tuple, filter_ordered, flatten
 
-__all__ = ['norm', 'sumall', 'sum', 'inner', 'mmin', 'mmax']
+__all__ = ['norm', 'sumall', 'sum', 'inner', 'mmin', 'mmax', 'multi_reduce']
 
 
 @dv.switchconfig(log_level='ERROR')
@@ -18,26 +20,7 @@ def norm(f, order=2):
     order : int, default=2
         The order of the norm.
     """
-    Pow = dv.finite_differences.differentiable.Pow
-    kwargs = {}
-    if f.is_TimeFunction and f._time_buffering:
-        kwargs[f.time_dim.max_name] = f._time_size - 1
-
-    # Protect SparseFunctions from accessing duplicated (out-of-domain) data,
-    # otherwise we would eventually be summing more than expected
-    p, eqns = f.guard() if f.is_SparseFunction else (f, [])
-
-    n = make_retval(f)
-    s = dv.types.Symbol(name='sum', dtype=n.dtype)
-
-    op = dv.Operator([dv.Eq(s, 0.0)] + eqns +
-                     [dv.Inc(s, dv.Abs(Pow(p, order))), dv.Eq(n[0], s)],
-                     name='norm%d' % order)
-    op.apply(**kwargs)
-
-    v = np.power(n.data[0], 1/order)
-
-    return f.dtype(v)
+    return multi_reduce([('norm', f, order)])[0]
 
 
 @dv.switchconfig(log_level='ERROR')
@@ -82,14 +65,22 @@ def sum(f, dims=None):
                           space_order=f.space_order, shape=shape,
                           dimensions=new_dims)
 
-    kwargs = {}
-    if f.is_TimeFunction and f._time_buffering:
-        kwargs[f.time_dim.max_name] = f._time_size - 1
+    key = ('sum', dims, _signature(f), dv.configuration._signature_items())
+    try:
+        kernel = _kernels.pop(key)
+    except KeyError:
+        mapper = dv.passes.iet.engine.abstract_objects([f, out])
+        af, aout = mapper[f], mapper[out]
+
+        # Only need one guard as they have the same coordinates and Dimension
+        p, eqns = af.guard() if af.is_SparseFunction else (af, [])
+        op = dv.Operator(eqns + [dv.Eq(aout, aout + p)], name='sum')
+
+        kernel = ReductionKernel(op, [af, aout])
+    _cache(key, kernel)
+
+    kernel.op.apply(**kernel.arguments([f, out]))
 
-    # Only need one guard as they have the same coordinates and Dimension
-    p, eqns = f.guard() if f.is_SparseFunction else (f, [])
-    op = dv.Operator(eqns + [dv.Eq(out, out + p)])
-    op(**kwargs)
     return out
 
 
@@ -103,23 +94,7 @@ def sumall(f):
     f : Function
         Input Function.
     """
-    kwargs = {}
-    if f.is_TimeFunction and f._time_buffering:
-        kwargs[f.time_dim.max_name] = f._time_size - 1
-
-    # Protect SparseFunctions from accessing duplicated (out-of-domain) data,
-    # otherwise we would eventually be summing more than expected
-    p, eqns = f.guard() if f.is_SparseFunction else (f, [])
-
-    n = make_retval(f)
-    s = dv.types.Symbol(name='sum', dtype=n.dtype)
-
-    op = dv.Operator([dv.Eq(s, 0.0)] + eqns +
-                     [dv.Inc(s, p), dv.Eq(n[0], s)],
-                     name='sum')
-    op.apply(**kwargs)
-
-    return f.dtype(n.data[0])
+    return multi_reduce([('sum', f)])[0]
 
 
 @dv.switchconfig(log_level='ERROR')
@@ -147,33 +122,7 @@ def inner(f, g):
     The inner product is the sum of all dimension-wise products. For 1D Functions,
     the inner product corresponds to the dot product.
     """
-    # Input check
-    if f.is_TimeFunction and f._time_buffering != g._time_buffering:
-        raise ValueError("Cannot compute `inner` between save/nosave TimeFunctions")
-    if f.shape != g.shape:
-        raise ValueError("`f` and `g` must have same shape")
-    if f._data is None or g._data is None:
-        raise ValueError("Uninitialized input")
-    if f.is_SparseFunction and not np.all(f.coordinates_data == g.coordinates_data):
-        raise ValueError("Non-matching coordinates")
-
-    kwargs = {}
-    if f.is_TimeFunction and f._time_buffering:
-        kwargs[f.time_dim.max_name] = f._time_size - 1
-
-    # Protect SparseFunctions from accessing duplicated (out-of-domain) data,
-    # otherwise we would eventually be summing more than expected
-    rhs, eqns = f.guard(f*g) if f.is_SparseFunction else (f*g, [])
-
-    n = make_retval(f)
-    s = dv.types.Symbol(name='sum', dtype=n.dtype)
-
-    op = dv.Operator([dv.Eq(s, 0.0)] + eqns +
-                     [dv.Inc(s, rhs), dv.Eq(n[0], s)],
-                     name='inner')
-    op.apply(**kwargs)
-
-    return f.dtype(n.data[0])
+    return multi_reduce([('inner', f, g)])[0]
 
 
 @dv.switchconfig(log_level='ERROR')
@@ -220,3 +169,307 @@ def mmax(f):
             return comm.allreduce(v, dv.mpi.MPI.MAX).item()
     else:
         raise ValueError("Expected Function, got `%s`" % type(f))
+
+
+@dv.switchconfig(log_level='ERROR')
+def multi_reduce(reductions):
+    """
+    Compute several reductions, possibly of different Functions, within a
+    single Operator, thus in a single pass over memory and, with MPI, through
+    a single global reduction.
+
+    Parameters
+    ----------
+    reductions : list of tuple
+        The reductions, each of which is one of:
+
+            * `('norm', f)` or `('norm', f, order)`, see `norm`;
+            * `('inner', f, g)`, see `inner`;
+            * `('sum', f)`, see `sumall`;
+            * `('min', f)` and `('max', f)`, see `mmin` and `mmax`.
+
+    Returns
+    -------
+    list
+        The value of each reduction.
+
+    Notes
+    -----
+    The Operators computing the reductions are cached, and reused by any
+    subsequent call over Functions with the same type, Grid, Dimensions, halo,
+    padding and data type. Hence, repeated calls, such as those performed in
+    inversion loops, only pay for the execution of an already compiled kernel.
+
+    The sums, that is the `'norm'`, `'inner'` and `'sum'` reductions, are
+    evaluated in an order fixed at compile time, so the results are
+    bitwise-reproducible regardless of the number of threads. This may be
+    disabled through `configuration['opt-options']['tree-reduce']`. The
+    `'min'` and `'max'` reductions are exact, hence reproducible in any order,
+    so their last level is left to the backend. Note that the standalone
+    `mmin` and `mmax` don't go through this kernel, but reduce with NumPy.
+
+    Examples
+    --------
+    >>> from devito import Grid, Function, multi_reduce
+    >>> grid = Grid(shape=(4, 4))
+    >>> f = Function(name='f', grid=grid)
+    >>> g = Function(name='g', grid=grid)
+    >>> f.data[:] = 1.
+    >>> g.data[:] = 2.
+    >>> [float(i) for i in multi_reduce([('norm', f), ('inner', f, g), ('max', g)])]
+    [4.0, 32.0, 2.0]
+    """
+    reductions = [_parse_reduction(i) for i in as_tuple(reductions)]
+    if not reductions:
+        return []
+
+    # The Functions involved in the reductions, and the Function operands of
+    # each reduction as indices into them
+    functions = filter_ordered(flatten(i[1] for i in reductions))
+    spec = tuple((kind, tuple(functions.index(f) for f in operands), order)
+                 for kind, operands, order in reductions)
+
+    key = (spec, tuple(_signature(f) for f in functions), make_retval.cls,
+           dv.configuration._signature_items())
+    try:
+        kernel = _kernels.pop(key)
+    except KeyError:
+        kernel = _make_reduction_kernel(spec, functions)
+    _cache(key, kernel)
+
+    kernel.op.apply(**kernel.arguments(functions))
+
+    values = kernel.retval.data[:len(spec)].view(np.ndarray).copy()
+    if dv.configuration['mpi']:
+        kernel.allreduce(values, functions)
+
+    retvals = []
+    for (kind, operands, order), v in zip(reductions, values):
+        if kind == 'norm':
+            v = np.power(v, 1/order)
+        retvals.append(operands[0].dtype(v))
+
+    return retvals
+
+
+def _parse_reduction(reduction):
+    """
+    Turn a reduction, as provided to `multi_reduce`, into a tuple
+    `(kind, operands, order)`.
+    """
+    kind, *operands = as_tuple(reduction)
+
+    order = None
+    if kind == 'norm' and len(operands) in (1, 2):
+        operands, order = operands[:1], (operands[1:] or [2])[0]
+    elif kind == 'inner' and len(operands) == 2:
+        _check_inner(*operands)
+    elif kind not in ('sum', 'min', 'max') or len(operands) != 1:
+        raise ValueError("Illegal reduction `%s`" % str(reduction))
+
+    for f in operands:
+        if not isinstance(f, dv.types.dense.DiscreteFunction):
+            raise ValueError("Expected Function, got `%s`" % type(f))
+
+    return kind, tuple(operands), order
+
+
+def _check_inner(f, g):
+    if f.is_TimeFunction and f._time_buffering != g._time_buffering:
+        raise ValueError("Cannot compute `inner` between save/nosave TimeFunctions")
+    if f.shape != g.shape:
+        raise ValueError("`f` and `g` must have same shape")
+    if f._data is None or g._data is None:
+        raise ValueError("Uninitialized input")
+    if f.is_SparseFunction and not np.all(f.coordinates_data == g.coordinates_data):
+        raise ValueError("Non-matching coordinates")
+
+
+def _signature(f):
+    """
+    The properties of `f` affecting the code of the reduction kernels.
+    """
+    sig = [type(f), f.dtype, f.grid, tuple(f._size_nodomain)]
+    for d, s in zip(f.dimensions, f.shape):
+        if f.is_SparseFunction and d is f._sparse_dim:
+            # Bound to the actual sparse Dimension at runtime
+            sig.append(None)
+        elif d.is_Stepping:
+            # The buffer size is hardcoded in the modulo indexing
+            sig.append((d, s))
+        else:
+            sig.append(d)
+    if f.is_SparseFunction:
+        sig.extend([type(f.interpolator), f.r])
+
+    return tuple(sig)
+
+
+def _accumulator(kind, f):
+    if kind in ('min', 'max'):
+        if f.dtype in limits_mapper:
+            return f.dtype
+        return np.float64
+    return accumulator_mapper[f.dtype]
+
+
+def _make_reduction_kernel(spec, functions):
+    """
+    Build the Operator computing the reductions `spec` over `functions`.
+
+    The Operator is constructed over abstract Functions, to be bound to actual
+    Functions upon application.
+    """
+    mapper = dv.passes.iet.engine.abstract_objects(functions)
+    afunctions = [mapper[f] for f in functions]
+
+    dtypes = [_accumulator(kind, functions[operands[0]])
+              for kind, operands, _ in spec]
+    n = make_retval(afunctions[0], size=len(spec), dtype=np.result_type(*dtypes).type)
+
+    Pow = dv.finite_differences.differentiable.Pow
+
+    inits, exprs, stores = [], [], []
+    for i, ((kind, operands, order), dtype) in enumerate(zip(spec, dtypes)):
+        f, *others = [afunctions[j] for j in operands]
+        s = dv.types.Symbol(name='s%d' % i, dtype=dtype)
+
+        rhs = f*others[0] if kind == 'inner' else f
+
+        # Protect SparseFunctions from accessing duplicated (out-of-domain) data,
+        # otherwise we would eventually be summing more than expected
+        if f.is_SparseFunction:
+            rhs, eqns = f.guard(rhs)
+            exprs.extend(eqns)
+
+        if kind == 'min':
+            inits.append(dv.Eq(s, limits_mapper[dtype].max))
+            exprs.append(dv.ReduceMin(s, rhs))
+        elif kind == 'max':
+            inits.append(dv.Eq(s, limits_mapper[dtype].min))
+            exprs.append(dv.ReduceMax(s, rhs))
+        elif kind == 'norm':
+            inits.append(dv.Eq(s, 0.0))
+            exprs.append(dv.Inc(s, dv.Abs(Pow(rhs, order))))
+        else:
+            inits.append(dv.Eq(s, 0.0))
+            exprs.append(dv.Inc(s, rhs))
+
+        stores.append(dv.Eq(n[i], s))
+
+    if len(spec) == 1:
+        kind, _, order = spec[0]
+        name = 'norm%d' % order if kind == 'norm' else kind
+    else:
+        name = 'reduce'
+
+    # The reductions are carried out through a tree of partial results, so that
+    # the outcome doesn't depend on the number of threads, unless explicitly
+    # disabled by the user
+    options = {'tree-reduce': dv.configuration['opt-options'].get('tree-reduce', True)}
+
+    # With MPI, the partial results are combined by a single global reduction
+    # once the Operator returns, rather than by one MPI_Allreduce per reduction
+    if dv.configuration['mpi']:
+        options['mpi'] = False
+
+    op = dv.Operator(inits + exprs + stores, name=name,
+                     opt=(dv.configuration['opt'], options))
+
+    return ReductionKernel(op, afunctions, retval=n, spec=spec)
+
+
+class ReductionKernel:
+
+    """
+    A compiled reduction kernel along with the abstract Functions it is
+    constructed over.
+    """
+
+    def __init__(self, op, afunctions, retval=None, spec=()):
+        self.op = op
+        self.afunctions = afunctions
+        self.retval = retval
+        self.spec = spec
+
+        self._mpiops = {}
+
+    def arguments(self, functions):
+        """
+        The runtime arguments binding the abstract Functions to `functions`.
+        """
+        args = {}
+        extents = set()
+        for af, f in zip(self.afunctions, functions):
+            args[af.name] = f
+
+            if f.is_TimeFunction and f._time_buffering:
+                # Reduce over the whole buffer
+                args[f.time_dim.max_name] = f._time_size - 1
+                extents.add(f._time_size)
+            elif f.is_TimeFunction or f.is_SparseTimeFunction:
+                extents.add(f.shape[f._time_position])
+
+        # All time-varying Functions share the time Dimension
+        if len(extents) > 1:
+            raise ValueError("Cannot reduce at once time-varying Functions with "
+                             "different number of time steps")
+
+        return args
+
+    def allreduce(self, values, functions):
+        """
+        Combine the partial `values` computed by the calling rank with those
+        computed by the other ranks, through a single MPI_Allreduce.
+        """
+        # The reductions over Functions with replicated data (e.g., not defined
+        # over any distributed Dimension) are already complete
+        mask = [bool(functions[operands[0]]._dist_dimensions)
+                for _, operands, _ in self.spec]
+        if not any(mask):
+            return
+
+        kinds = tuple(kind for (kind, _, _), m in zip(self.spec, mask) if m)
+        comm = functions[0].grid.distributor.comm
+
+        buf = np.ascontiguousarray(values[mask])
+        comm.Allreduce(dv.mpi.MPI.IN_PLACE, buf, op=self._mpiop(kinds))
+        values[mask] = buf
+
+    def _mpiop(self, kinds):
+        MPI = dv.mpi.MPI
+        # NOTE: the decision is made on `kinds` as MPI.Op isn't hashable
+        ops = {k if k in ('min', 'max') else 'sum' for k in kinds}
+        if len(ops) == 1:
+            return {'min': MPI.MIN, 'max': MPI.MAX}.get(kinds[0], MPI.SUM)
+
+        # Different reduction operators for different entries require a
+        # user-defined, element-wise reduction operator
+        try:
+            return self._mpiops[kinds]
+        except KeyError:
+            pass
+
+        dtype = self.retval.dtype
+        ufuncs = [{'min': np.fmin, 'max': np.fmax}.get(k, np.add) for k in kinds]
+
+        def combine(inbuf, inoutbuf, datatype):
+            invalues = np.frombuffer(inbuf, dtype=dtype)
+            outvalues = np.frombuffer(inoutbuf, dtype=dtype)
+            for i, ufunc in enumerate(ufuncs):
+                outvalues[i] = ufunc(invalues[i], outvalues[i])
+
+        self._mpiops[kinds] = op = MPI.Op.Create(combine, commute=True)
+
+        return op
+
+
+# The cached ReductionKernels, in least recently used order
+_kernels = {}
+_kernels_maxsize = 128
+
+
+def _cache(key, kernel):
+    _kernels[key] = kernel
+    while len(_kernels) > _kernels_maxsize:
+        _kernels.pop(next(iter(_kernels)))
@@ -1,10 +1,14 @@
 import numpy as np
 
 import devito as dv
-from devito.tools import as_tuple, as_list
+from devito.builtins.arithmetic import _cache, _kernels, _signature
 from devito.builtins.utils import nbl_to_padsize, pad_outhalo
+from devito.data import HALO, LEFT, OWNED, RIGHT
+from devito.data.allocators import DataReference
+from devito.tools import as_tuple, as_list
 
-__all__ = ['assign', 'smooth', 'gaussian_smooth', 'initialize_function']
+__all__ = ['assign', 'smooth', 'gaussian_smooth', 'box_smooth',
+           'initialize_function']
 
 
 @dv.switchconfig(log_level='ERROR')
@@ -68,13 +72,7 @@ def assign(f, rhs=0, options=None, name='assign', assign_halo=False, **kwargs):
             eqs.append(dv.Eq(i, j))
 
     if assign_halo:
-        subs = {}
-        for d, h in zip(f.dimensions, f._size_halo):
-            if sum(h) == 0:
-                continue
-            subs[d] = dv.CustomDimension(name=d.name, parent=d,
-                                         symbolic_min=d.symbolic_min - h.left,
-                                         symbolic_max=d.symbolic_max + h.right)
+        subs = _halo_subs(f)
         eqs = [eq.xreplace(subs) for eq in eqs]
 
     op = dv.Operator(eqs, name=name, **kwargs)
@@ -85,6 +83,20 @@ def assign(f, rhs=0, options=None, name='assign', assign_halo=False, **kwargs):
         op(time_M=f._time_size)
 
 
+def _halo_subs(f):
+    """
+    Mapper from the Dimensions of `f` to Dimensions spanning the halo too.
+    """
+    subs = {}
+    for d, h in zip(f.dimensions, f._size_halo):
+        if sum(h) == 0:
+            continue
+        subs[d] = dv.CustomDimension(name=d.name, parent=d,
+                                     symbolic_min=d.symbolic_min - h.left,
+                                     symbolic_max=d.symbolic_max + h.right)
+    return subs
+
+
 def smooth(f, g, axis=None):
     """
     Smooth a Function through simple moving average.
@@ -120,95 +132,191 @@ def gaussian_smooth(f, sigma=1, truncate=4.0, mode='reflect'):
 
     Parameters
     ----------
-    f : Function
-        The left-hand side of the smoothing kernel, that is the smoothed Function.
-    sigma : float, optional
-        Standard deviation. Default is 1.
+    f : Function or ndarray
+        The Function being smoothed, in place.
+    sigma : float or tuple of float, optional
+        Standard deviation, possibly one per dimension. Default is 1.
     truncate : float, optional
         Truncate the filter at this many standard deviations. Default is 4.0.
     mode : str, optional
-        The function initialisation mode. 'constant' and 'reflect' are
-        accepted. Default mode is 'reflect'.
+        How `f` is extended beyond its boundaries. 'constant' (replicate the
+        edge values) and 'reflect' are accepted. Default mode is 'reflect'.
+
+    Notes
+    -----
+    The filter is separable, so `f` is smoothed one dimension at a time, see
+    `box_smooth` for more details.
     """
-    class ObjectiveDomain(dv.SubDomain):
+    sigma = as_tuple(sigma)
+    if len(sigma) == 1:
+        sigma = sigma*f.ndim
+    elif len(sigma) != f.ndim:
+        raise ValueError("`sigma` must be an integer or a tuple of length" +
+                         " `f.ndim`.")
 
-        name = 'objective_domain'
+    weights = []
+    for s in sigma:
+        lw = int(truncate*float(s) + 0.5)
+        w = np.exp(-0.5/max(s, 1e-12)**2*np.linspace(-lw, lw, 2*lw+1)**2)
+        weights.append(w/w.sum())
 
-        def __init__(self, lw):
-            super().__init__()
-            self.lw = lw
+    return _separable_smooth(f, weights, mode)
 
-        def define(self, dimensions):
-            return {d: ('middle', l, l) for d, l in zip(dimensions, self.lw)}
 
-    def create_gaussian_weights(sigma, lw):
-        weights = [w/w.sum() for w in (np.exp(-0.5/s**2*(np.linspace(-l, l, 2*l+1))**2)
-                   for s, l in zip(sigma, lw))]
-        return as_tuple(np.array(w) for w in weights)
+def box_smooth(f, width=3, mode='reflect'):
+    """
+    Smooth a Function through a moving average along each dimension.
 
-    def fset(f, g):
-        indices = [slice(l, -l, 1) for _, l in zip(g.dimensions, lw)]
-        slices = (slice(None, None, 1), )*g.ndim
-        if isinstance(f, np.ndarray):
-            f[slices] = g.data[tuple(indices)]
-        elif isinstance(f, dv.Function):
-            f.data[slices] = g.data[tuple(indices)]
-        else:
-            raise NotImplementedError
+    Parameters
+    ----------
+    f : Function or ndarray
+        The Function being smoothed, in place.
+    width : int or tuple of int, optional
+        The (odd) number of points averaged, possibly one per dimension.
+        Default is 3.
+    mode : str, optional
+        How `f` is extended beyond its boundaries. 'constant' (replicate the
+        edge values) and 'reflect' are accepted. Default mode is 'reflect'.
 
-    try:
-        # NOTE: required if input is an np.array
-        dtype = f.dtype.type
-        shape = f.shape
-    except AttributeError:
-        dtype = f.dtype
-        shape = f.shape_global
+    Notes
+    -----
+    The filter is separable, so `f` is smoothed one dimension at a time, in
+    place, by a cached Operator. This requires a scratch Function as large as
+    `f`, plus a halo as thick as the filter radius, into which `f` is copied
+    once per dimension. The scratch Function is kept and reused by any
+    subsequent call over a Function with the same Grid and data type, and a
+    filter no wider; it is released as soon as a different one is needed.
+    With MPI, the scratch halo is filled through halo exchanges, rather than
+    by gathering `f` on a single rank.
 
-    # TODO: Add s = 0 dim skip option
-    lw = tuple(int(truncate*float(s) + 0.5) for s in as_tuple(sigma))
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from devito import Grid, Function, box_smooth
+    >>> grid = Grid(shape=(5,))
+    >>> f = Function(name='f', grid=grid)
+    >>> f.data[2] = 3.
+    >>> f = box_smooth(f)
+    >>> f.data
+    Data([0., 1., 1., 1., 0.], dtype=float32)
+    """
+    width = as_tuple(width)
+    if len(width) == 1:
+        width = width*f.ndim
+    elif len(width) != f.ndim:
+        raise ValueError("`width` must be an integer or a tuple of length" +
+                         " `f.ndim`.")
+    if any(w < 1 or w % 2 == 0 for w in width):
+        raise ValueError("`width` must be odd and positive")
+
+    weights = [np.full(w, 1./w) for w in width]
+
+    return _separable_smooth(f, weights, mode)
 
-    if len(lw) == 1 and len(lw) < f.ndim:
-        lw = f.ndim*(lw[0], )
-        sigma = f.ndim*(as_tuple(sigma)[0], )
-    elif len(lw) == f.ndim:
-        sigma = as_tuple(sigma)
+
+@dv.switchconfig(log_level='ERROR')
+def _separable_smooth(f, weights, mode):
+    """
+    Convolve `f`, in place, with the 1D filters `weights`, one per dimension.
+    """
+    if mode not in ('constant', 'reflect'):
+        raise ValueError("Mode not available")
+
+    if isinstance(f, np.ndarray):
+        grid = dv.Grid(shape=f.shape)
+        fc = dv.Function(name='f', grid=grid, space_order=0, dtype=f.dtype.type)
+        fc.data[:] = f
+        _separable_smooth(fc, weights, mode)
+        f[:] = fc.data
+        return f
+
+    lw = max(len(w) for w in weights) // 2
+    if any(i < lw for i in f.grid.shape_local):
+        raise ValueError("Function `%s` local domain is smaller than the "
+                         "filter radius (%d)" % (f.name, lw))
+    g = _smooth_scratch(f, lw)
+
+    if np.issubdtype(f.dtype, np.floating):
+        dtype = f.dtype
     else:
-        raise ValueError("`sigma` must be an integer or a tuple of length" +
-                         " `f.ndim`.")
+        dtype = np.float64
+
+    glb_pos_map = f.grid.distributor.glb_pos_map
+    for i, (d, w) in enumerate(zip(f.dimensions, weights)):
+        if len(w) == 1:
+            continue
+        wf = dv.Function(name='w', dimensions=(dv.Dimension(name='k'),),
+                         shape=w.shape, dtype=dtype, space_order=0)
+        wf.data[:] = w
+
+        # Copy `f` into the scratch Function
+        _smooth_apply(('copy',), [f, g], lambda f, g: [dv.Eq(g, f)])
+
+        # Pad the outer halo of the scratch Function along `d`; the inner
+        # halo, if any, is instead exchanged by the convolution Operator
+        for side in [LEFT, RIGHT]:
+            if side not in glb_pos_map.get(d, (LEFT, RIGHT)):
+                continue
+            halo = g._data_in_region(HALO, d, side)
+            owned = g._data_in_region(OWNED, d, side)
+            if mode == 'reflect':
+                halo[:] = np.flip(owned, axis=i)
+            else:
+                edge = 0 if side is LEFT else -1
+                halo[:] = np.take(owned, [edge], axis=i)
 
-    # Create the padded grid:
-    objective_domain = ObjectiveDomain(lw)
-    shape_padded = tuple([np.array(s) + 2*l for s, l in zip(shape, lw)])
-    grid = dv.Grid(shape=shape_padded, subdomains=objective_domain)
+        # The actual convolution; the filters are symmetric, hence the points
+        # at the same distance from the centre share the multiplication
+        def conv(f, g, wf, d=d, lw=len(w)//2):
+            rhs = wf[lw]*g + sum([wf[lw + k]*(g.subs({d: d - k}) + g.subs({d: d + k}))
+                                  for k in range(1, lw + 1)])
+            return [dv.Eq(f, rhs)]
 
-    f_c = dv.Function(name='f_c', grid=grid, space_order=2*max(lw), dtype=dtype)
-    f_o = dv.Function(name='f_o', grid=grid, dtype=dtype)
+        _smooth_apply(('conv', i, len(w)), [f, g, wf], conv)
 
-    weights = create_gaussian_weights(sigma, lw)
+    return f
 
-    mapper = {}
-    for d, l, w in zip(f_c.dimensions, lw, weights):
-        lhs = []
-        rhs = []
-        options = []
 
-        lhs.append(f_o)
-        rhs.append(dv.generic_derivative(f_c, d, 2*l, 1, weights=w))
-        options.append({'subdomain': grid.subdomains['objective_domain']})
+def _smooth_scratch(f, lw):
+    """
+    The scratch Function, whose halo is used as padding, for smoothing `f`
+    with a filter of radius up to `lw`. Only the most recently used one is
+    kept, as it is as large as `f`.
+    """
+    key = (f.grid, np.dtype(f.dtype))
+    try:
+        g = _scratch[key]
+    except KeyError:
+        g = None
+    if g is None or g._size_halo[0].left < lw:
+        _scratch.clear()
+        g = dv.Function(name='smooth_scratch', grid=f.grid, space_order=0,
+                        halo=((lw, lw),)*f.ndim, dtype=f.dtype)
+        _scratch[key] = g
+    return g
 
-        lhs.append(f_c)
-        rhs.append(f_o)
-        options.append({'subdomain': grid.subdomains['objective_domain']})
 
-        mapper[d] = {'lhs': lhs, 'rhs': rhs, 'options': options}
+_scratch = {}
 
-    # Note: generally not enough parallelism to be performant on a gpu device
-    # TODO: Add openacc support for CPUs and set platform = 'cpu64'
 
-    initialize_function(f_c, f, lw, mapper=mapper, mode='reflect', name='smooth')
+def _smooth_apply(key, functions, make_eqns):
+    """
+    Build, or fetch from the cache, and apply the Operator computing the
+    equations `make_eqns(*functions)`.
+    """
+    key = ('smooth',) + key + tuple(_signature(i) for i in functions) + \
+        (dv.configuration._signature_items(),)
+    try:
+        kernel = _kernels.pop(key)
+    except KeyError:
+        mapper = dv.passes.iet.engine.abstract_objects(functions)
+        afunctions = [mapper[i] for i in functions]
+        op = dv.Operator(make_eqns(*afunctions), name='smooth')
+        kernel = (op, afunctions)
+    _cache(key, kernel)
 
-    fset(f, f_c)
-    return f
+    op, afunctions = kernel
+    op.apply(**{af.name: i for af, i in zip(afunctions, functions)})
 
 
 def _initialize_function(function, data, nbl, mapper=None, mode='constant'):
@@ -271,6 +379,132 @@ def _initialize_function(function, data, nbl, mapper=None, mode='constant'):
     return lhs, rhs, options
 
 
+def _padding_map(function, d, n, nbl, mode, pad_halo):
+    """
+    The indices of the `n` data values, along the Dimension `d`, read by each
+    of the points of `function`, from the leftmost halo point (if `pad_halo`)
+    to the rightmost one.
+    """
+    i = function.dimensions.index(d)
+    nl, nr = nbl
+
+    grid = function.grid
+    glb_numb = np.asarray(grid.distributor.glb_numb[i])
+    if n != grid.shape[i] - nl - nr:
+        raise ValueError("Expected %d data values along `%s` with `nbl=%s`, got %d"
+                         % (grid.shape[i] - nl - nr, d, nbl, n))
+
+    # The global indices of the points of `function`; those in the outer
+    # halo take the value of the nearest domain point
+    h = function._size_halo[d]
+    if pad_halo and len(glb_numb) > 0:
+        glb_numb = np.arange(glb_numb[0] - h.left, glb_numb[-1] + h.right + 1)
+    glb_numb = np.clip(glb_numb, 0, grid.shape[i] - 1)
+
+    indices = glb_numb - nl
+    if mode == 'constant':
+        pass
+    elif mode == 'reflect':
+        indices = np.where(indices < 0, -indices - 1, indices)
+        indices = np.where(indices >= n, 2*n - 1 - indices, indices)
+    else:
+        raise ValueError("Mode not available")
+
+    return np.clip(indices, 0, n - 1).astype(np.int32)
+
+
+@dv.switchconfig(log_level='ERROR')
+def _initialize_batch(functions, datas, nbl, mode, pad_halo, name, **kwargs):
+    """
+    Initialize the `functions`, padding included, with the given `datas` by
+    running a single Operator, which is cached and reused across calls.
+    """
+    # Each point of each Function reads the data value it's given by a per-
+    # Dimension map, that is `f[x, y] = data[mx[x], my[y]]`. Thus, the
+    # padding mode is encoded in the maps, rather than in the Operator
+    sources = []
+    for f, data in zip(functions, datas):
+        if isinstance(data, dv.Function):
+            data = data.data
+        if f.ndim != np.ndim(data):
+            raise ValueError("Expected %d-dimensional `data` for Function `%s`"
+                             % (f.ndim, f.name))
+
+        # The Functions read the user-provided data in place, without any copy
+        # (unless strictly necessary), so a memory-mapped array will only be
+        # paged in as it is read
+        data = np.asarray(data)
+        if not data.flags.c_contiguous:
+            data = np.ascontiguousarray(data)
+        dims = tuple(dv.Dimension(name='i%d' % i) for i in range(data.ndim))
+        sources.append(dv.Function(name='s%s' % f.name, dimensions=dims,
+                                   shape=data.shape, dtype=data.dtype.type,
+                                   space_order=0, padding=0,
+                                   allocator=DataReference(data)))
+
+    nbl, _ = nbl_to_padsize(nbl, functions[0].ndim)
+
+    # One Operator per group of Functions sharing Grid and halo, and whose data
+    # have the same shape, so that they also share the maps
+    groups = {}
+    for f, s in zip(functions, sources):
+        groups.setdefault((f.grid, f._size_halo, s.shape), []).append((f, s))
+
+    for group in groups.values():
+        fs, ss = zip(*group)
+
+        ms = []
+        for i, (d, n, nb) in enumerate(zip(fs[0].dimensions, ss[0].shape, nbl)):
+            v = _padding_map(fs[0], d, n, nb, mode, pad_halo)
+            ms.append(dv.Function(name='m%s' % d.name,
+                                  dimensions=(dv.Dimension(name='m%d' % i),),
+                                  shape=v.shape, dtype=np.int32, space_order=0,
+                                  padding=0, allocator=DataReference(v)))
+
+        key = ('initialize', pad_halo, tuple(_signature(i) for i in fs + ss),
+               str(sorted(kwargs.items())), dv.configuration._signature_items())
+        try:
+            kernel = _kernels.pop(key)
+        except KeyError:
+            kernel = _make_initialize_kernel(fs + ss + tuple(ms), len(fs),
+                                             pad_halo, name, **kwargs)
+        _cache(key, kernel)
+
+        op, afunctions = kernel
+        op.apply(**{af.name: i for af, i in zip(afunctions, fs + ss + tuple(ms))})
+
+
+def _make_initialize_kernel(functions, nfunc, pad_halo, name, **kwargs):
+    """
+    Build the Operator initializing the first `nfunc` of `functions` from the
+    next `nfunc`, through the per-Dimension maps which follow.
+    """
+    mapper = dv.passes.iet.engine.abstract_objects(functions)
+    afunctions = [mapper[f] for f in functions]
+
+    fs = afunctions[:nfunc]
+    ss = afunctions[nfunc:2*nfunc]
+    ms = afunctions[2*nfunc:]
+
+    f0 = fs[0]
+    dims = f0.dimensions
+
+    # The maps are indexed from the leftmost point being initialized
+    if pad_halo:
+        offsets = [f0._size_halo[d].left for d in dims]
+    else:
+        offsets = [0]*len(dims)
+    indices = [m[d + o] for d, m, o in zip(dims, ms, offsets)]
+
+    eqs = [dv.Eq(f, s[indices]) for f, s in zip(fs, ss)]
+    if pad_halo:
+        eqs = [eq.xreplace(_halo_subs(f0)) for eq in eqs]
+
+    op = dv.Operator(eqs, name=name or 'initialize', **kwargs)
+
+    return op, afunctions
+
+
 def initialize_function(function, data, nbl, mapper=None, mode='constant',
                         name=None, pad_halo=True, **kwargs):
     """
@@ -283,7 +517,8 @@ def initialize_function(function, data, nbl, mapper=None, mode='constant',
     function : Function or list of Functions
         The initialised object.
     data : ndarray or Function or list of ndarray/Function
-        The data used for initialisation.
+        The data used for initialisation. A memory-mapped ndarray (e.g., from
+        `np.load(..., mmap_mode='r')`) is read in place, without being copied.
     nbl : int or tuple of int or tuple of tuple of int
         Number of outer layers (such as absorbing layers for boundary damping).
     mapper : dict, optional
@@ -301,6 +536,13 @@ def initialize_function(function, data, nbl, mapper=None, mode='constant',
     pad_halo : bool, optional
         Whether to also pad the outer halo.
 
+    Notes
+    -----
+    Unless a `mapper` is supplied, all of the given Functions, padding and
+    outer halo included, are initialized by a single Operator, which is cached
+    and reused by any subsequent call over Functions with the same number of
+    dimensions, Grid, halo and data type, whatever the initialisation `mode`.
+
     Examples
     --------
     In the following example the `'interior'` of a function is set to one plus
@@ -360,6 +602,13 @@ def initialize_function(function, data, nbl, mapper=None, mode='constant',
     if any(isinstance(f, dv.TimeFunction) for f in functions):
         raise NotImplementedError("TimeFunctions are not currently supported.")
 
+    if mapper is None and \
+       not any(isinstance(d, dv.Function) and f.grid.distributor.is_parallel
+               for f, d in zip(functions, datas)):
+        # Fast path: all Functions are padded by a single, cached, Operator
+        _initialize_batch(functions, datas, nbl, mode, pad_halo, name, **kwargs)
+        return
+
     if nbl == 0:
         for f, data in zip(functions, datas):
             if isinstance(data, dv.Function):
@@ -25,21 +25,21 @@ accumulator_mapper = {
 }
 
 
-def make_retval(f):
+def make_retval(f, size=1, dtype=None):
     """
     Devito does not support passing values by reference. This function
-    creates a dummy Function of size 1 to store the return value of a builtin
-    applied to `f`.
+    creates a dummy Function of size `size` (defaults to 1) to store the
+    return value(s) of a builtin applied to `f`.
     """
     if f.grid is None:
         raise ValueError("No Grid available")
 
     cls = make_retval.cls or dv.Function
 
-    dtype = accumulator_mapper[f.dtype]
+    dtype = dtype or accumulator_mapper[f.dtype]
 
     i = dv.Dimension(name='mri',)
-    n = cls(name='n', shape=(1,), dimensions=(i,), grid=f.grid,
+    n = cls(name='n', shape=(size,), dimensions=(i,), grid=f.grid,
             dtype=dtype, space='host')
 
     n.data[:] = 0
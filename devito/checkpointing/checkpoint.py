@@ -1,7 +1,14 @@
-from pyrevolve import Checkpoint, Operator
+try:
+    from pyrevolve import Checkpoint, Operator
+except ImportError:
+    # The native checkpointing engine doesn't need pyrevolve
+    Checkpoint = Operator = object
+
 from devito import TimeFunction
 from devito.tools import flatten
 
+__all__ = ['CheckpointOperator', 'DevitoCheckpoint']
+
 
 class CheckpointOperator(Operator):
     """Devito's concrete implementation of the ABC pyrevolve.Operator. This class wraps
@@ -23,14 +30,16 @@ class CheckpointOperator(Operator):
 
     def __init__(self, op, **kwargs):
         self.op = op
-        self.args = self.op._prepare_arguments(**kwargs)
+        self.bop = self.op.bind(**kwargs)
         self.start_offset = self.args[self.t_arg_names['t_start']]
 
+    @property
+    def args(self):
+        return self.bop.args
+
     def _prepare_args(self, t_start, t_end):
-        args = self.args.copy()
-        args[self.t_arg_names['t_start']] = t_start + self.start_offset
-        args[self.t_arg_names['t_end']] = t_end - 1 + self.start_offset
-        return args
+        return {self.t_arg_names['t_start']: t_start + self.start_offset,
+                self.t_arg_names['t_end']: t_end - 1 + self.start_offset}
 
     def apply(self, t_start, t_end):
         """ If the devito operator requires some extra arguments in the call to apply
@@ -38,11 +47,9 @@ class CheckpointOperator(Operator):
             pyRevolve.Operator.apply() without caring about these extra arguments while
             this method passes them on correctly to devito.Operator
         """
-        # Build the arguments list to invoke the kernel function
-        args = self._prepare_args(t_start, t_end)
-        # Invoke kernel function with args
-        arg_values = [args[p.name] for p in self.op.parameters]
-        self.op.cfunction(*arg_values)
+        # Only the time bounds change across calls, so the bound arguments are
+        # simply patched
+        self.bop.apply(**self._prepare_args(t_start, t_end))
 
 
 class DevitoCheckpoint(Checkpoint):
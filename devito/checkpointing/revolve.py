@@ -0,0 +1,531 @@
+"""
+A native checkpointing engine for adjoint-state computations.
+
+The engine executes a binomial (Revolve) schedule, so that an adjoint run
+over `n_timesteps` timesteps requires storing only a handful of forward states
+(the checkpoints) while recomputing the others on demand. Checkpoints live in a
+two-tier store: the most frequently accessed ones are kept in RAM, while the
+bottom of the checkpoint stack, which is rarely accessed, may be offloaded to
+disk (multistage checkpointing). Checkpoints may optionally be compressed, and
+disk writes are asynchronous, thus overlapping with the forward computation.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from math import comb
+import os
+import shutil
+import tempfile
+import zlib
+
+import numpy as np
+
+__all__ = ['NativeRevolver', 'CheckpointStorage', 'revolve_schedule',
+           'compression_registry']
+
+
+# Schedule
+
+Action = namedtuple('Action', 'type start end slot', defaults=(None, None, None))
+
+ADVANCE = 'advance'
+"""Run the forward operator from `start` to `end`."""
+
+LASTFW = 'lastfw'
+"""Run the forward operator from `start` to `end`, the last timestep."""
+
+TAKESHOT = 'takeshot'
+"""Store the forward state at `start` into the checkpoint `slot`."""
+
+RESTORE = 'restore'
+"""Load the forward state at `start` from the checkpoint `slot`."""
+
+CPDEL = 'cpdel'
+"""Release the checkpoint `slot`."""
+
+REVERSE = 'reverse'
+"""Run the forward and then the reverse operator over the timestep `start`."""
+
+REVSTART = 'revstart'
+"""Run the reverse operator over the timestep `start`."""
+
+TERMINATE = 'terminate'
+
+
+def adjust(n_timesteps):
+    """
+    A number of checkpoints yielding a good trade-off between memory
+    consumption and recomputation, that is the smallest `c` such that
+    `n_timesteps` may be reversed with at most `c` recomputations per timestep.
+    """
+    c = 1
+    while comb(2*c, c) < n_timesteps:
+        c += 1
+    return c
+
+
+def _split(l, s):
+    """
+    The optimal position, relative to the first timestep, of the next
+    checkpoint when reversing `l` timesteps with `s` free checkpoints.
+    """
+    c = s + 1
+    r = 0
+    while comb(c + r, c) < l:
+        r += 1
+    hi = min(comb(c + r - 1, c), l - 1)
+    if r >= 2:
+        hi = min(hi, l - comb(c + r - 2, c - 1))
+    return max(hi, 1)
+
+
+def _reverse(actions, start, end, slot, free, first):
+    """
+    Append to `actions` the schedule reversing the timesteps in [start, end),
+    given that the forward state at `start` is stored in `slot` and that `free`
+    additional checkpoints are available. If `first`, the forward state at
+    `start` is also the current forward state.
+    """
+    if end - start == 1:
+        if first:
+            actions.append(Action(LASTFW, start, end))
+            actions.append(Action(REVSTART, start))
+        else:
+            actions.append(Action(RESTORE, start, slot=slot))
+            actions.append(Action(REVERSE, start))
+    elif free == 0:
+        if first:
+            actions.append(Action(LASTFW, start, end))
+            actions.append(Action(REVSTART, end - 1))
+            end -= 1
+        for i in reversed(range(start, end)):
+            actions.append(Action(RESTORE, start, slot=slot))
+            if i > start:
+                actions.append(Action(ADVANCE, start, i))
+            actions.append(Action(REVERSE, i))
+    else:
+        m = start + _split(end - start, free)
+        if not first:
+            actions.append(Action(RESTORE, start, slot=slot))
+        actions.append(Action(ADVANCE, start, m))
+        actions.append(Action(TAKESHOT, m, slot=slot + 1))
+        _reverse(actions, m, end, slot + 1, free - 1, first)
+        actions.append(Action(CPDEL, m, slot=slot + 1))
+        _reverse(actions, start, m, slot, free, False)
+
+
+def revolve_schedule(n_timesteps, n_checkpoints):
+    """
+    The binomial checkpointing schedule reversing `n_timesteps` timesteps with
+    at most `n_checkpoints` checkpoints, which minimizes the number of forward
+    recomputations [1].
+
+    The checkpoints are used as a stack, that is the checkpoint in slot `i` is
+    always taken before, and released after, those in slots `j > i`. Hence,
+    the lower the slot, the less frequently it is accessed.
+
+    Parameters
+    ----------
+    n_timesteps : int
+        The number of timesteps to be reversed.
+    n_checkpoints : int
+        The maximum number of checkpoints, including that of the initial state.
+
+    Returns
+    -------
+    list of Action
+
+    References
+    ----------
+    .. [1] A. Griewank and A. Walther. "Algorithm 799: Revolve: An Implementation
+       of Checkpointing for the Reverse or Adjoint Mode of Computational
+       Differentiation." ACM Trans. Math. Softw., 2000.
+    """
+    if n_timesteps < 1:
+        raise ValueError("Expected at least one timestep, got %d" % n_timesteps)
+    if n_checkpoints < 1:
+        raise ValueError("Expected at least one checkpoint, got %d" % n_checkpoints)
+
+    n_checkpoints = min(n_checkpoints, n_timesteps)
+
+    actions = [Action(TAKESHOT, 0, slot=0)]
+    _reverse(actions, 0, n_timesteps, 0, n_checkpoints - 1, True)
+    actions.append(Action(CPDEL, 0, slot=0))
+    actions.append(Action(TERMINATE))
+
+    return actions
+
+
+# Compression
+
+class Codec:
+
+    """
+    Abstract base class for checkpoint compression schemes.
+    """
+
+    lossy = False
+
+    def encode(self, array):
+        """Return the compressed `array`, as a 1D numpy array."""
+        raise NotImplementedError
+
+    def decode(self, payload, out):
+        """Decompress `payload` into the numpy array `out`."""
+        raise NotImplementedError
+
+
+class Float16Codec(Codec):
+
+    """
+    Lossy compression via a cast to IEEE half precision. Twice (four times)
+    cheaper than single (double) precision, but the representable range is
+    limited to about [6e-5, 6e4], so the data must be suitably scaled.
+    """
+
+    lossy = True
+
+    def encode(self, array):
+        return array.astype(np.float16).ravel()
+
+    def decode(self, payload, out):
+        out[:] = payload.reshape(out.shape)
+
+
+class BFloat16Codec(Codec):
+
+    """
+    Lossy compression via mantissa truncation to bfloat16, that is the 16 most
+    significant bits of a single precision value. Unlike float16, the range of
+    single precision is preserved, at the price of a coarser resolution (about
+    three significant digits).
+    """
+
+    lossy = True
+
+    def encode(self, array):
+        array = np.ascontiguousarray(array, dtype=np.float32)
+        # Round to nearest rather than truncate, to avoid a systematic bias
+        bits = array.view(np.uint32).ravel().astype(np.uint64)
+        bits += 0x7fff + ((bits >> 16) & 1)
+        return (bits >> 16).astype(np.uint16)
+
+    def decode(self, payload, out):
+        bits = payload.astype(np.uint32) << 16
+        out[:] = bits.view(np.float32).reshape(out.shape)
+
+
+class ZlibCodec(Codec):
+
+    """
+    Lossless compression via zlib. The compression ratio on floating-point
+    data is usually modest, but wavefields with large quiescent regions
+    (e.g., at the beginning of a simulation) compress very well.
+    """
+
+    def __init__(self, level=1):
+        self.level = level
+
+    def encode(self, array):
+        data = zlib.compress(np.ascontiguousarray(array).data, self.level)
+        return np.frombuffer(data, dtype=np.uint8)
+
+    def decode(self, payload, out):
+        data = np.frombuffer(zlib.decompress(payload.data), dtype=out.dtype)
+        out[:] = data.reshape(out.shape)
+
+
+compression_registry = {
+    'float16': Float16Codec,
+    'bfloat16': BFloat16Codec,
+    'zlib': ZlibCodec
+}
+"""The available checkpoint compression schemes."""
+
+
+# Storage
+
+class CheckpointStorage:
+
+    """
+    A two-tier store for checkpoints, each checkpoint being a list of numpy
+    arrays of given shapes.
+
+    The first `n_disk` slots are stored on disk, one file per slot, while the
+    remaining ones are kept in RAM. The RAM slots are preallocated, unless
+    compression is used, in which case memory is allocated on demand. Disk
+    writes are performed asynchronously by a background thread; a slot being
+    written is only waited for when it is loaded back.
+
+    Parameters
+    ----------
+    shapes : list of tuple of ints
+        The shapes of the arrays making up a checkpoint.
+    dtype : data-type
+        The data type of the arrays making up a checkpoint.
+    n_slots : int
+        The number of checkpoints.
+    n_disk : int, optional
+        The number of checkpoints stored on disk. Defaults to 0.
+    compression : str or Codec, optional
+        The compression scheme, either an instance of Codec or one of the keys
+        of `compression_registry`. Defaults to None, i.e. no compression.
+    filedir : str, optional
+        The directory in which the disk slots are created. Defaults to the
+        OS temporary directory.
+    """
+
+    def __init__(self, shapes, dtype, n_slots, n_disk=0, compression=None,
+                 filedir=None):
+        self.shapes = [tuple(i) for i in shapes]
+        self.dtype = np.dtype(dtype)
+        self.n_slots = n_slots
+        self.n_disk = min(n_disk, n_slots)
+
+        if isinstance(compression, str):
+            try:
+                compression = compression_registry[compression]()
+            except KeyError:
+                raise ValueError("Unknown compression scheme `%s`; expected one of %s"
+                                 % (compression, sorted(compression_registry)))
+        self.codec = compression
+
+        # The RAM tier
+        if self.codec is None:
+            self._ram = {i: [np.empty(s, dtype=self.dtype) for s in self.shapes]
+                         for i in range(self.n_disk, n_slots)}
+        else:
+            self._ram = {}
+
+        # The disk tier
+        if self.n_disk > 0:
+            self._dir = tempfile.mkdtemp(prefix='devito-checkpoints-', dir=filedir)
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._dir = None
+            self._executor = None
+        self._pending = {}
+        self._layouts = {}
+
+    def __repr__(self):
+        return ("CheckpointStorage[ram=%d, disk=%d, compression=%s]"
+                % (self.n_slots - self.n_disk, self.n_disk,
+                   type(self.codec).__name__ if self.codec else None))
+
+    def __del__(self):
+        self.close()
+
+    @property
+    def nbytes(self):
+        """The size, in bytes, of an uncompressed checkpoint."""
+        return sum(int(np.prod(s)) for s in self.shapes)*self.dtype.itemsize
+
+    def _file(self, slot):
+        return os.path.join(self._dir, 'slot%d.dat' % slot)
+
+    def _encode(self, arrays):
+        if self.codec is None:
+            return [np.ravel(i) for i in arrays]
+        else:
+            return [self.codec.encode(i) for i in arrays]
+
+    def _decode(self, payloads, locations):
+        for payload, out in zip(payloads, locations):
+            if self.codec is None:
+                out[:] = payload.reshape(out.shape)
+            else:
+                self.codec.decode(payload, out)
+
+    def _write(self, slot, arrays):
+        payloads = self._encode(arrays)
+        with open(self._file(slot), 'wb') as f:
+            for i in payloads:
+                i.tofile(f)
+        return [(i.dtype, i.size) for i in payloads]
+
+    def _wait(self, slot=None):
+        if slot is None:
+            slots = list(self._pending)
+        else:
+            slots = [slot] if slot in self._pending else []
+        for i in slots:
+            self._layouts[i] = self._pending.pop(i).result()
+
+    def save(self, slot, arrays):
+        """Store the numpy arrays `arrays` into `slot`."""
+        if slot < self.n_disk:
+            # At most one write in flight, which bounds the memory footprint
+            self._wait()
+            # The arrays are copied, as the caller is free to overwrite them
+            # as soon as we return
+            arrays = [np.array(i, dtype=self.dtype) for i in arrays]
+            self._pending[slot] = self._executor.submit(self._write, slot, arrays)
+        elif self.codec is None:
+            for i, j in zip(self._ram[slot], arrays):
+                i[:] = j
+        else:
+            self._ram[slot] = [self.codec.encode(i) for i in arrays]
+
+    def load(self, slot, locations):
+        """Load the content of `slot` into the numpy arrays `locations`."""
+        if slot < self.n_disk:
+            self._wait(slot)
+            with open(self._file(slot), 'rb') as f:
+                payloads = [np.fromfile(f, dtype=dtype, count=size)
+                            for dtype, size in self._layouts[slot]]
+        else:
+            payloads = self._ram[slot]
+        self._decode(payloads, locations)
+
+    def remove(self, slot):
+        """Release `slot`."""
+        if slot < self.n_disk:
+            self._wait(slot)
+            self._layouts.pop(slot, None)
+            try:
+                os.remove(self._file(slot))
+            except FileNotFoundError:
+                pass
+        elif self.codec is not None:
+            self._ram.pop(slot, None)
+
+    def close(self):
+        """Release all resources, including the files of the disk slots."""
+        if getattr(self, '_executor', None) is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if getattr(self, '_dir', None) is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+
+# Driver
+
+class NativeRevolver:
+
+    """
+    Devito's native checkpointing engine. Same interface as pyrevolve's
+    Revolver, but with multistage (RAM plus disk) storage, optional
+    checkpoint compression, and no external dependencies.
+
+    Parameters
+    ----------
+    checkpoint : DevitoCheckpoint
+        The TimeFunctions making up the forward state.
+    fwd_operator : CheckpointOperator
+        The forward operator.
+    rev_operator : CheckpointOperator
+        The reverse operator.
+    n_checkpoints : int, optional
+        The number of checkpoints kept in RAM. Defaults to a number yielding
+        a good trade-off between memory consumption and recomputation.
+    n_timesteps : int
+        The number of timesteps.
+    n_disk : int, optional
+        The number of additional checkpoints stored on disk. Defaults to 0.
+    compression : str or Codec, optional
+        The checkpoint compression scheme, one of the keys of
+        `compression_registry`. Defaults to None, i.e. no compression.
+    filedir : str, optional
+        The directory in which the disk checkpoints are stored.
+
+    Notes
+    -----
+    Only the domain and halo regions of the TimeFunctions are stored, while
+    padding is skipped. As with pyrevolve, the checkpoint at timestep `t`
+    consists of the `time_order` time slices `t, ..., t + time_order - 1`.
+    """
+
+    def __init__(self, checkpoint, fwd_operator, rev_operator, n_checkpoints=None,
+                 n_timesteps=None, n_disk=0, compression=None, filedir=None):
+        if n_timesteps is None:
+            raise ValueError("Online checkpointing not supported; the number "
+                             "of timesteps must be provided")
+
+        self.checkpoint = checkpoint
+        self.fwd_operator = fwd_operator
+        self.rev_operator = rev_operator
+        self.n_timesteps = n_timesteps
+        self.n_checkpoints = n_checkpoints or adjust(n_timesteps)
+        self.n_disk = n_disk
+
+        # The disk checkpoints sit at the bottom of the stack, i.e. they are the
+        # least frequently accessed ones
+        self.schedule = revolve_schedule(n_timesteps, self.n_checkpoints + n_disk)
+        n_slots = max(i.slot for i in self.schedule if i.slot is not None) + 1
+
+        shapes = [i.shape for i in self._locations(0)]
+        self.storage = CheckpointStorage(shapes, checkpoint.dtype, n_slots,
+                                         n_disk=n_disk, compression=compression,
+                                         filedir=filedir)
+
+        self._pc = 0
+
+    def __repr__(self):
+        return ("NativeRevolver[n_timesteps=%d, n_checkpoints=%d, n_disk=%d]"
+                % (self.n_timesteps, self.n_checkpoints, self.n_disk))
+
+    @property
+    def recomputations(self):
+        """The number of forward timesteps recomputed by the schedule."""
+        n = 0
+        for i in self.schedule:
+            if i.type in (ADVANCE, LASTFW):
+                n += i.end - i.start
+            elif i.type == REVERSE:
+                n += 1
+        return n - self.n_timesteps
+
+    def _locations(self, timestep):
+        locations = []
+        for f in self.checkpoint.objects:
+            # A view of the domain+halo region, without padding. Note that
+            # `data_with_halo` isn't used as it might trigger a halo exchange
+            data = np.asarray(f._data_allocated)[f._mask_outhalo]
+            t = timestep + f.time_order - 1
+            locations.extend(data[(t - i) % data.shape[0]]
+                             for i in range(f.time_order))
+        return locations
+
+    def _execute(self, action):
+        if action.type == ADVANCE:
+            self.fwd_operator.apply(action.start, action.end)
+        elif action.type == LASTFW:
+            self.fwd_operator.apply(action.start, action.end)
+        elif action.type == TAKESHOT:
+            self.storage.save(action.slot, self._locations(action.start))
+        elif action.type == RESTORE:
+            self.storage.load(action.slot, self._locations(action.start))
+        elif action.type == CPDEL:
+            self.storage.remove(action.slot)
+        elif action.type == REVERSE:
+            self.fwd_operator.apply(action.start, action.start + 1)
+            self.rev_operator.apply(action.start, action.start + 1)
+        elif action.type == REVSTART:
+            self.rev_operator.apply(action.start, action.start + 1)
+        else:
+            raise ValueError("Unknown action %s" % str(action))
+
+    def apply_forward(self):
+        """
+        Execute the forward computation, storing checkpoints along the way.
+        """
+        self._pc = 0
+        for self._pc, action in enumerate(self.schedule, 1):
+            self._execute(action)
+            if action.type == LASTFW:
+                break
+
+    def apply_reverse(self):
+        """
+        Execute the reverse computation, restoring checkpoints and recomputing
+        the forward states as needed.
+        """
+        if self._pc == 0:
+            raise RuntimeError("`apply_forward` must be called first")
+
+        for action in self.schedule[self._pc:]:
+            if action.type == TERMINATE:
+                break
+            self._execute(action)
+        self._pc = 0
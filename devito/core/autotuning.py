@@ -1,18 +1,26 @@
 from collections import OrderedDict
 from itertools import combinations, product
 from functools import total_ordering
+from math import ceil, log2
+import json
+import os
+import tempfile
+
+import numpy as np
 
 from devito.arch import KNL, KNL7210
-from devito.ir import Backward, retrieve_iteration_tree
+from devito.ir import Backward, Expression, FindNodes, retrieve_iteration_tree
+from devito.ir.support import Scope
 from devito.logger import perf, warning as _warning
 from devito.mpi.distributed import MPI, MPINeighborhood
 from devito.mpi.routines import MPIMsgEnriched
 from devito.parameters import configuration
 from devito.symbolics import normalize_args
-from devito.tools import filter_ordered, flatten, is_integer, prod
+from devito.tools import (Signer, filter_ordered, flatten, is_integer, make_tempdir,
+                          prod)
 from devito.types import Timer
 
-__all__ = ['autotune']
+__all__ = ['autotune', 'TuningDatabase', 'tuning_database']
 
 
 def autotune(operator, args, level, mode):
@@ -28,7 +36,10 @@ def autotune(operator, args, level, mode):
     level : str
         The autotuning aggressiveness (basic, aggressive, max). A more
         aggressive autotuning might eventually result in higher runtime
-        performance, but the autotuning phase will take longer.
+        performance, but the autotuning phase will take longer. With `model`,
+        the candidates of the `aggressive` level are ranked by a cost model,
+        fitted through a few probe runs, and only the most promising ones
+        are attempted.
     mode : str
         The autotuning mode (preemptive, runtime). In preemptive mode, the
         output runtime values supplied by the user to `operator.apply` are
@@ -40,6 +51,21 @@ def autotune(operator, args, level, mode):
         raise ValueError("The accepted `(level, mode)` combinations are `%s`; "
                          "provided `%s` instead" % (accepted, key))
 
+    # Look up the tuning database, if enabled. Unless refinement is requested,
+    # a hit short-circuits the entire autotuning phase
+    refine = configuration['autotuning-refine']
+    if configuration['autotuning-db']:
+        db_key = tuning_database.signature(operator, args)
+        entry = tuning_database.load(db_key)
+    else:
+        db_key = entry = None
+    if entry is not None and not refine:
+        best = OrderedDict(entry['best'])
+        args.update(best)
+        log("selected <%s> from the tuning database"
+            % (','.join('%s=%s' % i for i in best.items())))
+        return args, {'runs': 0, 'tpr': 0, 'tuned': dict(best), 'cached': True}
+
     # We get passed all the arguments, but the cfunction only requires a subset
     at_args = OrderedDict([(p.name, args[p.name]) for p in operator.parameters])
 
@@ -90,8 +116,15 @@ def autotune(operator, args, level, mode):
     timer = Timer('timers', list(operator._profiler.all_sections))
     at_args.update(timer._arg_values())
 
-    # Perform autotuning
+    # Perform autotuning. The runs recorded in the tuning database are not repeated
     timings = {}
+    explored = set()
+    if entry is not None:
+        for k, v in entry['timings'].items():
+            nt, n, bs = decode_candidate(k)
+            timings.setdefault(nt, OrderedDict()).setdefault(n, {})[bs] = v
+            explored.add(k)
+    nruns = 0
     seen = set()
     for n, tree in enumerate(trees):
         blockable = [i.dim for i in tree if not is_integer(i.step)]
@@ -113,7 +146,22 @@ def autotune(operator, args, level, mode):
         # Symbolic number of loop-blocking blocks per thread
         nblocks_per_thread = calculate_nblocks(tree, blockable) / operator.nthreads
 
+        if level == 'model':
+            def measure(c, n=n):
+                bs, nt = c
+                return timings.get(nt, {}).get(n, {}).get(bs)
+
+            model = CostModel(tree, blockable, args, operator.nthreads)
+            tunable = model_guided(tunable, model, measure)
+
         for bs, nt in tunable:
+            if encode_candidate(nt, n, bs) in explored:
+                continue
+
+            # In refinement mode, only a few new runs are performed each time
+            if entry is not None and nruns >= refine:
+                break
+
             # Can we safely autotune over the given time range?
             if not check_time_bounds(stepper, at_args, args, mode):
                 break
@@ -130,9 +178,12 @@ def autotune(operator, args, level, mode):
             # Run the Operator
             operator.cfunction(*list(at_args.values()))
 
-            # Record timing
+            # Record timing, normalized by the number of timesteps so that
+            # runs from different executions are comparable
             elapsed = timer.total
-            timings.setdefault(nt, OrderedDict()).setdefault(n, {})[bs] = elapsed
+            timings.setdefault(nt, OrderedDict()).setdefault(n, {})[bs] = \
+                elapsed / max(timesteps, 1)
+            nruns += 1
             log("run <%s> took %f (s) in %d timesteps" %
                 (','.join('%s=%s' % i for i in run), elapsed, timesteps))
 
@@ -143,11 +194,9 @@ def autotune(operator, args, level, mode):
     # The best variant is the one that for a given number of threads had the minium
     # turnaround time
     try:
-        runs = 0
         mapper = {}
         for k, v in timings.items():
             for i in v.values():
-                runs += len(i)
                 record = mapper.setdefault(k, Record())
                 record.add(min(i, key=i.get), min(i.values()))
         best = min(mapper, key=mapper.get)
@@ -161,19 +210,164 @@ def autotune(operator, args, level, mode):
     # Update the argument list with the tuned arguments
     args.update(best)
 
+    if db_key is not None:
+        tuning_database.store(db_key, operator, args, timings, best)
+
     # In `runtime` mode, some timesteps have been executed already, so we must
     # adjust the time range
     finalize_time_bounds(stepper, at_args, args, mode)
 
     # Autotuning summary
     summary = {}
-    summary['runs'] = runs
+    summary['runs'] = nruns
     summary['tpr'] = timesteps  # tpr -> timesteps per run
     summary['tuned'] = dict(best)
 
     return args, summary
 
 
+class TuningDatabase:
+
+    """
+    A persistent database of autotuning results.
+
+    An entry is keyed by the Operator (through its soname), the shape of the
+    iteration space, the platform, the compiler, and the number of threads.
+    It records the normalized timings (i.e., seconds per timestep) of all runs
+    performed so far as well as the best set of tuned arguments. Entries are
+    stored as JSON files within a directory, one file per entry, and writes
+    are atomic, so the database may be shared by concurrent processes.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        The database directory. Defaults to `configuration['autotuning-db-dir']`
+        or, if unset, to a deterministic temporary directory.
+    """
+
+    _suffix = '.json'
+
+    def __init__(self, path=None):
+        self._path = path
+
+    @property
+    def path(self):
+        path = self._path or configuration['autotuning-db-dir']
+        if path is None:
+            return make_tempdir('autotuning')
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @property
+    def entries(self):
+        """The database entries, from the least to the most recently used."""
+        entries = []
+        for i in os.scandir(self.path):
+            if not i.name.endswith(self._suffix):
+                continue
+            try:
+                stat = i.stat()
+            except FileNotFoundError:
+                # Concurrently removed
+                continue
+            entries.append((stat.st_mtime, i.name[:-len(self._suffix)]))
+        return [key for _, key in sorted(entries)]
+
+    def signature(self, operator, args):
+        """Compute the database key for `operator` run with `args`."""
+        shape = [(d.name, args[d.max_name] - args[d.min_name] + 1)
+                 for d in operator.dimensions
+                 if d.is_Space and d.root is d and d.max_name in args]
+        nthreads = operator.nthreads
+        if nthreads != 1:
+            nthreads = args[nthreads.name]
+        compiler = operator._compiler
+
+        items = [operator._soname, str(shape), str(operator._platform),
+                 str(compiler), str(compiler.version), str(nthreads)]
+
+        return Signer._sign(items)
+
+    def _file(self, key):
+        return os.path.join(self.path, '%s%s' % (key, self._suffix))
+
+    def load(self, key):
+        """Return the entry stored under `key`, or None in case of miss."""
+        filename = self._file(key)
+
+        try:
+            with open(filename, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # E.g., a truncated entry
+            self.remove(key)
+            return None
+
+        # Mark as most recently used
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+
+        return entry
+
+    def store(self, key, operator, args, timings, best):
+        """Store, under `key`, the autotuning `timings` and the `best` arguments."""
+        nthreads = operator.nthreads
+        entry = {
+            'name': operator.name,
+            'soname': operator._soname,
+            'shape': [[d.name, int(args[d.max_name] - args[d.min_name] + 1)]
+                      for d in operator.dimensions
+                      if d.is_Space and d.root is d and d.max_name in args],
+            'platform': str(operator._platform),
+            'compiler': str(operator._compiler),
+            'nthreads': 1 if nthreads == 1 else int(args[nthreads.name]),
+            'best': [[k, int(v)] for k, v in best.items()],
+            'timings': {encode_candidate(nt, n, bs): t
+                        for nt, v in timings.items()
+                        for n, i in v.items()
+                        for bs, t in i.items()}
+        }
+
+        try:
+            with tempfile.NamedTemporaryFile(mode='w', dir=self.path, prefix='.tmp-',
+                                             delete=False) as f:
+                tmpname = f.name
+                json.dump(entry, f, indent=2)
+            os.replace(tmpname, self._file(key))
+        except OSError as e:
+            warning("couldn't update the tuning database [%s]" % e)
+
+    def remove(self, key):
+        """Drop the entry stored under `key`."""
+        try:
+            os.remove(self._file(key))
+        except FileNotFoundError:
+            # Concurrently removed
+            pass
+
+    def clear(self):
+        """Drop all entries."""
+        for key in self.entries:
+            self.remove(key)
+
+
+tuning_database = TuningDatabase()
+"""The default TuningDatabase, enabled via `configuration['autotuning-db']`."""
+
+
+def encode_candidate(nt, n, bs):
+    return json.dumps([[[k, int(v)] for k, v in nt], n, [[k, int(v)] for k, v in bs]])
+
+
+def decode_candidate(key):
+    nt, n, bs = json.loads(key)
+    return tuple(tuple(i) for i in nt), n, tuple(tuple(i) for i in bs)
+
+
 @total_ordering
 class Record:
 
@@ -295,7 +489,7 @@ def generate_block_shapes(blockable, args, level):
     # Always try the entire iteration space (degenerate block)
     ret.append(max_bs)
     # More attempts if autotuning in aggressive mode
-    if level in ['aggressive', 'max']:
+    if level in ['aggressive', 'max', 'model']:
         # Ramp up to larger block shapes
         handle = tuple((i, options['blocksize-l0'][-1]) for i, _ in ret[0])
         for i in range(3):
@@ -343,6 +537,133 @@ def generate_block_shapes(blockable, args, level):
     return ret
 
 
+class CostModel:
+
+    """
+    A cost model for loop blocking.
+
+    The execution time of a block shape is modeled as a linear combination of
+    the following features:
+
+        * the redundant traffic due to the stencil halo, increased in case the
+          working set of a block exceeds the per-core cache;
+        * the load imbalance among threads, due to the number of blocks not
+          being a multiple of the number of threads.
+
+    The coefficients are fitted, through least squares, on the timings of a
+    few probe runs, since they depend on the Operator, the hardware, the
+    compiler, etc.
+
+    Parameters
+    ----------
+    tree : IterationTree
+        The blocked loop nest.
+    blockable : list of Dimension
+        The block Dimensions in `tree`.
+    args : dict
+        The runtime arguments.
+    nthreads : NThreads or int
+        The number of threads.
+    """
+
+    def __init__(self, tree, blockable, args, nthreads):
+        normalized = normalize_args(args)
+
+        # The outermost block Dimensions, e.g. `x0_blk0` but not `x0_blk1`
+        level_0 = [d for d in blockable if d.parent not in blockable]
+        self.extents = {d.step.name: (d.root, int(d.root.symbolic_size.subs(normalized)))
+                        for d in level_0}
+
+        # The stencil footprint
+        exprs = FindNodes(Expression).visit(tree.root)
+        indexeds = Scope([e.expr for e in exprs]).indexeds
+        self.radius = {}
+        for d, _ in self.extents.values():
+            offsets = [int(i - d) for i in flatten(j.indices for j in indexeds)
+                       if d in i.free_symbols and is_integer(i - d)]
+            self.radius[d] = (max(offsets) - min(offsets)) // 2 if offsets else 0
+
+        # The working set of a block also depends on the non-blocked Dimensions
+        roots = {d for d, _ in self.extents.values()}
+        inner = filter_ordered(i.dim.root for i in tree
+                               if i.dim.is_Space and i.dim.root not in roots)
+        self.inner = prod(int(d.symbolic_size.subs(normalized)) for d in inner)
+        self.nfunctions = len({i.function for i in indexeds}) or 1
+        self.itemsize = max([np.dtype(i.function.dtype).itemsize for i in indexeds],
+                            default=4)
+
+        caches = configuration['platform'].cache_sizes or {}
+        self.cache = caches.get(2) or max(caches.values(), default=2**20)
+
+        self.nthreads = 1 if nthreads == 1 else int(args[nthreads.name])
+
+    def features(self, bs):
+        bs = dict(bs)
+        halo = 1.
+        ws = self.itemsize * self.nfunctions * self.inner
+        nblocks = 1
+        for name, (d, extent) in self.extents.items():
+            b = min(int(bs[name]), extent)
+            r = self.radius[d]
+            halo *= (b + 2*r) / b
+            ws *= b + 2*r
+            nblocks *= ceil(extent / b)
+        spill = max(1., ws / self.cache)
+        imbalance = ceil(nblocks / self.nthreads) * self.nthreads / nblocks
+        return [1., halo * (1. + log2(spill)), imbalance]
+
+    def prior(self, bs):
+        """A ranking of the block shapes in absence of timings."""
+        _, traffic, imbalance = self.features(bs)
+        return traffic * imbalance
+
+
+def model_guided(tunable, model, measure):
+    """
+    Yield the `(block shape, nthreads)` candidates in `tunable` worth running,
+    as predicted by `model`. First, a few probes, spread across the ranking
+    given by `model.prior`, are yielded; their timings, retrieved through
+    `measure`, are then used to fit `model`. Finally, the top-k candidates
+    are yielded, stopping early if the timings stop improving.
+    """
+    ranked = sorted(tunable, key=lambda c: model.prior(c[0]))
+    if not ranked:
+        return
+
+    nprobes = min(options['model-probes'], len(ranked))
+    indices = np.linspace(0, len(ranked) - 1, nprobes).round().astype(int)
+    probes = [ranked[i] for i in filter_ordered(indices)]
+    for c in probes:
+        yield c
+
+    measured = [(c, measure(c)) for c in probes]
+    measured = [(c, t) for c, t in measured if t is not None]
+    others = [c for c in ranked if c not in probes]
+
+    if len(measured) >= 2:
+        X = np.array([model.features(c[0]) for c, _ in measured])
+        y = np.array([t for _, t in measured])
+        coeffs = np.linalg.lstsq(X, y, rcond=None)[0]
+        others.sort(key=lambda c: float(np.dot(model.features(c[0]), coeffs)))
+
+    best = min([t for _, t in measured], default=np.inf)
+    stale = 0
+    for c in others[:options['model-topk']]:
+        yield c
+
+        t = measure(c)
+        if t is None:
+            continue
+        if t < best * (1 - options['model-tolerance']):
+            best = t
+            stale = 0
+        else:
+            stale += 1
+            if stale >= options['model-patience']:
+                log("timings converged; stopping")
+                return
+
+
 def generate_nthreads(nthreads, args, level):
     if nthreads == 1:
         return [((None, 1),)]
@@ -379,6 +700,10 @@ options = {
     'squeezer': 4,
     'blocksize-l0': (8, 16, 24, 32, 64, 96, 128),
     'blocksize-l1': (8, 16, 32),
+    'model-probes': 4,
+    'model-topk': 4,
+    'model-tolerance': 0.02,
+    'model-patience': 2,
 }
 """Autotuning options."""
 
@@ -4,14 +4,15 @@ from devito.core.operator import CoreOperator, CustomOperator, ParTile
 from devito.exceptions import InvalidOperator
 from devito.operator.operator import rcompile
 from devito.passes import stream_dimensions
-from devito.passes.equations import collect_derivatives
+from devito.passes.equations import (collect_derivatives, color_injections,
+                                     tabulate_interpolation)
 from devito.passes.clusters import (Lift, blocking, buffering, cire, cse,
                                     factorize, fission, fuse, optimize_pows,
-                                    optimize_hyperplanes)
+                                    optimize_hyperplanes, tasking)
 from devito.passes.iet import (CTarget, OmpTarget, avoid_denormals, linearize,
                                mpiize, hoist_prodders, relax_incr_dimensions,
-                               check_stability)
-from devito.tools import timed_pass
+                               check_stability, pthreadify)
+from devito.tools import as_tuple, timed_pass
 
 __all__ = ['Cpu64NoopCOperator', 'Cpu64NoopOmpOperator', 'Cpu64AdvCOperator',
            'Cpu64AdvOmpOperator', 'Cpu64FsgCOperator', 'Cpu64FsgOmpOperator',
@@ -28,6 +29,7 @@ class Cpu64OperatorMixin:
         # Execution modes
         o['openmp'] = oo.pop('openmp')
         o['mpi'] = oo.pop('mpi')
+        o['mpi-codec'] = oo.pop('mpi-codec')
         o['parallel'] = o['openmp']  # Backwards compatibility
 
         # Buffering
@@ -66,6 +68,7 @@ class Cpu64OperatorMixin:
         o['par-chunk-nonaffine'] = oo.pop('par-chunk-nonaffine', cls.PAR_CHUNK_NONAFFINE)
         o['par-dynamic-work'] = oo.pop('par-dynamic-work', cls.PAR_DYNAMIC_WORK)
         o['par-nested'] = oo.pop('par-nested', cls.PAR_NESTED)
+        o['inject-coloring'] = oo.pop('inject-coloring', False)
 
         # Distributed parallelism
         o['dist-drop-unwritten'] = oo.pop('dist-drop-unwritten', cls.DIST_DROP_UNWRITTEN)
@@ -79,9 +82,11 @@ class Cpu64OperatorMixin:
         o['opt-comms'] = oo.pop('opt-comms', True)
         o['linearize'] = oo.pop('linearize', False)
         o['mapify-reduce'] = oo.pop('mapify-reduce', cls.MAPIFY_REDUCE)
+        o['tree-reduce'] = oo.pop('tree-reduce', cls.TREE_REDUCE)
         o['index-mode'] = oo.pop('index-mode', cls.INDEX_MODE)
         o['place-transfers'] = oo.pop('place-transfers', True)
         o['errctl'] = oo.pop('errctl', cls.ERRCTL)
+        o['interp-tables'] = oo.pop('interp-tables', False)
 
         # Recognised but unused by the CPU backend
         oo.pop('par-disabled', None)
@@ -146,8 +151,18 @@ class Cpu64AdvOperator(Cpu64OperatorMixin, CoreOperator):
     @classmethod
     @timed_pass(name='specializing.DSL')
     def _specialize_dsl(cls, expressions, **kwargs):
+        options = kwargs['options']
+
         expressions = collect_derivatives(expressions)
 
+        # Positions and weights of the sparse points computed once per run
+        if options['interp-tables']:
+            expressions = tabulate_interpolation(expressions)
+
+        # Conflict-free sparse injections, rather than atomic increments
+        if options['inject-coloring']:
+            expressions = color_injections(expressions)
+
         return expressions
 
     @classmethod
@@ -250,6 +265,8 @@ class Cpu64CustomOperator(Cpu64OperatorMixin, CustomOperator):
     def _make_dsl_passes_mapper(cls, **kwargs):
         return {
             'collect-derivs': collect_derivatives,
+            'inject-coloring': color_injections,
+            'interp-tables': tabulate_interpolation,
         }
 
     @classmethod
@@ -266,8 +283,18 @@ class Cpu64CustomOperator(Cpu64OperatorMixin, CustomOperator):
             else:
                 return None
 
+        # Callback used by `tasking`; a Cluster writing to a saved TimeFunction
+        # (typically, the copy-out of a buffered snapshot) becomes a task,
+        # which is offloaded to a helper thread
+        def stream_key(items, *args):
+            retval = {callback(f) for f in as_tuple(items) if callback(f)}
+            if len(retval) > 1:
+                raise ValueError("Cannot determine homogenous stream Dimensions")
+            return retval.pop() if retval else None
+
         return {
             'buffering': lambda i: buffering(i, callback, sregistry, options),
+            'tasking': lambda i: tasking(i, stream_key, sregistry),
             'blocking': lambda i: blocking(i, sregistry, options),
             'factorize': factorize,
             'fission': fission,
@@ -289,9 +316,12 @@ class Cpu64CustomOperator(Cpu64OperatorMixin, CustomOperator):
         sregistry = kwargs['sregistry']
 
         parizer = cls._Target.Parizer(sregistry, options, platform, compiler)
+        orchestrator = cls._Target.Orchestrator(**kwargs)
 
         return {
             'denormals': partial(avoid_denormals, **kwargs),
+            'orchestrate': partial(orchestrator.process),
+            'pthreadify': partial(pthreadify, sregistry=sregistry),
             'blocking': partial(relax_incr_dimensions, **kwargs),
             'parallel': parizer.make_parallel,
             'openmp': parizer.make_parallel,
@@ -308,12 +338,13 @@ class Cpu64CustomOperator(Cpu64OperatorMixin, CustomOperator):
         # Expressions
         'buffering',
         # Clusters
-        'blocking', 'topofuse', 'fission', 'fuse', 'factorize', 'cire-sops',
-        'cse', 'lift', 'opt-pows', 'opt-hyperplanes',
+        'blocking', 'tasking', 'topofuse', 'fission', 'fuse', 'factorize',
+        'cire-sops', 'cse', 'lift', 'opt-pows', 'opt-hyperplanes',
         # IET
-        'denormals', 'openmp', 'mpi', 'linearize', 'simd', 'prodders',
+        'denormals', 'orchestrate', 'pthreadify', 'openmp', 'mpi', 'linearize',
+        'simd', 'prodders',
     )
-    _known_passes_disabled = ('tasking', 'streaming', 'openacc')
+    _known_passes_disabled = ('streaming', 'openacc')
     assert not (set(_known_passes) & set(_known_passes_disabled))
 
 
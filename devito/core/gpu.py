@@ -6,7 +6,8 @@ from devito.core.operator import CoreOperator, CustomOperator, ParTile
 from devito.exceptions import InvalidOperator
 from devito.operator.operator import rcompile
 from devito.passes import is_on_device, stream_dimensions
-from devito.passes.equations import collect_derivatives
+from devito.passes.equations import (collect_derivatives, color_injections,
+                                     tabulate_interpolation)
 from devito.passes.clusters import (Lift, tasking, memcpy_prefetch, blocking,
                                     buffering, cire, cse, factorize, fission, fuse,
                                     optimize_pows)
@@ -38,6 +39,7 @@ class DeviceOperatorMixin:
 
         # Execution modes
         o['mpi'] = oo.pop('mpi')
+        o['mpi-codec'] = oo.pop('mpi-codec')
         o['parallel'] = True
 
         # Buffering
@@ -77,6 +79,7 @@ class DeviceOperatorMixin:
         o['par-dynamic-work'] = np.inf  # Always use static scheduling
         o['par-nested'] = np.inf  # Never use nested parallelism
         o['par-disabled'] = oo.pop('par-disabled', True)  # No host parallelism by default
+        o['inject-coloring'] = oo.pop('inject-coloring', False)
         o['gpu-fit'] = cls._normalize_gpu_fit(oo, **kwargs)
         o['gpu-create'] = as_tuple(oo.pop('gpu-create', ()))
 
@@ -92,9 +95,11 @@ class DeviceOperatorMixin:
         o['opt-comms'] = oo.pop('opt-comms', True)
         o['linearize'] = oo.pop('linearize', False)
         o['mapify-reduce'] = oo.pop('mapify-reduce', cls.MAPIFY_REDUCE)
+        o['tree-reduce'] = oo.pop('tree-reduce', cls.TREE_REDUCE)
         o['index-mode'] = oo.pop('index-mode', cls.INDEX_MODE)
         o['place-transfers'] = oo.pop('place-transfers', True)
         o['errctl'] = oo.pop('errctl', cls.ERRCTL)
+        o['interp-tables'] = oo.pop('interp-tables', False)
 
         if oo:
             raise InvalidOperator("Unsupported optimization options: [%s]"
@@ -171,8 +176,18 @@ class DeviceAdvOperator(DeviceOperatorMixin, CoreOperator):
     @classmethod
     @timed_pass(name='specializing.DSL')
     def _specialize_dsl(cls, expressions, **kwargs):
+        options = kwargs['options']
+
         expressions = collect_derivatives(expressions)
 
+        # Positions and weights of the sparse points computed once per run
+        if options['interp-tables']:
+            expressions = tabulate_interpolation(expressions)
+
+        # Conflict-free sparse injections, rather than atomic increments
+        if options['inject-coloring']:
+            expressions = color_injections(expressions)
+
         return expressions
 
     @classmethod
@@ -264,6 +279,8 @@ class DeviceCustomOperator(DeviceOperatorMixin, CustomOperator):
     def _make_dsl_passes_mapper(cls, **kwargs):
         return {
             'collect-derivs': collect_derivatives,
+            'inject-coloring': color_injections,
+            'interp-tables': tabulate_interpolation,
         }
 
     @classmethod
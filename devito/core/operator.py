@@ -5,6 +5,7 @@ from devito.core.autotuning import autotune
 from devito.exceptions import InvalidArgument, InvalidOperator
 from devito.ir import FindSymbols
 from devito.logger import warning
+from devito.mpi.codecs import halo_codec_registry
 from devito.mpi.routines import mpi_registry
 from devito.parameters import configuration
 from devito.operator import Operator
@@ -102,6 +103,13 @@ class BasicOperator(Operator):
     which may be easier to parallelize for certain backends.
     """
 
+    TREE_REDUCE = False
+    """
+    Turn all scalar reductions into hierarchical reductions with a fixed order
+    of evaluation, which makes them bitwise-reproducible regardless of the
+    number of threads.
+    """
+
     EXPAND = True
     """
     Unroll all loops with short, numeric trip count, such as loops created by
@@ -169,6 +177,9 @@ class BasicOperator(Operator):
         if oo['mpi'] and oo['mpi'] not in cls.MPI_MODES:
             raise InvalidOperator("Unsupported MPI mode `%s`" % oo['mpi'])
 
+        if oo['mpi-codec'] and oo['mpi-codec'] not in halo_codec_registry:
+            raise InvalidOperator("Unsupported halo codec `%s`" % oo['mpi-codec'])
+
         if oo['cse-algo'] not in ('basic', 'smartsort', 'advanced'):
             raise InvalidArgument("Illegal `cse-algo` value")
 
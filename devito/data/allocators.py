@@ -6,16 +6,20 @@ from ctypes.util import find_library
 import mmap
 import os
 import sys
+import tempfile
 
 import numpy as np
 
 from devito.logger import logger
 from devito.parameters import configuration
-from devito.tools import dtype_to_ctype, is_integer
+from devito.tools import dtype_to_ctype, is_integer, make_tempdir
 
 __all__ = ['ALLOC_ALIGNED', 'ALLOC_NUMA_LOCAL', 'ALLOC_NUMA_ANY',
            'ALLOC_KNL_MCDRAM', 'ALLOC_KNL_DRAM', 'ALLOC_GUARD',
-           'default_allocator']
+           'MmapAllocator', 'SharedMemoryAllocator', 'default_allocator']
+
+# The `msync` flag for synchronous writebacks
+_MS_SYNC = 0x10 if sys.platform == 'darwin' else 4
 
 
 class AbstractMemoryAllocator:
@@ -253,6 +257,115 @@ class GuardAllocator(PosixAllocator):
         self.lib.free(c_pointer)
 
 
+class MmapAllocator(PosixAllocator):
+
+    """
+    Memory allocator backing the data with a memory-mapped file, rather than
+    with anonymous memory. This allows the allocation of arrays larger than
+    the available RAM, such as the whole wavefield of a `TimeFunction(save=nt)`.
+    The operating system pages the data in and out of RAM as it is accessed,
+    both by Operators and in Python, so that, regardless of the array size,
+    only the recently used time slices stay resident.
+
+    The backing file is created within `path` and is unlinked straight away,
+    so the disk space is automatically reclaimed once the data is freed, even
+    if the process gets killed.
+
+    Parameters
+    ----------
+    path : str, optional
+        The directory in which the backing files are created. Defaults to a
+        temporary directory. Ideally, it should reside on a fast local disk.
+
+    Examples
+    --------
+    >>> from devito import Grid, TimeFunction, MmapAllocator
+    >>> grid = Grid(shape=(4, 4))
+    >>> allocator = MmapAllocator()
+    >>> u = TimeFunction(name='u', grid=grid, save=100, allocator=allocator)
+
+    Before an Operator reading the saved wavefield backwards in time, the last
+    time slices may be prefetched, while the time slices no longer needed may be
+    released from RAM at any time.
+
+    >>> allocator.prefetch(u.data[-10:])
+    >>> allocator.release(u.data[:-10])
+    """
+
+    # Own `libc` handle, as its function prototypes get customized
+    _attempted_init = False
+    lib = None
+
+    def __init__(self, path=None):
+        self.path = path
+
+    @classmethod
+    def initialize(cls):
+        super().initialize()
+        if cls.lib is None:
+            return
+
+        cls.lib.mmap.restype = ctypes.c_void_p
+        cls.lib.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int,
+                                 ctypes.c_int, ctypes.c_int, ctypes.c_long]
+        cls.lib.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        cls.lib.madvise.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+        cls.lib.msync.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+
+    def _alloc_C_libcall(self, size, ctype):
+        if not self.available():
+            raise RuntimeError("Couldn't find `libc`'s `mmap` to allocate memory")
+
+        path = self.path or make_tempdir('mmap')
+        os.makedirs(path, exist_ok=True)
+
+        nbytes = size * ctypes.sizeof(ctype)
+        fd, filename = tempfile.mkstemp(dir=path, suffix='.dat')
+        try:
+            os.unlink(filename)
+            os.ftruncate(fd, nbytes)
+            ptr = self.lib.mmap(None, nbytes, mmap.PROT_READ | mmap.PROT_WRITE,
+                                mmap.MAP_SHARED, fd, 0)
+        except OSError:
+            os.close(fd)
+            return None, None
+        if ptr is None or ptr == ctypes.c_void_p(-1).value:
+            os.close(fd)
+            return None, None
+
+        c_pointer = ctypes.c_void_p(ptr)
+        return c_pointer, (c_pointer, nbytes, fd)
+
+    def free(self, c_pointer, nbytes, fd):
+        self.lib.munmap(c_pointer, nbytes)
+        os.close(fd)
+
+    def _pages(self, array):
+        """The page-aligned memory region spanned by `array`."""
+        low, high = np.byte_bounds(array)
+        start = low - low % self.lib.getpagesize()
+        return start, max(high - start, 0)
+
+    def prefetch(self, array):
+        """
+        Asynchronously page in `array`, a view of some data allocated by this
+        MmapAllocator (e.g., `u.data[t0:t1]`).
+        """
+        start, nbytes = self._pages(array)
+        self.lib.madvise(start, nbytes, mmap.MADV_WILLNEED)
+
+    def release(self, array):
+        """
+        Write `array`, a view of some data allocated by this MmapAllocator, back
+        to disk and drop it from RAM. The data is paged back in on access.
+        """
+        # As the mapping is shared, dropping pages doesn't lose any data, even
+        # if the page-aligned region exceeds `array`
+        start, nbytes = self._pages(array)
+        self.lib.msync(start, nbytes, _MS_SYNC)
+        self.lib.madvise(start, nbytes, mmap.MADV_DONTNEED)
+
+
 class NumaAllocator(MemoryAllocator):
 
     """
@@ -337,6 +450,63 @@ class NumaAllocator(MemoryAllocator):
         return self._node == 'local'
 
 
+class SharedMemoryAllocator(MemoryAllocator):
+
+    """
+    Memory allocator based on MPI-3 shared-memory windows. The memory is
+    allocated collectively by all MPI ranks in `comm`, which must share the
+    same node (e.g., `grid.distributor.comm_node`), and each rank may then
+    directly access the memory allocated by the others.
+
+    Parameters
+    ----------
+    comm : MPI.Comm
+        The node-local communicator over which the windows are allocated.
+
+    Notes
+    -----
+    Each allocation is a collective operation, so all ranks in `comm` must
+    allocate the same objects in the same order. The size of the allocations
+    may instead differ across ranks.
+    """
+
+    _attempted_init = False
+    lib = None
+
+    def __init__(self, comm):
+        self.comm = comm
+
+    @classmethod
+    def initialize(cls):
+        from devito.mpi import MPI
+        if MPI.Win is not None:
+            cls.lib = MPI
+
+    def _alloc_C_libcall(self, size, ctype):
+        if not self.available():
+            raise RuntimeError("Couldn't find `mpi4py` to allocate shared memory")
+
+        disp_unit = ctypes.sizeof(ctype)
+        try:
+            win = self.lib.Win.Allocate_shared(size*disp_unit, disp_unit,
+                                               comm=self.comm)
+        except self.lib.Exception:
+            return None, None
+
+        c_pointer = self.address(win, self.comm.rank)
+        return c_pointer, (win,)
+
+    def free(self, win):
+        win.Free()
+
+    def address(self, win, rank):
+        """
+        The pointer to the memory allocated by `rank` within the window `win`.
+        """
+        buf, _ = win.Shared_query(rank)
+        return ctypes.c_void_p(buf.address)
+
+
 class DataReference(MemoryAllocator):
 
     """
@@ -9,7 +9,7 @@ from devito.exceptions import InvalidOperator
 from devito.finite_differences.elementary import Max, Min
 from devito.ir.support import (Any, Backward, Forward, IterationSpace, erange,
                                pull_dims, null_ispace)
-from devito.ir.equations import OpMin, OpMax, identity_mapper
+from devito.ir.equations import OpInc, OpMin, OpMax, identity_mapper
 from devito.ir.clusters.analysis import analyze
 from devito.ir.clusters.cluster import Cluster, ClusterGroup
 from devito.ir.clusters.visitors import Queue, QueueStateful, cluster_pass
@@ -502,6 +502,8 @@ def reduction_comms(clusters):
 
 def normalize(clusters, sregistry=None, options=None, platform=None, **kwargs):
     clusters = normalize_nested_indexeds(clusters, sregistry)
+    if options['tree-reduce']:
+        clusters = normalize_reductions_tree(clusters, sregistry)
     if options['mapify-reduce']:
         clusters = normalize_reductions_dense(clusters, sregistry, platform)
     else:
@@ -565,10 +567,15 @@ def normalize_reductions_minmax(cluster):
         lhs, rhs = e.args
         f = lhs.function
 
+        # The reduction variable is initialized once, outside of all of the
+        # Dimensions it's reduced along, including the sequential ones
+        ispace = cluster.ispace.project(
+            lambda i: i not in dims and i._defines & lhs.free_symbols
+        )
+
         if e.operation is OpMin:
             if not f.is_Input:
                 expr = Eq(lhs, limits_mapper[lhs.dtype].max)
-                ispace = cluster.ispace.project(lambda i: i not in dims)
                 init.append(cluster.rebuild(exprs=expr, ispace=ispace))
 
             processed.append(e.func(lhs, Min(lhs, rhs)))
@@ -576,7 +583,6 @@ def normalize_reductions_minmax(cluster):
         elif e.operation is OpMax:
             if not f.is_Input:
                 expr = Eq(lhs, limits_mapper[lhs.dtype].min)
-                ispace = cluster.ispace.project(lambda i: i not in dims)
                 init.append(cluster.rebuild(exprs=expr, ispace=ispace))
 
             processed.append(e.func(lhs, Max(lhs, rhs)))
@@ -587,6 +593,121 @@ def normalize_reductions_minmax(cluster):
     return init + [cluster.rebuild(processed)]
 
 
+reducers = {OpInc: sympy.Add, OpMin: Min, OpMax: Max}
+
+
+@cluster_pass(mode='dense')
+def normalize_reductions_tree(cluster, sregistry):
+    """
+    Turn reductions into scalars into hierarchical reductions whose order of
+    evaluation is fixed at compile time, hence bitwise-reproducible regardless
+    of the number of threads.
+
+    Examples
+    --------
+    Given an increment expression such as
+
+        s += f(u[x, y, z], ...)
+
+    Turn it into
+
+        r1[x] = 0
+        r0[x, y] = 0
+        r0[x, y] = r0[x, y] + f(u[x, y, z], ...)  # x, y parallel, z sequential
+        r1[x] = r1[x] + r0[x, y]                  # x parallel, y sequential
+        s += r1[x]                                # x sequential
+
+    Each partial sum accumulates along one Dimension only, so the rounding
+    error grows with `nx + ny + nz` rather than with `nx*ny*nz`.
+    """
+    candidates = [d for d in cluster.ispace.itdims
+                  if cluster.properties.is_parallel_atomic(d)]
+    if not candidates:
+        return cluster
+
+    reductions = [e for e in cluster.exprs if e.is_Reduction]
+    if not reductions or \
+       any(e.lhs.is_Indexed or e.dtype not in identity_mapper for e in reductions):
+        return cluster
+
+    # The partial sums are only carried along the innermost space Dimensions;
+    # all other reduced Dimensions, such as time, are simply sequentialized
+    dims = [d for d in candidates if not d.is_Time]
+    if dims != list(cluster.ispace.itdims[-len(dims):]):
+        dims = []
+    properties = cluster.properties.sequentialize(
+        [d for d in candidates if d not in dims]
+    )
+    if len(dims) <= 1:
+        # Once sequentialized, the min/max reductions would go unnoticed by
+        # `normalize_reductions_minmax`, hence we lower them right away
+        *init, cluster = normalize_reductions_minmax([cluster])
+        return init + [cluster.rebuild(properties=properties.sequentialize(dims))]
+
+    try:
+        grid = cluster.grid
+    except ValueError:
+        grid = None
+
+    # Each level of the reduction tree gets its own loop nest, as fusing it
+    # with the previous level would sequentialize the parallel Dimensions
+    stamps = [Stamp() for _ in dims[:-1]]
+
+    def project(a, i=None):
+        ispace = cluster.ispace.project(lambda d: d not in dims or d in a.dimensions)
+        if i is not None:
+            ispace = ispace.lift(dims, stamps[i])
+        return ispace
+
+    init = []
+    processed = []
+    combine = DefaultOrderedDict(list)
+    for e in cluster.exprs:
+        if not e.is_Reduction:
+            processed.append(e)
+            continue
+
+        # One partial-sum Array per level of the reduction tree
+        arrays = [Array(name=sregistry.make_name(), dtype=e.dtype,
+                        dimensions=dims[:i], grid=grid)
+                  for i in range(1, len(dims))]
+
+        reducer = reducers[e.operation]
+        v = identity_mapper[e.dtype][e.operation]
+
+        for a in arrays:
+            init.append(cluster.rebuild(
+                exprs=Eq(a.indexify(), v), ispace=project(a),
+                properties=properties.parallelize(a.dimensions)
+            ))
+
+        r = arrays[-1].indexify()
+        processed.append(e.func(r, reducer(r, e.rhs), operation=None))
+
+        for i, (a, b) in enumerate(zip(arrays, arrays[1:]), 1):
+            p = properties.parallelize(a.dimensions)
+            combine[i].append(cluster.rebuild(
+                exprs=Eq(a.indexify(), reducer(a.indexify(), b.indexify())),
+                ispace=project(b, i), properties=p.sequentialize(b.dimensions[-1])
+            ))
+
+        # Unlike sums, min/max are exact, hence the last level may safely be
+        # left to the backend (e.g., OpenMP reductions)
+        a = arrays[0]
+        if e.operation is OpInc:
+            p = properties.sequentialize(a.dimensions)
+        else:
+            p = properties
+        combine[0].append(cluster.rebuild(
+            exprs=e.func(e.lhs, a.indexify()), ispace=project(a, 0), properties=p
+        ))
+
+    properties = properties.parallelize(dims[:-1]).sequentialize(dims[-1])
+    processed = cluster.rebuild(exprs=processed, properties=properties)
+
+    return init + [processed] + flatten(combine[i] for i in sorted(combine, reverse=True))
+
+
 def normalize_reductions_dense(cluster, sregistry, platform):
     """
     Extract the right-hand sides of reduction Eq's in to temporaries.
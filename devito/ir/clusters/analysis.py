@@ -70,6 +70,11 @@ class Parallelism(Detector):
             (d_1, ..., d_i) = 0, OR
             (d_1, ..., d_{i-1}) > 0, OR
             the 'write' is known to be an associative and commutative increment
+
+    The increments nested within a Dimension iterating over the points of one
+    color, that is a Dimension whose bounds depend on an enclosing
+    ColorDimension, do not conflict along it, which is therefore PARALLEL
+    rather than PARALLEL_IF_ATOMIC.
     """
 
     def _callback(self, clusters, d, prefix):
@@ -77,9 +82,18 @@ class Parallelism(Detector):
         if any(c.sub_iterators[d] for c in clusters):
             return SEQUENTIAL
 
+        # The colors must be processed one at a time
+        if d.is_Color:
+            return SEQUENTIAL
+
         # All Dimensions up to and including `i-1`
         prev = flatten(i.dim._defines for i in prefix[:-1])
 
+        # Is `d` iterating over the points of one color?
+        colors = {i.dim for i in prefix[:-1] if i.dim.is_Color}
+        colored = colors and \
+            colors & (d.symbolic_min.free_symbols | d.symbolic_max.free_symbols)
+
         is_parallel_indep = True
         is_parallel_atomic = False
 
@@ -100,7 +114,11 @@ class Parallelism(Detector):
                 continue
 
             if dep.is_reduction:
-                is_parallel_atomic = True
+                if colored:
+                    # Conflict-free by construction
+                    is_parallel_indep = False
+                else:
+                    is_parallel_atomic = True
                 continue
 
             return SEQUENTIAL
@@ -640,6 +640,12 @@ class Iteration(Node):
             + tuple(flatten(i.symbolic_min.free_symbols for i in self.uindices)) \
             + tuple(flatten(i.symbolic_incr.free_symbols for i in self.uindices))
 
+    @property
+    def functions(self):
+        """All Functions appearing in the Iteration header, e.g. in the bounds."""
+        return tuple(filter_ordered(i.function for i in self.expr_symbols
+                                    if isinstance(i, Indexed)))
+
     @property
     def defines(self):
         return self.dimensions
@@ -19,8 +19,8 @@ from devito.ir.iet.nodes import (Node, Iteration, Expression, ExpressionBundle,
 from devito.ir.support.space import Backward
 from devito.symbolics import (FieldFromComposite, FieldFromPointer,
                               ListInitializer, ccode, uxreplace)
-from devito.tools import (GenericVisitor, as_tuple, ctypes_to_cstr, filter_ordered,
-                          filter_sorted, flatten, is_external_ctype,
+from devito.tools import (GenericVisitor, as_tuple, count_nodes, ctypes_to_cstr,
+                          filter_ordered, filter_sorted, flatten, is_external_ctype,
                           c_restrict_void_p, sorted_priority)
 from devito.types.basic import AbstractFunction, Basic
 from devito.types import (ArrayObject, CompositeObject, Dimension, Pointer,
@@ -1416,3 +1416,8 @@ def sorted_efuncs(efuncs):
         CommCallable: 1
     }
     return sorted_priority(efuncs, priority)
+
+
+@count_nodes.register(Node)
+def _(iet):
+    return len(FindNodes(Node).visit(iet))
@@ -0,0 +1,78 @@
+"""
+Compression schemes for the halo exchange messages.
+"""
+
+import numpy as np
+
+from devito.symbolics import DefFunction
+
+__all__ = ['HaloCodec', 'BFloat16HaloCodec', 'halo_codec_registry']
+
+
+class HaloCodec:
+
+    """
+    Abstract base class for halo compression schemes. A HaloCodec transforms
+    the values as they get packed into the halo exchange buffers, and restores
+    them as they get unpacked.
+    """
+
+    dtype = None
+    """The type of the packed values."""
+
+    headers = ()
+    """The macros, as `(name, value)` pairs, used by `encode` and `decode`."""
+
+    lossy = False
+
+    def applies(self, dtype):
+        """True if the values of type `dtype` can be compressed, False otherwise."""
+        raise NotImplementedError
+
+    def encode(self, expr):
+        """The expression packing `expr`."""
+        raise NotImplementedError
+
+    def decode(self, expr):
+        """The expression unpacking `expr`."""
+        raise NotImplementedError
+
+
+class BFloat16HaloCodec(HaloCodec):
+
+    """
+    Lossy compression via rounding to bfloat16, that is the 16 most significant
+    bits of a single precision value. The message volume is halved (quartered)
+    for single (double) precision data. Unlike IEEE half precision, the range
+    of single precision is preserved, so the data needs no scaling, at the price
+    of a coarser resolution (about three significant digits).
+    """
+
+    dtype = np.uint16
+
+    headers = (
+        ('DEVITO_F2BF16(x)',
+         '((unsigned short)((((union {float f; unsigned int i;}){.f = (float)(x)}).i'
+         ' + 0x7fffU + ((((union {float f; unsigned int i;}){.f = (float)(x)}).i'
+         ' >> 16) & 1U)) >> 16))'),
+        ('DEVITO_BF162F(x)',
+         '(((union {unsigned int i; float f;}){.i = ((unsigned int)(x)) << 16}).f)')
+    )
+
+    lossy = True
+
+    def applies(self, dtype):
+        return dtype in (np.float32, np.float64)
+
+    def encode(self, expr):
+        # Round to nearest rather than truncate, to avoid a systematic bias
+        return DefFunction('DEVITO_F2BF16', expr)
+
+    def decode(self, expr):
+        return DefFunction('DEVITO_BF162F', expr)
+
+
+halo_codec_registry = {
+    'bfloat16': BFloat16HaloCodec
+}
+"""The available halo compression schemes."""
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from ctypes import c_int, c_void_p, sizeof
+from collections import defaultdict
 from itertools import groupby, product
 from functools import cached_property
 
@@ -12,8 +13,10 @@ import numpy as np
 from cgen import Struct, Value
 
 from devito.data import LEFT, CENTER, RIGHT, Decomposition
+from devito.data.allocators import SharedMemoryAllocator
+from devito.logger import perf
 from devito.parameters import configuration
-from devito.tools import EnrichedTuple, as_tuple, ctypes_to_cstr, filter_ordered
+from devito.tools import EnrichedTuple, as_tuple, ctypes_to_cstr
 from devito.types import CompositeObject, Object
 from devito.types.utils import DimensionTuple
 
@@ -64,7 +67,8 @@ except ImportError as e:
 
 
 __all__ = ['Distributor', 'SparseDistributor', 'MPI', 'CustomTopology',
-           'devito_mpi_init', 'devito_mpi_finalize']
+           'AutoTopology', 'devito_mpi_init', 'devito_mpi_finalize',
+           'auto_topology', 'weighted_split', 'weights_from_summary']
 
 
 def devito_mpi_init():
@@ -216,9 +220,22 @@ class Distributor(AbstractDistributor):
     comm : MPI communicator, optional
         The set of processes over which the domain is distributed. Defaults to
         MPI.COMM_WORLD.
+    topology : tuple of ints or CustomTopology or AutoTopology, optional
+        The number of MPI processes along each Dimension. With an AutoTopology
+        (or `'auto'`), the topology predicted to minimize the halo exchange
+        cost is selected.
+    weights : tuple or callable, optional
+        The estimated cost of the points along each Dimension, used to
+        balance the work, rather than the number of points, across the MPI
+        processes. Either a tuple with one entry per Dimension, each entry
+        being None (uniform cost) or an array_like of the same size as the
+        Dimension, or a callable `weights(dimension, indices)` returning such
+        an entry given a Dimension and its global indices. Defaults to
+        uniform costs, that is to a uniform decomposition.
     """
 
-    def __init__(self, shape, dimensions, input_comm=None, topology=None):
+    def __init__(self, shape, dimensions, input_comm=None, topology=None,
+                 weights=None):
         super().__init__(shape, dimensions)
 
         if configuration['mpi']:
@@ -240,6 +257,14 @@ class Distributor(AbstractDistributor):
                 # OpenMPI v3 does not guarantee that 9 ranks are arranged into
                 # a 3x3 grid when shape=(9, 9))
                 self._topology = compute_dims(self._input_comm.size, len(shape))
+            elif topology == 'auto' or isinstance(topology, AutoTopology):
+                if not isinstance(topology, AutoTopology):
+                    topology = AutoTopology()
+                node_comm = self._input_comm.Split_type(MPI.COMM_TYPE_SHARED)
+                nprocs_local = node_comm.size
+                node_comm.Free()
+                self._topology = topology.select(shape, self._input_comm.size,
+                                                 nprocs_local)
             else:
                 # A custom topology may contain integers or the wildcard '*'
                 self._topology = CustomTopology(topology, self._input_comm)
@@ -259,8 +284,15 @@ class Distributor(AbstractDistributor):
             self._topology = tuple(1 for _ in range(len(shape)))
 
         # The domain decomposition
-        self._decomposition = [Decomposition(np.array_split(range(i), j), c)
-                               for i, j, c in zip(shape, self.topology, self.mycoords)]
+        if callable(weights):
+            weights = [weights(d, np.arange(i)) for d, i in zip(dimensions, shape)]
+        weights = as_tuple(weights) or (None,)*len(shape)
+        if len(weights) != len(shape):
+            raise ValueError("Expected one weight profile per Dimension, got `%s`"
+                             % str(weights))
+        self._decomposition = [Decomposition(weighted_split(i, j, w), c)
+                               for i, j, w, c in zip(shape, self.topology, weights,
+                                                     self.mycoords)]
 
     @property
     def comm(self):
@@ -290,13 +322,35 @@ class Distributor(AbstractDistributor):
     @property
     def nprocs_local(self):
         if self.comm is not MPI.COMM_NULL:
-            local_comm = MPI.Comm.Split_type(self.comm, MPI.COMM_TYPE_SHARED)
-            node_size = local_comm.Get_size()
-            local_comm.Free()
-            return node_size
+            return self.comm_node.size
         else:
             return 1
 
+    @cached_property
+    def comm_node(self):
+        """
+        The MPI communicator grouping the MPI ranks that share the calling
+        rank's node, i.e. that can access each other's memory directly.
+        """
+        if self.comm is not MPI.COMM_NULL:
+            return self.comm.Split_type(MPI.COMM_TYPE_SHARED)
+        else:
+            return MPI.COMM_NULL
+
+    @cached_property
+    def node_ranks(self):
+        """
+        A mapper ``rank -> node rank`` for all MPI ranks co-located with the
+        calling rank, which is itself included. Ranks living on other nodes
+        are absent from the mapper.
+        """
+        if self.comm is MPI.COMM_NULL:
+            return {0: 0}
+        ranks = list(range(self.nprocs))
+        translated = MPI.Group.Translate_ranks(self.comm.Get_group(), ranks,
+                                               self.comm_node.Get_group())
+        return {i: j for i, j in zip(ranks, translated) if j != MPI.UNDEFINED}
+
     @property
     def topology(self):
         return self._topology
@@ -323,7 +377,10 @@ class Distributor(AbstractDistributor):
         based on the MPI rank.
         """
         ret = product(*[range(i) for i in self.topology])
-        return tuple(sorted(ret, key=lambda i: self.comm.Get_cart_rank(i)))
+        if self.comm is not MPI.COMM_NULL:
+            return tuple(sorted(ret, key=lambda i: self.comm.Get_cart_rank(i)))
+        else:
+            return tuple(ret)
 
     @cached_property
     def all_numb(self):
@@ -382,14 +439,38 @@ class Distributor(AbstractDistributor):
         if len(index.shape) == 2:
             index = np.expand_dims(index, axis=2)
 
-        ret = {}
-        for r, j in enumerate(self.all_ranges):
-            mins = np.array([b[0] for b in j]).reshape(1, -1, 1)
-            maxs = np.array([b[-1] for b in j]).reshape(1, -1, 1)
-            inds = np.where(((index <= maxs) & (index >= mins)).all(axis=1))
-            if inds[0].size == 0:
-                continue
-            ret[r] = filter_ordered(inds[0])
+        # The coordinates of the MPI rank owning each index, along each
+        # decomposed Dimension. This is a binary search through the (sorted)
+        # lower bounds of the Decomposition, so the cost doesn't grow with the
+        # number of MPI ranks
+        coords = []
+        valid = np.ones((index.shape[0], index.shape[2]), dtype=bool)
+        for d, dec in enumerate(self.decomposition):
+            mins = np.array([min(i) for i in dec])
+            maxs = np.array([max(i) for i in dec])
+            v = np.maximum(np.searchsorted(mins, index[:, d], side='right') - 1, 0)
+            valid &= (index[:, d] >= mins[0]) & (index[:, d] <= maxs[v])
+            coords.append(v)
+        owners = self._cart_ranks[tuple(coords)]
+
+        # Pair up each index with the owning MPI ranks, and group by MPI rank
+        npoint = index.shape[0]
+        points = np.broadcast_to(np.arange(npoint).reshape(-1, 1), owners.shape)
+        owners, points = np.divmod(np.unique(owners[valid]*npoint + points[valid]),
+                                   npoint)
+        ranks, starts = np.unique(owners, return_index=True)
+
+        return {int(r): i for r, i in zip(ranks, np.split(points, starts[1:]))}
+
+    @cached_property
+    def _cart_ranks(self):
+        """
+        An array, with as many entries as MPI ranks, mapping the coordinates of
+        each MPI rank to the MPI rank itself.
+        """
+        ret = np.empty(self.topology, dtype=int)
+        for r, c in enumerate(self.all_coords):
+            ret[c] = r
         return ret
 
     @property
@@ -437,6 +518,19 @@ class Distributor(AbstractDistributor):
         """An Object representing the MPI communicator."""
         return MPICommObject(self.comm)
 
+    @cached_property
+    def _obj_comm_node(self):
+        """An Object representing the node-local MPI communicator."""
+        return MPINodeCommObject(self.comm_node)
+
+    @cached_property
+    def _allocator_shared(self):
+        """
+        A SharedMemoryAllocator to allocate memory accessible by all of the
+        co-located MPI ranks.
+        """
+        return SharedMemoryAllocator(self.comm_node)
+
     @cached_property
     def _obj_neighborhood(self):
         """
@@ -570,6 +664,23 @@ class MPICommObject(Object):
             return self._arg_defaults()
 
 
+class MPINodeCommObject(MPICommObject):
+
+    """
+    An Object representing the communicator of the MPI ranks sharing a node.
+    """
+
+    name = 'comm_node'
+
+    def _arg_values(self, *args, **kwargs):
+        grid = kwargs.get('grid', None)
+        # Update `comm_node` based on object attached to `grid`
+        if grid is not None:
+            return grid.distributor._obj_comm_node._arg_defaults()
+        else:
+            return self._arg_defaults()
+
+
 class MPINeighborhood(CompositeObject):
 
     __rargs__ = ('neighborhood',)
@@ -623,6 +734,48 @@ class MPINeighborhood(CompositeObject):
             return self._arg_defaults()
 
 
+class AutoTopology:
+
+    """
+    A domain decomposition to be selected at runtime, among all of the
+    possible ones, based on the predicted halo exchange cost. See
+    `auto_topology` for the cost model.
+
+    Parameters
+    ----------
+    space_order : int, optional
+        The space order of the Functions whose halos will be exchanged,
+        which determines the halo width. Defaults to 1.
+
+    Examples
+    --------
+    >>> from devito import Grid, AutoTopology
+    >>> grid = Grid(shape=(400, 100, 100), topology=AutoTopology(space_order=16))
+
+    Outside of an MPI run the topology is, as usual, trivial
+
+    >>> grid.distributor.topology
+    (1, 1, 1)
+    """
+
+    def __init__(self, space_order=1):
+        self.space_order = space_order
+
+    def __repr__(self):
+        return "AutoTopology(space_order=%d)" % self.space_order
+
+    def select(self, shape, nprocs, nprocs_local=1):
+        """
+        The topology for `nprocs` MPI processes, `nprocs_local` of which
+        per node, over a domain of shape `shape`.
+        """
+        topology = auto_topology(shape, nprocs, self.space_order, nprocs_local)
+        perf("Selected MPI topology %s for shape %s (space_order=%d, %d ranks, "
+             "%d per node)" % (topology, tuple(shape), self.space_order, nprocs,
+                               nprocs_local))
+        return topology
+
+
 class CustomTopology(tuple):
 
     """
@@ -741,6 +894,197 @@ def compute_dims(nprocs, ndim):
     return tuple(v for _ in range(ndim))
 
 
+# Halos exchanged with ranks on the same node don't hit the network, so they
+# are assumed to be much cheaper than those exchanged with other nodes
+INTRA_NODE_COST = 0.1
+
+
+def auto_topology(shape, nprocs, space_order=1, nprocs_local=1):
+    """
+    Select the decomposition of `nprocs` MPI processes over a domain of shape
+    `shape` minimizing the predicted halo exchange cost.
+
+    The cost of a topology is the largest, across the ranks, halo volume (in
+    number of points) exchanged per halo update, which includes the corners
+    and edges shared with the diagonal neighbours. The halo width is given by
+    `space_order`. The consecutive MPI ranks are assumed to be grouped into
+    nodes of `nprocs_local` ranks, and the halos exchanged within a node are
+    weighted by `INTRA_NODE_COST`. Ties are broken in favour of the outermost
+    Dimensions.
+
+    Parameters
+    ----------
+    shape : tuple of ints
+        The shape of the domain to be decomposed.
+    nprocs : int
+        The number of MPI processes.
+    space_order : int, optional
+        The halo width. Defaults to 1.
+    nprocs_local : int, optional
+        The number of MPI processes per node. Defaults to 1.
+
+    Examples
+    --------
+    >>> from devito.mpi import auto_topology
+    >>> auto_topology((1000, 100, 100), 8)
+    (8, 1, 1)
+    >>> auto_topology((100, 100, 100), 8)
+    (2, 2, 2)
+    """
+    ndim = len(shape)
+    width = max(space_order, 1)
+    nodes = np.arange(nprocs) // max(nprocs_local, 1)
+    offsets = [i for i in product((-1, 0, 1), repeat=ndim) if any(i)]
+
+    best = None
+    for topology in _factorizations(nprocs, ndim):
+        if any(p > n for p, n in zip(topology, shape)):
+            # Some ranks would end up with no points at all
+            continue
+
+        local = [int(ceil(n / p)) for n, p in zip(shape, topology)]
+
+        # The coordinates of all ranks, in rank order
+        coords = np.array(list(product(*[range(p) for p in topology])))
+
+        cost = np.zeros(nprocs)
+        for offset in offsets:
+            ncoords = coords + offset
+            mask = np.all((ncoords >= 0) & (ncoords < topology), axis=1)
+            if not mask.any():
+                continue
+            neighbours = np.ravel_multi_index(ncoords[mask].T, topology)
+            volume = np.prod([width if o else n for o, n in zip(offset, local)])
+            weight = np.where(nodes[mask] == nodes[neighbours], INTRA_NODE_COST, 1)
+            cost[mask] += weight*volume
+
+        key = (cost.max(), tuple(-p for p in topology))
+        if best is None or key < best[0]:
+            best = (key, topology)
+
+    if best is None:
+        return compute_dims(nprocs, ndim)
+    else:
+        return best[1]
+
+
+def _factorizations(n, ndim):
+    """
+    Generate all of the ways `n` can be written as an ordered product of
+    `ndim` positive integers.
+    """
+    if ndim == 1:
+        yield (n,)
+        return
+    for i in range(1, n + 1):
+        if n % i == 0:
+            for j in _factorizations(n // i, ndim - 1):
+                yield (i,) + j
+
+
+def weighted_split(n, nparts, weights=None):
+    """
+    Split the indices `[0, n)` into `nparts` contiguous chunks of roughly
+    equal total weight.
+
+    Parameters
+    ----------
+    n : int
+        The number of indices.
+    nparts : int
+        The number of chunks.
+    weights : array_like, optional
+        The weight, that is the estimated cost, of each index. Defaults to
+        uniform weights, in which case the chunks are as in `np.array_split`.
+
+    Examples
+    --------
+    >>> [list(i) for i in weighted_split(8, 2, [3, 3, 1, 1, 1, 1, 1, 1])]
+    [[0, 1], [2, 3, 4, 5, 6, 7]]
+    """
+    if weights is None or nparts >= n:
+        return np.array_split(range(n), nparts)
+
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (n,):
+        raise ValueError("Expected %d weights, got array of shape %s"
+                         % (n, weights.shape))
+    if not np.all(np.isfinite(weights)) or np.any(weights < 0):
+        raise ValueError("Weights must be finite and non-negative")
+
+    cweights = np.cumsum(weights)
+    if cweights[-1] <= 0:
+        return np.array_split(range(n), nparts)
+
+    # Each chunk ends at the index whose cumulative weight is closest to a
+    # multiple of `total/nparts`
+    targets = cweights[-1]*np.arange(1, nparts)/nparts
+    ends = np.searchsorted(cweights, targets)
+    prev = np.maximum(ends - 1, 0)
+    ends = np.where(targets - cweights[prev] < cweights[ends] - targets, prev, ends)
+    bounds = ends + 1
+
+    # No empty chunks
+    for i in range(nparts - 1):
+        lower = bounds[i-1] + 1 if i > 0 else 1
+        bounds[i] = max(bounds[i], lower)
+    for i in reversed(range(nparts - 1)):
+        upper = bounds[i+1] - 1 if i < nparts - 2 else n - 1
+        bounds[i] = min(bounds[i], upper)
+
+    return np.split(np.arange(n), bounds)
+
+
+def weights_from_summary(summary, grid, sections=None):
+    """
+    Estimate the cost of the points of a Grid from the per-rank timings of
+    a previous Operator run, to be used as `Grid(..., weights=...)`.
+
+    The cost of a point is assumed to be separable, that is the product of a
+    cost along each Dimension. Along a given Dimension, the points owned by
+    the same slab of MPI ranks are assigned the time spent by these ranks
+    divided by the number of points they own.
+
+    Parameters
+    ----------
+    summary : PerformanceSummary
+        The performance summary of an Operator run with MPI enabled.
+    grid : Grid
+        The Grid of the Operator run.
+    sections : list of str, optional
+        The profiled sections to be accounted for. Defaults to all sections.
+    """
+    distributor = grid.distributor
+
+    times = defaultdict(float)
+    for (name, rank), v in summary.items():
+        if rank is None:
+            # Not an MPI run
+            continue
+        if sections is None or name in sections:
+            times[rank] += v.time
+    if not times:
+        return None
+
+    decompositions = distributor.decomposition
+    npoints = [np.prod([len(i[c]) for i, c in zip(decompositions, coords)])
+               for coords in distributor.all_coords]
+
+    weights = []
+    for d, (decomposition, nprocs) in enumerate(zip(decompositions,
+                                                    distributor.topology)):
+        slab_time = np.zeros(nprocs)
+        slab_npoint = np.zeros(nprocs)
+        for rank, coords in enumerate(distributor.all_coords):
+            slab_time[coords[d]] += times[rank]
+            slab_npoint[coords[d]] += npoints[rank]
+        cost = slab_time / np.maximum(slab_npoint, 1)
+        weights.append(np.concatenate([np.full(len(i), v)
+                                       for i, v in zip(decomposition, cost)]))
+
+    return tuple(weights)
+
+
 # Yes, AFAICT, nothing like this is available in mpi4py
 mpi4py_thread_levels = {
     'single': MPI.THREAD_SINGLE,
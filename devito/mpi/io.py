@@ -0,0 +1,567 @@
+"""
+Parallel I/O of distributed Function and SparseTimeFunction data.
+
+The data is stored in the NumPy `.npy` format, that is as a raw, C-ordered
+array preceded by a small header, so that the files can also be opened with
+`numpy.load`, possibly with `mmap_mode`. In an MPI run, each rank reads and
+writes its own portion of the data through collective MPI-IO calls, so the
+data is never gathered onto a single rank.
+"""
+
+from io import BytesIO
+
+import numpy as np
+from numpy.lib import format as npy
+
+from devito.data import Data
+from devito.mpi.distributed import MPI
+from devito.tools import as_tuple
+
+__all__ = ['save_data', 'load_data', 'Snapshots', 'Traces', 'stream_apply']
+
+
+def save_data(function, filename):
+    """
+    Write the domain data of a Function to an `.npy` file.
+
+    This is a collective operation, which must be called by all MPI ranks.
+
+    Parameters
+    ----------
+    function : Function
+        The Function whose data is written, with shape `function.shape_global`.
+    filename : str
+        The path of the file.
+
+    Examples
+    --------
+    >>> from devito import Grid, Function, save_data, load_data
+    >>> from devito.tools import make_tempdir
+    >>> import os
+    >>> grid = Grid(shape=(4, 4))
+    >>> f = Function(name='f', grid=grid)
+    >>> f.data[:] = 1.
+    >>> filename = os.path.join(make_tempdir('io'), 'f.npy')
+    >>> save_data(f, filename)
+    >>> g = Function(name='g', grid=grid)
+    >>> load_data(g, filename)
+    >>> float(g.data.sum())
+    16.0
+    """
+    local = np.asarray(function.data_ro_domain)
+
+    if not _is_parallel(function):
+        # Through a file object, so that no `.npy` extension is appended
+        with open(filename, 'wb') as fp:
+            np.save(fp, local)
+        return
+
+    shape = function.shape_global
+    header = _make_header(shape, function.dtype)
+
+    fh = _open(function, filename, write=True)
+    if function._distributor.myrank == 0:
+        fh.Write_at(0, header)
+    _write(fh, len(header), local, shape, _local_starts(function))
+    fh.Close()
+
+
+def load_data(function, filename):
+    """
+    Read the domain data of a Function from an `.npy` file, as written by
+    `save_data` or `numpy.save`.
+
+    This is a collective operation, which must be called by all MPI ranks.
+
+    Parameters
+    ----------
+    function : Function
+        The Function whose data is read. The file must store an array of shape
+        `function.shape_global` and of type `function.dtype`.
+    filename : str
+        The path of the file.
+    """
+    shape, dtype, offset = _read_header(filename)
+    _check(function, shape, dtype, filename)
+
+    if not _is_parallel(function):
+        function.data[:] = np.load(filename, mmap_mode='r')
+        return
+
+    local = np.empty(function.data_ro_domain.shape, dtype=function.dtype)
+    fh = _open(function, filename)
+    _read(fh, offset, local, shape, _local_starts(function))
+    fh.Close()
+
+    function.data._local[:] = local
+
+
+class Snapshots:
+
+    """
+    An `.npy` file storing a sequence of snapshots of a Function, that is an
+    array of shape `(nt,) + shape`, where `shape` is the global shape of the
+    Function's space Dimensions. The snapshots are written and read one at a
+    time, so that, for example, a wavefield may be exported as the time
+    stepping progresses, or a sequence of models may be streamed in, without
+    ever holding all of them in memory.
+
+    All methods are collective operations, which must be called by all MPI
+    ranks.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the file.
+    function : Function
+        The Function providing the shape, the type and the domain
+        decomposition of the snapshots. For a TimeFunction, the snapshots
+        span the space Dimensions only.
+    nt : int, optional
+        The number of snapshots. Required when creating a new file.
+    mode : str, optional
+        `'w'` to create a new file, `'r'` to read an existing one.
+        Defaults to `'r'`.
+
+    Examples
+    --------
+    Export one snapshot every few time steps of a TimeFunction `u`
+
+    >>> from devito import Grid, TimeFunction, Eq, Operator, Snapshots
+    >>> from devito.tools import make_tempdir
+    >>> import os
+    >>> grid = Grid(shape=(4, 4))
+    >>> u = TimeFunction(name='u', grid=grid)
+    >>> op = Operator(Eq(u.forward, u + 1))
+    >>> filename = os.path.join(make_tempdir('io'), 'u.npy')
+    >>> with Snapshots(filename, u, nt=3, mode='w') as snaps:
+    ...     for i in range(3):
+    ...         summary = op.apply(time_M=1)
+    ...         snaps.write(i, u.data[0])
+
+    Stream them back in, one at a time
+
+    >>> with Snapshots(filename, u) as snaps:
+    ...     for i, v in enumerate(snaps):
+    ...         assert (v == 2*(i + 1)).all()
+    """
+
+    def __init__(self, filename, function, nt=None, mode='r'):
+        if mode not in ('r', 'w'):
+            raise ValueError("Expected mode `'r'` or `'w'`, got `%s`" % mode)
+
+        self.filename = filename
+        self.function = function
+        self.mode = mode
+
+        # The positions of the space Dimensions within `function.dimensions`
+        self._space = [i for i, d in enumerate(function.dimensions)
+                       if not d.is_Time]
+        slice_shape = tuple(function.shape_global[i] for i in self._space)
+
+        if mode == 'w':
+            if nt is None:
+                raise ValueError("`nt` is required to create `%s`" % filename)
+            shape = (nt,) + slice_shape
+            if _is_parallel(function):
+                header = _make_header(shape, function.dtype)
+                self._fh = _open(function, filename, write=True)
+                if function._distributor.myrank == 0:
+                    self._fh.Write_at(0, header)
+                self._offset = len(header)
+            else:
+                self._fh = npy.open_memmap(filename, mode='w+', dtype=function.dtype,
+                                           shape=shape)
+        else:
+            shape, dtype, self._offset = _read_header(filename)
+            if shape[1:] != slice_shape or np.dtype(dtype) != function.dtype:
+                raise ValueError("`%s` stores snapshots of shape %s and type %s, "
+                                 "expected %s and %s" % (filename, shape[1:], dtype,
+                                                         slice_shape, function.dtype))
+            if _is_parallel(function):
+                self._fh = _open(function, filename)
+            else:
+                self._fh = np.load(filename, mmap_mode='r')
+
+        self.nt = shape[0]
+        self._slice_shape = slice_shape
+
+    def __len__(self):
+        return self.nt
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        for i in range(self.nt):
+            yield self.read(i)
+
+    @property
+    def _local_shape(self):
+        return tuple(self.function.data_ro_domain.shape[i] for i in self._space)
+
+    @property
+    def _nbytes(self):
+        return int(np.prod(self._slice_shape))*np.dtype(self.function.dtype).itemsize
+
+    def write(self, index, data):
+        """
+        Write the calling rank's portion of the `index`-th snapshot.
+
+        Parameters
+        ----------
+        index : int
+            The snapshot index.
+        data : array_like
+            The calling rank's portion of the snapshot, e.g. `u.data[0]` for
+            a TimeFunction `u`.
+        """
+        if self.mode != 'w':
+            raise ValueError("`%s` was not opened for writing" % self.filename)
+
+        data = np.asarray(data)
+        if data.shape != self._local_shape:
+            raise ValueError("Expected data of shape %s, got %s"
+                             % (self._local_shape, data.shape))
+
+        if isinstance(self._fh, np.memmap):
+            self._fh[index] = data
+        else:
+            starts = [_local_starts(self.function)[i] for i in self._space]
+            _write(self._fh, self._offset + index*self._nbytes, data,
+                   self._slice_shape, starts)
+
+    def read(self, index, out=None):
+        """
+        Read the calling rank's portion of the `index`-th snapshot.
+
+        Parameters
+        ----------
+        index : int
+            The snapshot index.
+        out : array_like, optional
+            The array the data is read into, e.g. `u.data[0]` for a TimeFunction
+            `u`. Defaults to a new numpy.ndarray.
+        """
+        if isinstance(self._fh, np.memmap):
+            ret = np.array(self._fh[index])
+        else:
+            ret = np.empty(self._local_shape, dtype=self.function.dtype)
+            starts = [_local_starts(self.function)[i] for i in self._space]
+            _read(self._fh, self._offset + index*self._nbytes, ret,
+                  self._slice_shape, starts)
+
+        if out is None:
+            return ret
+        elif isinstance(out, Data):
+            out._local[:] = ret
+        else:
+            out[:] = ret
+        return out
+
+    def close(self):
+        """Close the file."""
+        if isinstance(self._fh, np.memmap):
+            self._fh.flush()
+        elif self._fh is not None:
+            self._fh.Close()
+        self._fh = None
+
+
+class Traces:
+
+    """
+    An `.npy` file storing the data of a SparseTimeFunction over `nt` time
+    steps, that is an array of shape `(nt, npoint)`, where `npoint` is the
+    global number of sparse points. With `layout='trace'`, the array has shape
+    `(npoint, nt)` instead, so that the data of each sparse point, or trace,
+    is contiguous, as in a SEG-Y file.
+
+    The SparseTimeFunction acts as a ring buffer holding the data of its own
+    `nt` time steps only. Hence, it must be indexed by the stepping Dimension,
+    e.g. `SparseTimeFunction(..., nt=64, time_dim=grid.stepping_dim)`, so that
+    time step `time` is stored at `time % nt`. The data is transferred between
+    the ring buffer and the file one chunk of time steps at a time, typically by
+    `stream_apply`, so that, for example, receivers with long recording times
+    never hold more than a chunk of traces in memory.
+
+    All methods are collective operations, which must be called by all MPI
+    ranks.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the file.
+    function : SparseTimeFunction
+        The ring buffer.
+    nt : int, optional
+        The number of time steps. Required when creating a new file.
+    mode : str, optional
+        `'w'` to create a new file, e.g. to record receiver data, `'r'` to read
+        an existing one, e.g. to inject source data. Defaults to `'r'`.
+    layout : str, optional
+        `'time'` or `'trace'`. Defaults to `'time'`.
+
+    Examples
+    --------
+    Record 50 time steps through a ring buffer of 8 time steps
+
+    >>> from devito import (Grid, TimeFunction, SparseTimeFunction, Eq, Operator,
+    ...                     Traces, stream_apply)
+    >>> from devito.tools import make_tempdir
+    >>> import numpy as np, os
+    >>> grid = Grid(shape=(4, 4))
+    >>> u = TimeFunction(name='u', grid=grid)
+    >>> rec = SparseTimeFunction(name='rec', grid=grid, npoint=2, nt=8,
+    ...                          time_dim=grid.stepping_dim,
+    ...                          coordinates=[(.5, .5), (.2, .8)])
+    >>> op = Operator([Eq(u.forward, u + 1), rec.interpolate(expr=u)])
+    >>> filename = os.path.join(make_tempdir('io'), 'rec.npy')
+    >>> with Traces(filename, rec, nt=50, mode='w') as traces:
+    ...     summaries = stream_apply(op, traces, time_M=49)
+    >>> np.load(filename)[:, 0].tolist() == list(range(50))
+    True
+    """
+
+    def __init__(self, filename, function, nt=None, mode='r', layout='time'):
+        if mode not in ('r', 'w'):
+            raise ValueError("Expected mode `'r'` or `'w'`, got `%s`" % mode)
+        if layout not in ('time', 'trace'):
+            raise ValueError("Expected layout `'time'` or `'trace'`, got `%s`"
+                             % layout)
+        if not function.time_dim.is_Stepping:
+            raise ValueError("`%s` must be indexed by a SteppingDimension to "
+                             "act as a ring buffer" % function.name)
+
+        self.filename = filename
+        self.function = function
+        self.mode = mode
+        self.layout = layout
+
+        npoint = function.npoint_global
+        if mode == 'w':
+            if nt is None:
+                raise ValueError("`nt` is required to create `%s`" % filename)
+            shape = self._file_shape(nt, npoint)
+            if _is_parallel(function):
+                header = _make_header(shape, function.dtype)
+                self._fh = _open(function, filename, write=True)
+                if function._distributor.myrank == 0:
+                    self._fh.Write_at(0, header)
+                self._offset = len(header)
+            else:
+                self._fh = npy.open_memmap(filename, mode='w+', dtype=function.dtype,
+                                           shape=shape)
+        else:
+            shape, dtype, self._offset = _read_header(filename)
+            nt = shape[0] if layout == 'time' else shape[-1]
+            if tuple(shape) != self._file_shape(nt, npoint) or \
+               np.dtype(dtype) != function.dtype:
+                raise ValueError("`%s` stores an array of shape %s and type %s, "
+                                 "expected %s and %s" %
+                                 (filename, shape, dtype,
+                                  self._file_shape(nt, npoint), function.dtype))
+            if _is_parallel(function):
+                self._fh = _open(function, filename)
+            else:
+                self._fh = np.load(filename, mmap_mode='r')
+
+        self.nt = nt
+        self._shape = shape
+
+    def __len__(self):
+        return self.nt
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _file_shape(self, nt, npoint):
+        return (nt, npoint) if self.layout == 'time' else (npoint, nt)
+
+    def _rows(self, start, stop):
+        if not 0 <= start <= stop <= self.nt:
+            raise ValueError("Illegal time steps [%d, %d) for `%s`, which stores "
+                             "%d time steps" % (start, stop, self.filename, self.nt))
+        if stop - start > self.function.nt:
+            raise ValueError("Can't transfer %d time steps through the ring buffer "
+                             "`%s` of %d time steps" % (stop - start, self.function.name,
+                                                        self.function.nt))
+        return np.arange(start, stop) % self.function.nt
+
+    def write(self, start, stop):
+        """
+        Write the calling rank's portion of the time steps `[start, stop)`, as
+        held by the ring buffer.
+        """
+        if self.mode != 'w':
+            raise ValueError("`%s` was not opened for writing" % self.filename)
+
+        data = self.function.data_ro_domain._local.view(np.ndarray)
+        data = data[self._rows(start, stop)]
+        if self.layout == 'trace':
+            data = data.T
+
+        if isinstance(self._fh, np.memmap):
+            if self.layout == 'time':
+                self._fh[start:stop] = data
+            else:
+                self._fh[:, start:stop] = data
+        else:
+            _write(self._fh, self._offset, data, self._shape, self._starts(start))
+
+    def read(self, start, stop):
+        """
+        Read the calling rank's portion of the time steps `[start, stop)` into
+        the ring buffer.
+        """
+        rows = self._rows(start, stop)
+
+        if isinstance(self._fh, np.memmap):
+            if self.layout == 'time':
+                data = self._fh[start:stop]
+            else:
+                data = self._fh[:, start:stop]
+        else:
+            shape = self._file_shape(stop - start, self.function.data._local.shape[1])
+            data = np.empty(shape, dtype=self.function.dtype)
+            _read(self._fh, self._offset, data, self._shape, self._starts(start))
+
+        if self.layout == 'trace':
+            data = data.T
+        self.function.data._local[rows] = data
+
+    def _starts(self, start):
+        pstart = _local_starts(self.function)[self.function._sparse_position]
+        return (start, pstart) if self.layout == 'time' else (pstart, start)
+
+    def close(self):
+        """Close the file."""
+        if isinstance(self._fh, np.memmap):
+            self._fh.flush()
+        elif self._fh is not None:
+            self._fh.Close()
+        self._fh = None
+
+
+def stream_apply(op, traces, time_M, time_m=0, **kwargs):
+    """
+    Run an Operator over the time steps `[time_m, time_M]`, one chunk of time
+    steps at a time, streaming the data of one or more SparseTimeFunctions
+    between their ring buffers and their files. Before each chunk, the ring
+    buffers opened for reading are filled; after each chunk, those opened for
+    writing are flushed. The chunk size is that of the smallest ring buffer.
+
+    Parameters
+    ----------
+    op : Operator
+        The Operator to run.
+    traces : Traces or list of Traces
+        The streamed SparseTimeFunctions.
+    time_M : int
+        The last time step.
+    time_m : int, optional
+        The first time step. Defaults to 0.
+    **kwargs
+        Further runtime arguments for the Operator.
+
+    Returns
+    -------
+    list of PerformanceSummary
+        The performance summary of each chunk.
+    """
+    traces = as_tuple(traces)
+    chunk = min(i.function.nt for i in traces)
+
+    summaries = []
+    for start in range(time_m, time_M + 1, chunk):
+        stop = min(start + chunk, time_M + 1)
+
+        for i in traces:
+            if i.mode == 'r':
+                i.read(start, stop)
+
+        summaries.append(op.apply(time_m=start, time_M=stop - 1, **kwargs))
+
+        for i in traces:
+            if i.mode == 'w':
+                i.write(start, stop)
+
+    return summaries
+
+
+# Utilities
+
+def _is_parallel(function):
+    distributor = function._distributor
+    return distributor is not None and distributor.is_parallel
+
+
+def _local_starts(function):
+    return [i.start for i in function.local_indices]
+
+
+def _check(function, shape, dtype, filename):
+    if tuple(shape) != function.shape_global or np.dtype(dtype) != function.dtype:
+        raise ValueError("`%s` stores an array of shape %s and type %s, expected %s "
+                         "and %s" % (filename, shape, dtype, function.shape_global,
+                                     function.dtype))
+
+
+def _make_header(shape, dtype):
+    buf = BytesIO()
+    npy.write_array_header_1_0(buf, {'descr': npy.dtype_to_descr(np.dtype(dtype)),
+                                     'fortran_order': False,
+                                     'shape': tuple(shape)})
+    return buf.getvalue()
+
+
+def _read_header(filename):
+    with open(filename, 'rb') as fp:
+        version = npy.read_magic(fp)
+        if version == (1, 0):
+            shape, fortran_order, dtype = npy.read_array_header_1_0(fp)
+        else:
+            shape, fortran_order, dtype = npy.read_array_header_2_0(fp)
+        if fortran_order:
+            raise ValueError("`%s` stores an array in Fortran order, which "
+                             "isn't supported" % filename)
+        return shape, dtype, fp.tell()
+
+
+def _open(function, filename, write=False):
+    comm = function._distributor.comm
+    if write:
+        fh = MPI.File.Open(comm, filename, MPI.MODE_WRONLY | MPI.MODE_CREATE)
+        fh.Set_size(0)
+    else:
+        fh = MPI.File.Open(comm, filename, MPI.MODE_RDONLY)
+    return fh
+
+
+def _filetype(dtype, shape, local_shape, starts):
+    etype = MPI._typedict[np.dtype(dtype).char]
+    filetype = etype.Create_subarray(list(shape), list(local_shape), list(starts),
+                                     order=MPI.ORDER_C)
+    filetype.Commit()
+    return etype, filetype
+
+
+def _write(fh, offset, data, shape, starts):
+    data = np.ascontiguousarray(data)
+    etype, filetype = _filetype(data.dtype, shape, data.shape, starts)
+    fh.Set_view(offset, etype, filetype)
+    fh.Write_all(data)
+    filetype.Free()
+
+
+def _read(fh, offset, out, shape, starts):
+    etype, filetype = _filetype(out.dtype, shape, out.shape, starts)
+    fh.Set_view(offset, etype, filetype)
+    fh.Read_all(out)
+    filetype.Free()
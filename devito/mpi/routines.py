@@ -14,10 +14,12 @@ from devito.ir.iet import (Call, Callable, Conditional, ElementalFunction,
                            Iteration, List, Prodder, Return, make_efunc, FindNodes,
                            Transformer, ElementalCall, CommCallable)
 from devito.mpi import MPI
-from devito.symbolics import (Byref, CondNe, FieldFromPointer, FieldFromComposite,
-                              IndexedPointer, Macro, cast_mapper, subs_op_args)
-from devito.tools import (as_mapper, dtype_to_mpitype, dtype_len, dtype_to_ctype,
-                          flatten, generator, is_integer, split)
+from devito.mpi.codecs import halo_codec_registry
+from devito.symbolics import (Byref, CondEq, CondNe, FieldFromPointer,
+                              FieldFromComposite, IndexedPointer, Macro, cast_mapper,
+                              subs_op_args)
+from devito.tools import (as_mapper, as_tuple, dtype_to_mpitype, dtype_len,
+                          dtype_to_ctype, flatten, generator, is_integer, split)
 from devito.types import (Array, Bag, Dimension, Eq, Symbol, LocalObject,
                           CompositeObject, CustomDimension)
 
@@ -47,6 +49,10 @@ class HaloExchangeBuilder:
         obj._msgs = OrderedDict()
         obj._efuncs = []
 
+        # The halo compression scheme, if any
+        codec = (kwargs.get('options') or {}).get('mpi-codec')
+        obj._codec = halo_codec_registry[codec]() if codec else None
+
         return obj
 
     @property
@@ -61,6 +67,26 @@ class HaloExchangeBuilder:
     def regions(self):
         return [i for i in self._regions.values() if i is not None]
 
+    @property
+    def headers(self):
+        """The macros required by the generated halo exchanges."""
+        if any(self._codec_for(f) for f, _ in self._msgs):
+            return list(self._codec.headers)
+        else:
+            return []
+
+    def _codec_for(self, f):
+        """The HaloCodec compressing the halo exchanges of `f`, if any."""
+        if self._codec is not None and self._codec.applies(f.c0.dtype):
+            return self._codec
+        else:
+            return None
+
+    def _buf_dtype(self, f):
+        """The type of the halo exchange buffers of `f`."""
+        codec = self._codec_for(f)
+        return codec.dtype if codec else f.c0.dtype
+
     def make(self, hs):
         """
         Construct Callables and Calls implementing distributed-memory halo
@@ -350,18 +376,26 @@ class BasicHaloExchangeBuilder(HaloExchangeBuilder):
         eqns.extend([Eq(d.symbolic_max, d.symbolic_size - 1) for d in bdims])
 
         vd = CustomDimension(name='vd', symbolic_size=f.ncomp)
-        buf = Array(name='buf', dimensions=[vd] + bdims, dtype=f.c0.dtype,
+        buf = Array(name='buf', dimensions=[vd] + bdims, dtype=self._buf_dtype(f),
                     padding=0)
 
         mapper = dict(zip(dims, bdims))
         findices = [o - h + mapper.get(d.root, 0)
                     for d, o, h in zip(f.dimensions, ofs, f._size_nodomain.left)]
 
+        # Compress, if requested, the values upon packing
+        codec = self._codec_for(f)
         if swap is False:
-            swap = lambda i, j: (i, j)
+            if codec:
+                swap = lambda i, j: (i, codec.encode(j))
+            else:
+                swap = lambda i, j: (i, j)
             name = 'gather%s' % key
         else:
-            swap = lambda i, j: (j, i)
+            if codec:
+                swap = lambda i, j: (j, codec.decode(i))
+            else:
+                swap = lambda i, j: (j, i)
             name = 'scatter%s' % key
         if isinstance(f, Bag):
             for i, c in enumerate(f.components):
@@ -383,9 +417,9 @@ class BasicHaloExchangeBuilder(HaloExchangeBuilder):
         dims = [d.root for d in f.dimensions if d not in hse.loc_indices]
         bdims = [CustomDimension(name='vd', symbolic_size=f.ncomp)] + dims
 
-        bufg = Array(name='bufg', dimensions=bdims, dtype=f.c0.dtype,
+        bufg = Array(name='bufg', dimensions=bdims, dtype=self._buf_dtype(f),
                      padding=0, liveness='eager')
-        bufs = Array(name='bufs', dimensions=bdims, dtype=f.c0.dtype,
+        bufs = Array(name='bufs', dimensions=bdims, dtype=self._buf_dtype(f),
                      padding=0, liveness='eager')
 
         ofsg = [Symbol(name='og%s' % d.root) for d in f.dimensions]
@@ -410,9 +444,9 @@ class BasicHaloExchangeBuilder(HaloExchangeBuilder):
         count = reduce(mul, bufs.shape, 1)
         rrecv = MPIRequestObject(name='rrecv', liveness='eager')
         rsend = MPIRequestObject(name='rsend', liveness='eager')
-        recv = IrecvCall([bufs, count, Macro(dtype_to_mpitype(f.dtype)),
+        recv = IrecvCall([bufs, count, Macro(dtype_to_mpitype(self._buf_dtype(f))),
                          fromrank, Integer(13), comm, Byref(rrecv)])
-        send = IsendCall([bufg, count, Macro(dtype_to_mpitype(f.dtype)),
+        send = IsendCall([bufg, count, Macro(dtype_to_mpitype(self._buf_dtype(f))),
                          torank, Integer(13), comm, Byref(rsend)])
 
         waitrecv = Call('MPI_Wait', [Byref(rrecv), Macro('MPI_STATUS_IGNORE')])
@@ -602,10 +636,10 @@ class OverlapHaloExchangeBuilder(DiagHaloExchangeBuilder):
     def _make_msg(self, f, hse, key):
         # Only retain the halos required by the Diag scheme
         halos = sorted(i for i in hse.halos if isinstance(i.dim, tuple))
-        return MPIMsg('msg%d' % key, f, halos)
+        return MPIMsg('msg%d' % key, f, halos, codec=self._codec_for(f))
 
     def _make_sendrecv(self, f, hse, key, msg=None):
-        cast = cast_mapper[(f.c0.dtype, '*')]
+        cast = cast_mapper[(self._buf_dtype(f), '*')]
         comm = f.grid.distributor._obj_comm
 
         bufg = FieldFromPointer(msg._C_field_bufg, msg)
@@ -627,9 +661,9 @@ class OverlapHaloExchangeBuilder(DiagHaloExchangeBuilder):
         count = reduce(mul, sizes, 1)*dtype_len(f.dtype)
         rrecv = Byref(FieldFromPointer(msg._C_field_rrecv, msg))
         rsend = Byref(FieldFromPointer(msg._C_field_rsend, msg))
-        recv = IrecvCall([bufs, count, Macro(dtype_to_mpitype(f.dtype)),
+        recv = IrecvCall([bufs, count, Macro(dtype_to_mpitype(self._buf_dtype(f))),
                          fromrank, Integer(13), comm, rrecv])
-        send = IsendCall([bufg, count, Macro(dtype_to_mpitype(f.dtype)),
+        send = IsendCall([bufg, count, Macro(dtype_to_mpitype(self._buf_dtype(f))),
                          torank, Integer(13), comm, rsend])
 
         iet = List(body=[recv, gather, send])
@@ -671,7 +705,7 @@ class OverlapHaloExchangeBuilder(DiagHaloExchangeBuilder):
             return compute.make_call(dynamic_args_mapper=hs.omapper.core)
 
     def _make_wait(self, f, hse, key, msg=None):
-        cast = cast_mapper[(f.c0.dtype, '*')]
+        cast = cast_mapper[(self._buf_dtype(f), '*')]
 
         bufs = FieldFromPointer(msg._C_field_bufs, msg)
 
@@ -763,7 +797,7 @@ class Overlap2HaloExchangeBuilder(OverlapHaloExchangeBuilder):
     def _make_msg(self, f, hse, key):
         # Only retain the halos required by the Diag scheme
         halos = sorted(i for i in hse.halos if isinstance(i.dim, tuple))
-        return MPIMsgEnriched('msg%d' % key, f, halos)
+        return MPIMsgEnriched('msg%d' % key, f, halos, codec=self._codec_for(f))
 
     def _make_sendrecv(self, *args, **kwargs):
         return
@@ -772,7 +806,7 @@ class Overlap2HaloExchangeBuilder(OverlapHaloExchangeBuilder):
         return
 
     def _make_haloupdate(self, f, hse, key, *args, msg=None):
-        cast = cast_mapper[(f.c0.dtype, '*')]
+        cast = cast_mapper[(self._buf_dtype(f), '*')]
         comm = f.grid.distributor._obj_comm
 
         fixed = {d: Symbol(name="o%s" % d.root) for d in hse.loc_indices}
@@ -802,9 +836,9 @@ class Overlap2HaloExchangeBuilder(OverlapHaloExchangeBuilder):
         count = reduce(mul, sizes, 1)*dtype_len(f.dtype)
         rrecv = Byref(FieldFromComposite(msg._C_field_rrecv, msgi))
         rsend = Byref(FieldFromComposite(msg._C_field_rsend, msgi))
-        recv = IrecvCall([bufs, count, Macro(dtype_to_mpitype(f.dtype)),
+        recv = IrecvCall([bufs, count, Macro(dtype_to_mpitype(self._buf_dtype(f))),
                           fromrank, Integer(13), comm, rrecv])
-        send = IsendCall([bufg, count, Macro(dtype_to_mpitype(f.dtype)),
+        send = IsendCall([bufg, count, Macro(dtype_to_mpitype(self._buf_dtype(f))),
                          torank, Integer(13), comm, rsend])
 
         # The -1 below is because an Iteration, by default, generates <=
@@ -819,7 +853,7 @@ class Overlap2HaloExchangeBuilder(OverlapHaloExchangeBuilder):
         return HaloUpdateCall(name, args)
 
     def _make_halowait(self, f, hse, key, *args, msg=None):
-        cast = cast_mapper[(f.c0.dtype, '*')]
+        cast = cast_mapper[(self._buf_dtype(f), '*')]
 
         fixed = {d: Symbol(name="o%s" % d.root) for d in hse.loc_indices}
 
@@ -1001,6 +1035,102 @@ class FullHaloExchangeBuilder(Overlap2HaloExchangeBuilder):
         return Prodder(poke.name, poke.parameters, single_thread=True, periodic=True)
 
 
+class PersistentHaloExchangeBuilder(Overlap2HaloExchangeBuilder):
+
+    """
+    An Overlap2HaloExchangeBuilder using persistent MPI requests. The requests
+    are initialized once per Operator run, before jumping to C-land, so that
+    a halo exchange only has to start them and wait for their completion,
+    rather than re-posting sends and receives at every time step.
+
+    Generates:
+
+        haloupdate()
+        compute_core()
+        halowait()
+        remainder()
+    """
+
+    def _make_msg(self, f, hse, key):
+        # Only retain the halos required by the Diag scheme
+        halos = sorted(i for i in hse.halos if isinstance(i.dim, tuple))
+        return MPIMsgPersistent('msg%d' % key, f, halos, codec=self._codec_for(f))
+
+    def _make_haloupdate(self, f, hse, key, *args, msg=None):
+        iet = super()._make_haloupdate(f, hse, key, *args, msg=msg)
+
+        # Start the persistent requests rather than posting new ones
+        mapper = {i: Call('MPI_Start', [i.arguments[-1]])
+                  for i in FindNodes((IrecvCall, IsendCall)).visit(iet)}
+
+        return Transformer(mapper).visit(iet)
+
+
+class SharedHaloExchangeBuilder(Overlap2HaloExchangeBuilder):
+
+    """
+    An Overlap2HaloExchangeBuilder exploiting MPI-3 shared memory. The peers
+    living on the same node read the halo values straight from each other's
+    gather buffers, which are allocated in shared-memory windows, so that
+    point-to-point messages are only exchanged with the peers on other nodes.
+    The node-local ranks synchronize through a barrier before gathering, so
+    that no gather buffer is overwritten while still being read, and a barrier
+    before scattering, so that no gather buffer is read before being filled.
+
+    Generates:
+
+        haloupdate()
+        compute_core()
+        halowait()
+        remainder()
+    """
+
+    def _make_msg(self, f, hse, key):
+        # Only retain the halos required by the Diag scheme
+        halos = sorted(i for i in hse.halos if isinstance(i.dim, tuple))
+        return MPIMsgShared('msg%d' % key, f, halos, codec=self._codec_for(f))
+
+    def _make_shared(self, f, iet, msg):
+        comm_node = f.grid.distributor._obj_comm_node
+
+        # No messages to and from the co-located peers
+        msgi = IndexedPointer(msg, Dimension(name='i'))
+        rrecv = Byref(FieldFromComposite(msg._C_field_rrecv, msgi))
+        rsend = Byref(FieldFromComposite(msg._C_field_rsend, msgi))
+        shmfrom = FieldFromComposite(msg._C_field_shmfrom, msgi)
+        shmto = FieldFromComposite(msg._C_field_shmto, msgi)
+        mapper = {}
+        for i in FindNodes(Call).visit(iet):
+            if rrecv in i.arguments:
+                mapper[i] = Conditional(CondEq(shmfrom, 0), i)
+            elif rsend in i.arguments:
+                mapper[i] = Conditional(CondEq(shmto, 0), i)
+        body = Transformer(mapper).visit(iet.body.body)
+
+        barrier = Call('MPI_Barrier', [comm_node])
+        parameters = iet.parameters + (comm_node,)
+
+        return iet._rebuild(body=(barrier,) + as_tuple(body), parameters=parameters)
+
+    def _make_haloupdate(self, f, hse, key, *args, msg=None):
+        iet = super()._make_haloupdate(f, hse, key, *args, msg=msg)
+        return self._make_shared(f, iet, msg)
+
+    def _call_haloupdate(self, name, f, hse, msg):
+        call = super()._call_haloupdate(name, f, hse, msg)
+        comm_node = f.grid.distributor._obj_comm_node
+        return call._rebuild(arguments=call.arguments + (comm_node,))
+
+    def _make_halowait(self, f, hse, key, *args, msg=None):
+        iet = super()._make_halowait(f, hse, key, *args, msg=msg)
+        return self._make_shared(f, iet, msg)
+
+    def _call_halowait(self, name, f, hse, msg):
+        call = super()._call_halowait(name, f, hse, msg)
+        comm_node = f.grid.distributor._obj_comm_node
+        return call._rebuild(arguments=call.arguments + (comm_node,))
+
+
 mpi_registry = {
     'basic': BasicHaloExchangeBuilder,
     'diag': DiagHaloExchangeBuilder,
@@ -1008,7 +1138,9 @@ mpi_registry = {
     'overlap': OverlapHaloExchangeBuilder,
     'overlap2': Overlap2HaloExchangeBuilder,
     'full': FullHaloExchangeBuilder,
-    'dual': DualHaloExchangeBuilder
+    'dual': DualHaloExchangeBuilder,
+    'persistent': PersistentHaloExchangeBuilder,
+    'shared': SharedHaloExchangeBuilder
 }
 
 
@@ -1134,10 +1266,12 @@ class MPIMsg(CompositeObject):
     ]
 
     __rargs__ = ('name', 'target', 'halos')
+    __rkwargs__ = ('codec',)
 
-    def __init__(self, name, target, halos):
+    def __init__(self, name, target, halos, codec=None):
         self._target = target
         self._halos = halos
+        self._codec = codec
 
         super().__init__(name, 'msg', self.fields)
 
@@ -1168,10 +1302,21 @@ class MPIMsg(CompositeObject):
     def halos(self):
         return self._halos
 
+    @property
+    def codec(self):
+        return self._codec
+
     @property
     def npeers(self):
         return len(self._halos)
 
+    def _buf_ctype(self, f):
+        """The C type of the buffer elements."""
+        if self.codec is not None:
+            return dtype_to_ctype(self.codec.dtype)
+        else:
+            return dtype_to_ctype(f.dtype)
+
     def _as_number(self, v, args):
         """
         Turn a sympy.Symbol into a number. In doing so, perform a number of
@@ -1205,16 +1350,21 @@ class MPIMsg(CompositeObject):
 
             # Allocate the send/recv buffers
             size = reduce(mul, shape)*dtype_len(self.target.dtype)
-            ctype = dtype_to_ctype(f.dtype)
-            entry.bufg, bufg_memfree_args = allocator._alloc_C_libcall(size, ctype)
-            entry.bufs, bufs_memfree_args = allocator._alloc_C_libcall(size, ctype)
-
-            # The `memfree_args` will be used to deallocate the buffer upon
-            # returning from C-land
-            self._memfree_args.extend([bufg_memfree_args, bufs_memfree_args])
+            ctype = self._buf_ctype(f)
+            self._alloc_buffers(i, f, allocator, size, ctype)
 
         return {self.name: self.value}
 
+    def _alloc_buffers(self, i, f, allocator, size, ctype):
+        entry = self.value[i]
+
+        entry.bufg, bufg_memfree_args = allocator._alloc_C_libcall(size, ctype)
+        entry.bufs, bufs_memfree_args = allocator._alloc_C_libcall(size, ctype)
+
+        # The `memfree_args` will be used to deallocate the buffer upon
+        # returning from C-land
+        self._memfree_args.extend([bufg_memfree_args, bufs_memfree_args])
+
     def _arg_values(self, args=None, **kwargs):
         # Any will do
         for f in self.target.handles:
@@ -1285,6 +1435,123 @@ class MPIMsgEnriched(MPIMsg):
         return {self.name: self.value}
 
 
+class MPIMsgPersistent(MPIMsgEnriched):
+
+    """
+    An MPIMsgEnriched carrying persistent MPI requests, which are created
+    along with the buffers before jumping to C-land, and freed upon returning
+    to Python-land.
+    """
+
+    def __init__(self, name, target, halos, codec=None):
+        super().__init__(name, target, halos, codec=codec)
+
+        self._requests = []
+
+    def _C_memfree(self):
+        # The persistent requests must be freed before the buffers they use
+        for i in self._requests:
+            i.Free()
+        self._requests[:] = []
+
+        super()._C_memfree()
+
+    def _arg_defaults(self, allocator, alias=None, args=None):
+        super()._arg_defaults(allocator, alias, args=args)
+
+        f = alias or self.target.c0
+        comm = f.grid.distributor.comm
+        itemsize = sizeof(self._buf_ctype(f))
+
+        for i, halo in enumerate(self.halos):
+            entry = self.value[i]
+
+            count = reduce(mul, entry.sizes[:len(halo.dim)])
+            nbytes = count*dtype_len(self.target.dtype)*itemsize
+            bufs = [as_mpi_buffer(entry.bufs, nbytes), MPI.BYTE]
+            bufg = [as_mpi_buffer(entry.bufg, nbytes), MPI.BYTE]
+
+            rrecv = comm.Recv_init(bufs, source=entry.fromrank, tag=13)
+            rsend = comm.Send_init(bufg, dest=entry.torank, tag=13)
+            self._requests.extend([rrecv, rsend])
+
+            entry.rrecv = MPI._handleof(rrecv)
+            entry.rsend = MPI._handleof(rsend)
+
+        return {self.name: self.value}
+
+
+class MPIMsgShared(MPIMsgEnriched):
+
+    """
+    An MPIMsgEnriched whose gather buffers are allocated in MPI-3 shared-memory
+    windows, one window per peer, spanning all of the ranks on the node. The
+    scatter buffer of a peer living on the same node is then simply the
+    gather buffer of such peer, so no message needs to be exchanged.
+    """
+
+    _C_field_shmfrom = 'shmfrom'
+    _C_field_shmto = 'shmto'
+
+    fields = MPIMsgEnriched.fields + [
+        (_C_field_shmfrom, c_int),
+        (_C_field_shmto, c_int)
+    ]
+
+    def __init__(self, name, target, halos, codec=None):
+        super().__init__(name, target, halos, codec=codec)
+
+        self._windows = []
+
+    def _C_memfree(self):
+        # Freeing the windows is a collective operation over the node, which
+        # is fine as `_arg_apply` is executed by all ranks in the same order
+        for i in self._windows:
+            self.target.grid.distributor._allocator_shared.free(*i)
+        self._windows[:] = []
+
+        super()._C_memfree()
+
+    def _alloc_buffers(self, i, f, allocator, size, ctype):
+        distributor = f.grid.distributor
+        shared = distributor._allocator_shared
+        entry = self.value[i]
+        halo = self.halos[i]
+
+        # All ranks on the node allocate the i-th window, and the segment of
+        # `fromrank` within it is the gather buffer meant for us
+        entry.bufg, memfree_args = shared._alloc_C_libcall(size, ctype)
+        if entry.bufg is None:
+            raise RuntimeError("Unable to allocate %d elements in shared memory"
+                               % size)
+        self._windows.append(memfree_args)
+
+        torank = distributor.neighborhood[halo.side]
+        entry.shmto = int(torank in distributor.node_ranks)
+
+        fromrank = distributor.neighborhood[tuple(i.flip() for i in halo.side)]
+        try:
+            entry.bufs = shared.address(memfree_args[0],
+                                        distributor.node_ranks[fromrank])
+            entry.shmfrom = 1
+        except KeyError:
+            # Either MPI.PROC_NULL or a rank on another node
+            entry.bufs, bufs_memfree_args = allocator._alloc_C_libcall(size, ctype)
+            self._memfree_args.append(bufs_memfree_args)
+            entry.shmfrom = 0
+
+
+def as_mpi_buffer(address, nbytes):
+    """
+    Wrap the raw memory at `address` into an mpi4py buffer.
+    """
+    try:
+        return MPI.buffer.fromaddress(address, nbytes)
+    except AttributeError:
+        # mpi4py < 4.0
+        return MPI.memory.fromaddress(address, nbytes)
+
+
 class MPIRegion(CompositeObject):
 
     __rargs__ = ('prefix', 'key', 'arguments', 'owned')
@@ -13,9 +13,9 @@ from devito.finite_differences.differentiable import Mul
 from devito.finite_differences.elementary import floor
 from devito.logger import warning
 from devito.symbolics import retrieve_function_carriers, retrieve_functions, INT
-from devito.tools import as_tuple, flatten, filter_ordered
-from devito.types import (ConditionalDimension, Eq, Inc, Evaluable, Symbol,
-                          CustomDimension, SubFunction)
+from devito.tools import Reconstructable, as_tuple, flatten, filter_ordered
+from devito.types import (ConditionalDimension, ColorDimension, Dimension, Eq, Inc,
+                          Evaluable, Symbol, CustomDimension, SubFunction)
 from devito.types.utils import DimensionTuple
 
 __all__ = ['LinearInterpolator', 'PrecomputedInterpolator', 'SincInterpolator']
@@ -33,7 +33,7 @@ def check_radius(func):
     return wrapper
 
 
-class UnevaluatedSparseOperation(sympy.Expr, Evaluable):
+class UnevaluatedSparseOperation(sympy.Expr, Evaluable, Reconstructable):
 
     """
     Represents an Injection or an Interpolation operation performed on a
@@ -79,7 +79,11 @@ class Interpolation(UnevaluatedSparseOperation):
     Evaluates to a list of Eq objects.
     """
 
-    def __new__(cls, expr, increment, implicit_dims, self_subs, interpolator):
+    __rargs__ = ('expr', 'increment', 'implicit_dims', 'self_subs', 'interpolator')
+    __rkwargs__ = ('tables',)
+
+    def __new__(cls, expr, increment, implicit_dims, self_subs, interpolator,
+                tables=False):
         obj = super().__new__(cls, interpolator)
 
         # TODO: unused now, but will be necessary to compute the adjoint
@@ -87,13 +91,15 @@ class Interpolation(UnevaluatedSparseOperation):
         obj.increment = increment
         obj.self_subs = self_subs
         obj.implicit_dims = implicit_dims
+        obj.tables = tables
 
         return obj
 
     def operation(self, **kwargs):
         return self.interpolator._interpolate(expr=self.expr, increment=self.increment,
                                               self_subs=self.self_subs,
-                                              implicit_dims=self.implicit_dims)
+                                              implicit_dims=self.implicit_dims,
+                                              tables=self.tables)
 
     def __repr__(self):
         return "Interpolation(%s into %s)" % (repr(self.expr),
@@ -107,24 +113,127 @@ class Injection(UnevaluatedSparseOperation):
     Evaluates to a list of Eq objects.
     """
 
-    def __new__(cls, field, expr, implicit_dims, interpolator):
+    __rargs__ = ('field', 'expr', 'implicit_dims', 'interpolator')
+    __rkwargs__ = ('coloring', 'tables')
+
+    def __new__(cls, field, expr, implicit_dims, interpolator, coloring=False,
+                tables=False):
         obj = super().__new__(cls, interpolator)
 
         # TODO: unused now, but will be necessary to compute the adjoint
         obj.field = field
         obj.expr = expr
         obj.implicit_dims = implicit_dims
+        obj.coloring = coloring
+        obj.tables = tables
 
         return obj
 
     def operation(self, **kwargs):
         return self.interpolator._inject(expr=self.expr, field=self.field,
-                                         implicit_dims=self.implicit_dims)
+                                         implicit_dims=self.implicit_dims,
+                                         coloring=self.coloring, tables=self.tables)
 
     def __repr__(self):
         return "Injection(%s into %s)" % (repr(self.expr), repr(self.field))
 
 
+class ColorSubFunction(SubFunction):
+
+    """
+    A SubFunction carrying a piece of the coloring, that is either the sorting
+    permutation or the offsets of the colors, of the points of its parent sparse
+    function, as well as the extent of the ColorDimension iterating over the
+    colors and of the Dimension iterating over the uncolored points. The
+    coloring isn't stored but rather computed from the positions of the sparse
+    points at Operator application time, and then reused until the sparse
+    points move.
+    """
+
+    __rkwargs__ = SubFunction.__rkwargs__ + ('parent', 'color_dim', 'uncolored_dim',
+                                             'table')
+
+    def __init_finalize__(self, *args, **kwargs):
+        self._color_dim = kwargs.pop('color_dim')
+        self._uncolored_dim = kwargs.pop('uncolored_dim')
+        self._table = kwargs.pop('table')
+        super().__init_finalize__(*args, **kwargs)
+
+    @property
+    def color_dim(self):
+        return self._color_dim
+
+    @property
+    def uncolored_dim(self):
+        return self._uncolored_dim
+
+    @property
+    def table(self):
+        return self._table
+
+    def _arg_values(self, **kwargs):
+        # The parent may be overridden by another sparse function
+        new = kwargs.get(self.parent.name)
+        sfunc = new if getattr(new, 'is_SparseFunction', False) else self.parent
+
+        coloring = sfunc._dist_colors(self.parent.r)
+
+        # The offsets are followed by those of the uncolored points and of the end
+        offsets = coloring['offsets']
+        ncolors = offsets.size - 2
+
+        values = coloring[self.table]
+
+        args = {self.name: values}
+        args.update(self.color_dim._arg_defaults(size=ncolors))
+        args.update({self.uncolored_dim.min_name: int(offsets[-2]),
+                     self.uncolored_dim.max_name: int(offsets[-1]) - 1})
+        # The extent of the Dimensions not provided by the parent, e.g. that
+        # of the offsets
+        for d, s in zip(self.dimensions, values.shape):
+            if d not in self.parent.dimensions:
+                args.update(d._arg_defaults(size=s))
+        return args
+
+    def _arg_apply(self, *args, **kwargs):
+        # Never written to by an Operator
+        return
+
+
+class TableSubFunction(SubFunction):
+
+    """
+    A SubFunction carrying a table, such as the positions or the interpolation
+    weights, of the points of its parent sparse function. The table isn't stored
+    but rather computed from the positions of the sparse points at Operator
+    application time, and then reused until the sparse points move.
+    """
+
+    __rkwargs__ = SubFunction.__rkwargs__ + ('parent', 'table')
+
+    def __init_finalize__(self, *args, **kwargs):
+        self._table = kwargs.pop('table')
+        super().__init_finalize__(*args, **kwargs)
+
+    @property
+    def table(self):
+        return self._table
+
+    def _arg_values(self, **kwargs):
+        # The parent may be overridden by another sparse function
+        new = kwargs.get(self.parent.name)
+        sfunc = new if getattr(new, 'is_SparseFunction', False) else self.parent
+
+        # Tabulated by self's interpolator, which the parent's overrides may lack
+        tables = sfunc._dist_interp_tables(self.parent.interpolator)
+
+        return {self.name: tables[self.table]}
+
+    def _arg_apply(self, *args, **kwargs):
+        # Never written to by an Operator
+        return
+
+
 class GenericInterpolator(ABC):
 
     """
@@ -145,9 +254,6 @@ class GenericInterpolator(ABC):
     def name(self):
         return self._name
 
-    def _arg_defaults(self, **args):
-        return {}
-
 
 class WeightedInterpolator(GenericInterpolator):
 
@@ -180,8 +286,15 @@ class WeightedInterpolator(GenericInterpolator):
 
     @cached_property
     def _rdim(self):
-        parent = self.sfunction._sparse_dim
-        dims = [CustomDimension("r%s%s" % (self.sfunction.name, d.name),
+        return self._make_rdim(self.sfunction._sparse_dim)
+
+    def _make_rdim(self, parent):
+        """The radius Dimensions, nested within `parent`."""
+        if parent is self.sfunction._sparse_dim:
+            name = self.sfunction.name
+        else:
+            name = parent.name
+        dims = [CustomDimension("r%s%s" % (name, d.name),
                                 -self.r+1, self.r, 2*self.r, parent)
                 for d in self._gdims]
 
@@ -199,11 +312,115 @@ class WeightedInterpolator(GenericInterpolator):
 
         return DimensionTuple(*rdims, getters=self._gdims)
 
+    @cached_property
+    def _color_dim(self):
+        return ColorDimension(name='c%s' % self.sfunction.name)
+
+    @cached_property
+    def _uncolored_dim(self):
+        """The Dimension iterating over the uncolored sparse points, once sorted."""
+        return Dimension(name='ka%s' % self.sfunction.name)
+
+    @cached_property
+    def _color_perm(self):
+        """The sparse points sorted by color, computed at runtime."""
+        return ColorSubFunction(name='%s_perm' % self.sfunction.name,
+                                dtype=np.int32, shape=(self.sfunction.npoint,),
+                                dimensions=(self.sfunction._sparse_dim,),
+                                space_order=0, alias=self.sfunction.alias,
+                                parent=self.sfunction, color_dim=self._color_dim,
+                                uncolored_dim=self._uncolored_dim, table='perm')
+
+    @cached_property
+    def _color_offsets(self):
+        """
+        The offsets of the colors, and of the uncolored sparse points, into
+        the sorted sparse points, computed at runtime.
+        """
+        return ColorSubFunction(name='%s_offsets' % self.sfunction.name,
+                                dtype=np.int32, shape=(self.sfunction.npoint + 2,),
+                                dimensions=(Dimension(name='o'),),
+                                space_order=0, alias=self.sfunction.alias,
+                                parent=self.sfunction, color_dim=self._color_dim,
+                                uncolored_dim=self._uncolored_dim, table='offsets')
+
+    @cached_property
+    def _color_points(self):
+        """
+        The Dimension iterating over the sorted sparse points of the current color.
+        """
+        c = self._color_dim
+        offsets = self._color_offsets
+        return CustomDimension(name='k%s' % self.sfunction.name,
+                               symbolic_min=offsets[c], symbolic_max=offsets[c + 1] - 1,
+                               parent=c)
+
+    @cached_property
+    def _color_rdim(self):
+        """
+        The radius Dimensions nested within the Dimensions iterating over the
+        sorted sparse points.
+        """
+        return {k: self._make_rdim(k)
+                for k in (self._color_points, self._uncolored_dim)}
+
+    @cached_property
+    def _pos_table(self):
+        """The positions of the sparse points, tabulated at runtime."""
+        return TableSubFunction(name='%s_pos' % self.sfunction.name, dtype=np.int32,
+                                shape=(self.sfunction.npoint, self.grid.dim),
+                                dimensions=(self.sfunction._sparse_dim,
+                                            Dimension(name='d')),
+                                space_order=0, alias=self.sfunction.alias,
+                                parent=self.sfunction, table='pos')
+
+    @cached_property
+    def _weight_tables(self):
+        """
+        The interpolation weights of the sparse points along each Dimension,
+        tabulated at runtime.
+        """
+        shape = (self.sfunction.npoint, 2*self.r)
+        return {r: TableSubFunction(name='w%s%s' % (self.name, r.name),
+                                    dtype=self.sfunction.dtype, shape=shape,
+                                    dimensions=(self.sfunction._sparse_dim, r.parent),
+                                    space_order=0, alias=self.sfunction.alias,
+                                    parent=self.sfunction, table=d.name)
+                for d, r in zip(self._gdims, self._rdim)}
+
+    @property
+    def _table_weights(self):
+        return Mul(*[w._subs(rd, rd-rd.parent.symbolic_min)
+                     for (rd, w) in self._weight_tables.items()])
+
+    def _tabulate(self, positions):
+        """
+        Tabulate the positions and the interpolation weights of the sparse
+        points at `positions`, in grid point units. Vectorized over all points.
+        """
+        base = np.floor(positions)
+        tables = {'pos': base.astype(np.int32)}
+        tables.update(self._tabulate_weights(positions - base))
+        return tables
+
+    def _tabulate_weights(self, offsets):
+        """
+        Tabulate the interpolation weights along each Dimension, given the
+        offsets, within `[0, 1)`, of the sparse points from their positions.
+        """
+        raise NotImplementedError
+
     def _augment_implicit_dims(self, implicit_dims, extras=None):
         if extras is not None:
-            extra = filter_ordered([i for v in extras for i in v.dimensions
-                                    if i not in self._gdims and
-                                    i not in self.sfunction.dimensions])
+            # Dimensions indexed indirectly (e.g., `u[t, x, y, sid[p]]`) are
+            # not iterated over, nor are those derived from the Dimensions of
+            # `self.sfunction` (e.g., the SteppingDimension `t` for `time`)
+            roots = {d.root for d in self.sfunction.dimensions}
+            extra = filter_ordered([d for v in extras
+                                    for d, i in zip(v.dimensions, v.indices)
+                                    if d not in self._gdims and
+                                    d.root not in roots and
+                                    d in i.free_symbols])
             extra = tuple(extra)
         else:
             extra = tuple()
@@ -221,18 +438,28 @@ class WeightedInterpolator(GenericInterpolator):
         return [Eq(v, INT(floor(k)), implicit_dims=implicit_dims)
                 for k, v in self.sfunction._position_map.items()]
 
-    def _interp_idx(self, variables, implicit_dims=None, pos_only=()):
+    def _table_positions(self, implicit_dims):
+        ddim = self._pos_table.dimensions[-1]
+        return [Eq(v, self._pos_table._subs(ddim, i), implicit_dims=implicit_dims)
+                for i, v in enumerate(self.sfunction._position_map.values())]
+
+    def _interp_idx(self, variables, implicit_dims=None, pos_only=(), tables=False):
         """
         Generate interpolation indices for the DiscreteFunctions in ``variables``.
         """
         mapper = {}
         pos = self.sfunction._position_map.values()
 
-        # Temporaries for the position
-        temps = self._positions(implicit_dims)
+        if tables:
+            # Temporaries for the position, read from the tables, which also
+            # provide the coefficients
+            temps = self._table_positions(implicit_dims)
+        else:
+            # Temporaries for the position
+            temps = self._positions(implicit_dims)
 
-        # Coefficient symbol expression
-        temps.extend(self._coeff_temps(implicit_dims))
+            # Coefficient symbol expression
+            temps.extend(self._coeff_temps(implicit_dims))
 
         # Substitution mapper for variables
         mapper = self._rdim.getters
@@ -284,7 +511,8 @@ class WeightedInterpolator(GenericInterpolator):
         """
         return Injection(field, expr, implicit_dims, self)
 
-    def _interpolate(self, expr, increment=False, self_subs={}, implicit_dims=None):
+    def _interpolate(self, expr, increment=False, self_subs={}, implicit_dims=None,
+                     tables=False):
         """
         Generate equations interpolating an arbitrary expression into ``self``.
 
@@ -298,6 +526,11 @@ class WeightedInterpolator(GenericInterpolator):
             An ordered list of Dimensions that do not explicitly appear in the
             interpolation expression, but that should be honored when constructing
             the operator.
+        tables : bool, optional
+            If True, the positions and the interpolation weights of the sparse
+            points are read from tables, computed once at Operator application
+            time and reused until the sparse points move, rather than computed
+            at each time step. Defaults to False.
         """
         # Derivatives must be evaluated before the introduction of indirect accesses
         try:
@@ -312,13 +545,15 @@ class WeightedInterpolator(GenericInterpolator):
         implicit_dims = self._augment_implicit_dims(implicit_dims, variables)
 
         # List of indirection indices for all adjacent grid points
-        idx_subs, temps = self._interp_idx(variables, implicit_dims=implicit_dims)
+        idx_subs, temps = self._interp_idx(variables, implicit_dims=implicit_dims,
+                                           tables=tables)
+        weights = self._table_weights if tables else self._weights
 
         # Accumulate point-wise contributions into a temporary
         rhs = Symbol(name='sum', dtype=self.sfunction.dtype)
         summands = [Eq(rhs, 0., implicit_dims=implicit_dims)]
         # Substitute coordinate base symbols into the interpolation coefficients
-        summands.extend([Inc(rhs, (self._weights * _expr).xreplace(idx_subs),
+        summands.extend([Inc(rhs, (weights * _expr).xreplace(idx_subs),
                              implicit_dims=implicit_dims)])
 
         # Write/Incr `self`
@@ -328,7 +563,7 @@ class WeightedInterpolator(GenericInterpolator):
 
         return temps + summands + last
 
-    def _inject(self, field, expr, implicit_dims=None):
+    def _inject(self, field, expr, implicit_dims=None, coloring=False, tables=False):
         """
         Generate equations injecting an arbitrary expression into a field.
 
@@ -342,6 +577,17 @@ class WeightedInterpolator(GenericInterpolator):
             An ordered list of Dimensions that do not explicitly appear in the
             injection expression, but that should be honored when constructing
             the operator.
+        coloring : bool, optional
+            If True, the sparse points are injected one color at a time, such
+            that the sparse points of the same color, which never inject into
+            the same grid point, may be processed in parallel without atomic
+            increments. The sparse points are sorted by color, so that each
+            color only iterates over its own sparse points. Defaults to False.
+        tables : bool, optional
+            If True, the positions and the interpolation weights of the sparse
+            points are read from tables, computed once at Operator application
+            time and reused until the sparse points move, rather than computed
+            at each time step. Defaults to False.
         """
         # Make iterable to support inject((u, v), expr=expr)
         # or inject((u, v), expr=(expr1, expr2))
@@ -370,17 +616,50 @@ class WeightedInterpolator(GenericInterpolator):
         # summing temp that wouldn't allow collapsing
         implicit_dims = implicit_dims + tuple(r.parent for r in self._rdim)
 
-        # List of indirection indices for all adjacent grid points
-        idx_subs, temps = self._interp_idx(fields, implicit_dims=implicit_dims,
-                                           pos_only=variables)
+        if coloring:
+            # Iterate over the colors, and then over the sparse points of each
+            # color, without atomics; then, over the uncolored sparse points,
+            # with atomics. The sparse points are visited in color order
+            sdim = self.sfunction._sparse_dim
+            colored, uncolored = self._color_points, self._uncolored_dim
+            sweeps = [((self._color_dim, colored), colored),
+                      ((uncolored,), uncolored)]
+        else:
+            sdim = None
+            sweeps = [((), None)]
+
+        ret = []
+        for dims, k in sweeps:
+            # The sparse points are reached through the permutation, and the
+            # radius Dimensions nested within the Dimension iterating over it
+            if k is not None:
+                rdim = self._color_rdim[k]
+                subs = {sdim: self._color_perm[k]}
+                subs.update(zip(self._rdim, rdim))
+                subs.update((i.parent, j.parent) for i, j in zip(self._rdim, rdim))
+            else:
+                subs = {}
 
-        # Substitute coordinate base symbols into the interpolation coefficients
-        eqns = [Inc(_field.xreplace(idx_subs),
-                    (self._weights * _expr).xreplace(idx_subs),
-                    implicit_dims=implicit_dims)
-                for (_field, _expr) in zip(fields, _exprs)]
+            idims = tuple(j for i in implicit_dims
+                          for j in (dims if i is sdim else (subs.get(i, i),)))
+
+            # List of indirection indices for all adjacent grid points
+            idx_subs, temps = self._interp_idx(fields, implicit_dims=idims,
+                                               pos_only=variables, tables=tables)
+            weights = self._table_weights if tables else self._weights
+
+            # Substitute coordinate base symbols into the interpolation coefficients
+            eqns = [Inc(_field.xreplace(idx_subs),
+                        (weights * _expr).xreplace(idx_subs),
+                        implicit_dims=idims)
+                    for (_field, _expr) in zip(fields, _exprs)]
 
-        return temps + eqns
+            temps = [e.xreplace(subs) for e in temps]
+            eqns = [e.xreplace(subs) for e in eqns]
+
+            ret.extend(temps + eqns)
+
+        return ret
 
 
 class LinearInterpolator(WeightedInterpolator):
@@ -416,6 +695,11 @@ class LinearInterpolator(WeightedInterpolator):
                  for (d, pos) in zip(self._gdims, pmap.keys())]
         return poseq
 
+    def _tabulate_weights(self, offsets):
+        dtype = self.sfunction.dtype
+        return {d.name: np.stack([1 - o, o], axis=1).astype(dtype)
+                for d, o in zip(self._gdims, offsets.T)}
+
 
 class PrecomputedInterpolator(WeightedInterpolator):
     """
@@ -450,6 +734,14 @@ class PrecomputedInterpolator(WeightedInterpolator):
         return Mul(*[self.interpolation_coeffs.subs(mapper)
                      for mapper in mappers])
 
+    @property
+    def _table_weights(self):
+        # The coefficients are a table already
+        return self._weights
+
+    def _tabulate_weights(self, offsets):
+        return {}
+
 
 class SincInterpolator(PrecomputedInterpolator):
     """
@@ -477,41 +769,24 @@ of the SincInterpolator that uses i0 (Bessel function).
 """)
         super().__init__(sfunction)
 
-    @cached_property
+    @property
     def interpolation_coeffs(self):
-        coeffs = {}
-        shape = (self.sfunction.npoint, 2 * self.r)
-        for r in self._rdim:
-            dimensions = (self.sfunction._sparse_dim, r.parent)
-            sf = SubFunction(name="wsinc%s" % r.name, dtype=self.sfunction.dtype,
-                             shape=shape, dimensions=dimensions,
-                             space_order=0, alias=self.sfunction.alias,
-                             parent=None)
-            coeffs[r] = sf
-        return coeffs
+        return self._weight_tables
 
     @property
     def _weights(self):
         return Mul(*[w._subs(rd, rd-rd.parent.symbolic_min)
                      for (rd, w) in self.interpolation_coeffs.items()])
 
-    def _arg_defaults(self, coords=None, sfunc=None):
-        args = {}
+    def _tabulate_weights(self, offsets):
         b = self._b_table[self.r]
         b0 = i0(b)
-        if coords is None or sfunc is None:
-            raise ValueError("No coordinates or sparse function provided")
-        # Coords to indices
-        coords = coords / np.array(sfunc.grid.spacing)
-        coords = coords - np.floor(coords)
 
         # Precompute sinc
-        for j, r in enumerate(self._rdim):
-            data = np.zeros((coords.shape[0], 2*self.r), dtype=sfunc.dtype)
-            for ri in range(2*self.r):
-                rpos = ri - self.r + 1 - coords[:, j]
-                num = i0(b*np.sqrt(1 - (rpos/self.r)**2))
-                data[:, ri] = num / b0 * np.sinc(rpos)
-            args[self.interpolation_coeffs[r].name] = data
+        tables = {}
+        for d, o in zip(self._gdims, offsets.T):
+            rpos = np.arange(-self.r + 1, self.r + 1) - o[:, None]
+            num = i0(b*np.sqrt(1 - (rpos/self.r)**2))
+            tables[d.name] = (num / b0 * np.sinc(rpos)).astype(self.sfunction.dtype)
 
-        return args
+        return tables
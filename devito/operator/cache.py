@@ -0,0 +1,347 @@
+"""
+A persistent, on-disk cache of fully lowered (and jit-compiled) Operators.
+
+An entry is keyed by a deterministic signature of the input expressions, of the
+`configuration` parameters impacting code generation, and of the Operator
+construction arguments (optimization level and options, platform, compiler, ...).
+Upon a cache hit, the entire lowering pipeline is bypassed, and the Operator,
+together with its shared object, is restored from disk via unpickling.
+
+The user-level objects carrying data (e.g., Functions, Constants, Grids) are not
+serialized along with the Operator. Instead, they are replaced by references
+which, upon unpickling, are resolved into the objects appearing in the input
+expressions of the process performing the lookup. This way, the restored
+Operator is semantically identical to the one that would have been built from
+scratch, and its default arguments are the user's objects.
+"""
+
+from pickle import Pickler, Unpickler
+from time import time as seq_time
+import os
+import tempfile
+
+import numpy as np
+import sympy
+
+from devito.logger import debug, perf, warning
+from devito.operations.interpolators import UnevaluatedSparseOperation
+from devito.parameters import configuration
+from devito.tools import Reconstructable, Signer, make_tempdir
+from devito.types import Constant
+from devito.types.basic import AbstractFunction
+from devito.types.grid import CartesianDiscretization
+
+__all__ = ['OperatorCache', 'operator_cache']
+
+
+class OperatorCache:
+
+    """
+    A size-bounded, persistent Operator cache with LRU eviction.
+
+    Entries are stored as files within a directory, one file per Operator.
+    Writes are atomic (i.e., a temporary file is first written and then renamed),
+    so the cache may be safely accessed by concurrent processes, such as the
+    ranks of an MPI run or independent workers sharing a file system.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        The cache directory. Defaults to `configuration['opcache-dir']` or, if
+        unset, to a deterministic temporary directory.
+    maxsize : int, optional
+        The maximum size of the cache, in bytes. Defaults to
+        `configuration['opcache-maxsize']`.
+    """
+
+    _suffix = '.opc'
+
+    def __init__(self, path=None, maxsize=None):
+        self._path = path
+        self._maxsize = maxsize
+
+    @property
+    def path(self):
+        path = self._path or configuration['opcache-dir']
+        if path is None:
+            return make_tempdir('opcache')
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @property
+    def maxsize(self):
+        return self._maxsize or configuration['opcache-maxsize']
+
+    @property
+    def entries(self):
+        """The cache entries, from the least to the most recently used."""
+        entries = []
+        for i in os.scandir(self.path):
+            if not i.name.endswith(self._suffix):
+                continue
+            try:
+                stat = i.stat()
+            except FileNotFoundError:
+                # Concurrently evicted
+                continue
+            entries.append((stat.st_mtime, stat.st_size, i.path))
+        return [(path, size) for _, size, path in sorted(entries)]
+
+    @property
+    def nbytes(self):
+        return sum(size for _, size in self.entries)
+
+    def signature(self, expressions, **kwargs):
+        """
+        Compute the cache key for an Operator built out of `expressions`.
+
+        Returns
+        -------
+        key : str
+            The cache key.
+        bindings : list
+            The user-level objects carrying data found in `expressions`, in
+            a deterministic order.
+        """
+        bindings = []
+        items = _signature_items(expressions, bindings)
+
+        # The Operator construction arguments
+        items.append(str(kwargs['mode']))
+        items.append(str(sorted((k, str(v)) for k, v in kwargs['options'].items())))
+        items.append(str(kwargs['language']))
+        items.append(str(kwargs['platform']))
+        compiler = kwargs['compiler']
+        items.extend([str(compiler), str(compiler.cc), str(compiler.version),
+                      str(compiler.cflags), str(compiler.ldflags)])
+        items.append(str(kwargs.get('name', 'Kernel')))
+        items.append(str(sorted((str(k), str(v))
+                                for k, v in kwargs.get('subs', {}).items())))
+
+        # The configuration parameters affecting code generation
+        items.extend(configuration._signature_items())
+
+        # Entries are invalidated across Devito versions
+        from devito import __version__
+        items.append(str(__version__))
+
+        return Signer._sign(items), bindings
+
+    def _file(self, key):
+        return os.path.join(self.path, '%s%s' % (key, self._suffix))
+
+    def load(self, key, bindings):
+        """
+        Restore the Operator stored under `key`, binding it to `bindings`.
+        Return None in case of cache miss.
+        """
+        filename = self._file(key)
+
+        try:
+            with open(filename, 'rb') as f:
+                op = _BindingUnpickler(f, bindings).load()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # E.g., a stale or truncated entry
+            debug("Dropping unusable operator-cache entry `%s` [%s]" % (filename, e))
+            self._remove(filename)
+            return None
+
+        # Mark as most recently used
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+
+        return op
+
+    def store(self, key, bindings, op):
+        """
+        Store the Operator `op` under `key`. The Operator gets jit-compiled,
+        if not done yet, as the shared object is stored alongside the IET.
+        """
+        filename = self._file(key)
+        if os.path.exists(filename):
+            # E.g., stored by another MPI rank in the meanwhile
+            return
+
+        try:
+            op.cfunction
+
+            with tempfile.NamedTemporaryFile(dir=self.path, prefix='.tmp-',
+                                             delete=False) as f:
+                tmpname = f.name
+                _BindingPickler(f, bindings).dump(op)
+            os.replace(tmpname, filename)
+        except Exception as e:
+            warning("Couldn't store Operator `%s` in the operator cache [%s]"
+                    % (op.name, e))
+            try:
+                self._remove(tmpname)
+            except NameError:
+                pass
+            return
+
+        self.evict()
+
+    def evict(self, maxsize=None):
+        """
+        Evict the least recently used entries until the cache size drops
+        below `maxsize`, which defaults to `self.maxsize`.
+        """
+        maxsize = self.maxsize if maxsize is None else maxsize
+
+        entries = self.entries
+        nbytes = sum(size for _, size in entries)
+        for path, size in entries:
+            if nbytes <= maxsize:
+                break
+            self._remove(path)
+            nbytes -= size
+
+    def clear(self):
+        """Drop all entries."""
+        self.evict(maxsize=0)
+
+    def _remove(self, filename):
+        try:
+            os.remove(filename)
+        except FileNotFoundError:
+            # Concurrently evicted
+            pass
+
+    def fetch(self, cls, expressions, **kwargs):
+        """
+        Look up the Operator built out of `expressions` by `cls`. Return a tuple
+        `(op, key, bindings)`, with `op` set to None in case of cache miss.
+        """
+        tic = seq_time()
+        key, bindings = self.signature(expressions, **kwargs)
+
+        op = self.load(key, bindings)
+        if op is not None:
+            if not isinstance(op, cls):
+                return None, key, bindings
+            perf("Operator `%s` fetched from operator-cache in %.2f s"
+                 % (op.name, seq_time() - tic))
+
+        return op, key, bindings
+
+
+operator_cache = OperatorCache()
+"""The default OperatorCache, enabled via `configuration['opcache']`."""
+
+
+# Signature of the input expressions
+
+def _is_binding(obj):
+    """
+    True if `obj` is a user-level object carrying data, False otherwise.
+    """
+    if isinstance(obj, CartesianDiscretization):
+        return True
+    elif isinstance(obj, (AbstractFunction, Constant)):
+        return obj.function is obj and obj.is_Input
+    else:
+        return False
+
+
+def _signature_items(obj, bindings, memo=None):
+    """
+    Return a list of strings uniquely and deterministically representing
+    `obj`. All user-level objects carrying data encountered along the way are
+    appended to `bindings`.
+    """
+    if memo is None:
+        memo = {}
+
+    if isinstance(obj, (str, int, float, bool, np.dtype, type)) or obj is None:
+        return [str(obj)]
+    elif isinstance(obj, (list, tuple)):
+        items = ['(']
+        for i in obj:
+            items.extend(_signature_items(i, bindings, memo))
+        items.append(')')
+        return items
+    elif isinstance(obj, (set, frozenset)):
+        return ['{'] + sorted(''.join(_signature_items(i, bindings, memo))
+                              for i in obj) + ['}']
+    elif isinstance(obj, dict):
+        return ['{'] + sorted(''.join(_signature_items(k, bindings, memo) + [':'] +
+                                      _signature_items(v, bindings, memo))
+                              for k, v in obj.items()) + ['}']
+
+    # Only compound objects are memoized
+    try:
+        return ['@%d' % memo[id(obj)][0]]
+    except KeyError:
+        # Keep `obj` alive as long as `memo`, so ids can't be recycled
+        memo[id(obj)] = (len(memo), obj)
+
+    items = [type(obj).__name__]
+
+    if _is_binding(obj):
+        bindings.append(obj)
+        items.append('#%d' % (len(bindings) - 1))
+
+        # The metadata, but not the data
+        if isinstance(obj, sympy.Basic):
+            attrs = [i for i in obj.__rkwargs__
+                     if i not in ('function', 'initializer', 'value')]
+            for i in attrs:
+                items.append(i)
+                items.extend(_signature_items(getattr(obj, i), bindings, memo))
+            for i in getattr(obj, '_sub_functions', ()):
+                items.extend(_signature_items(getattr(obj, i), bindings, memo))
+        else:
+            # A CartesianDiscretization
+            items.append(str(obj))
+            items.extend(_signature_items(obj.dimensions, bindings, memo))
+    elif isinstance(obj, UnevaluatedSparseOperation):
+        items.append(type(obj.interpolator).__name__)
+        items.extend(_signature_items(obj.interpolator.sfunction, bindings, memo))
+        attrs = sorted(k for k in vars(obj) if k != 'interpolator')
+        for i in attrs:
+            items.append(i)
+            items.extend(_signature_items(getattr(obj, i), bindings, memo))
+    elif isinstance(obj, sympy.Basic):
+        if obj.is_Atom:
+            items.append(str(obj))
+        if isinstance(obj, Reconstructable):
+            for i in obj.__rargs__ + obj.__rkwargs__:
+                items.append(i)
+                items.extend(_signature_items(getattr(obj, i.lstrip('*')),
+                                              bindings, memo))
+            try:
+                items.extend(_signature_items(obj.assumptions0, bindings, memo))
+            except AttributeError:
+                pass
+        for i in obj.args:
+            items.extend(_signature_items(i, bindings, memo))
+    else:
+        items.append(str(obj))
+
+    return items
+
+
+# Pickling with bindings
+
+class _BindingPickler(Pickler):
+
+    def __init__(self, file, bindings):
+        super().__init__(file)
+        self._bindings = {id(v): i for i, v in enumerate(bindings)}
+
+    def persistent_id(self, obj):
+        return self._bindings.get(id(obj))
+
+
+class _BindingUnpickler(Unpickler):
+
+    def __init__(self, file, bindings):
+        super().__init__(file)
+        self._bindings = bindings
+
+    def persistent_load(self, pid):
+        return self._bindings[pid]
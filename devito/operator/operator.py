@@ -1,6 +1,9 @@
 from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from functools import cached_property
+from time import time as seq_time
 import ctypes
+import os
 import shutil
 from operator import attrgetter
 from math import ceil
@@ -18,7 +21,8 @@ from devito.ir.iet import (Callable, CInterface, EntryFunction, FindSymbols, Met
                            derive_parameters, iet_build)
 from devito.ir.support import AccessMode, SymbolRegistry
 from devito.ir.stree import stree_build
-from devito.operator.profiling import create_profile
+from devito.operator.cache import operator_cache
+from devito.operator.profiling import BuildProfile, create_profile
 from devito.operator.registry import operator_selector
 from devito.mpi import MPI
 from devito.parameters import configuration
@@ -29,10 +33,10 @@ from devito.symbolics import estimate_cost, subs_op_args
 from devito.tools import (DAG, OrderedSet, Signer, ReducerMap, as_mapper, as_tuple,
                           flatten, filter_sorted, frozendict, is_integer,
                           split, timed_pass, timed_region, contains_val)
-from devito.types import (Buffer, Grid, Evaluable, host_layer, device_layer,
-                          disk_layer)
+from devito.types import (Buffer, Grid, Evaluable, SubFunction,
+                          host_layer, device_layer, disk_layer)
 
-__all__ = ['Operator']
+__all__ = ['Operator', 'compile_all']
 
 
 class Operator(Callable):
@@ -160,14 +164,25 @@ class Operator(Callable):
         cls._check_kwargs(**kwargs)
         expressions = cls._sanitize_exprs(expressions, **kwargs)
 
+        # Attempt bypassing the lowering altogether via the persistent cache
+        if configuration['opcache']:
+            op, key, bindings = operator_cache.fetch(cls, expressions, **kwargs)
+            if op is not None:
+                return op
+
         # Lower to a JIT-compilable object
-        with timed_region('op-compile') as r:
+        with timed_region('op-compile', configuration['profiling-build']) as r:
             op = cls._build(expressions, **kwargs)
         op._profiler.py_timers.update(r.timings)
+        if r.profile is not None:
+            op._profiler.build_profile = BuildProfile(op.name, r.profile)
 
         # Emit info about how long it took to perform the lowering
         op._emit_build_profiling()
 
+        if configuration['opcache']:
+            operator_cache.store(key, bindings, op)
+
         return op
 
     @classmethod
@@ -539,6 +554,16 @@ class Operator(Callable):
         return frozendict({i: AccessMode(i in self.reads, i in self.writes)
                            for i in self.input})
 
+    @cached_property
+    def _arguments_metadata(self):
+        """
+        Information about the Operator required to derive some of its arguments.
+        """
+        return {'language': self._language,
+                'platform': self._platform,
+                'transients': self.transients,
+                **self.threads_info}
+
     def _prepare_arguments(self, autotune=None, **kwargs):
         """
         Process runtime arguments passed to ``.apply()` and derive
@@ -565,10 +590,7 @@ class Operator(Callable):
 
         # Prepare to process data-carriers
         args = kwargs['args'] = ReducerMap()
-        kwargs['metadata'] = {'language': self._language,
-                              'platform': self._platform,
-                              'transients': self.transients,
-                              **self.threads_info}
+        kwargs['metadata'] = self._arguments_metadata
 
         overrides, defaults = split(self.input, lambda p: p.name in kwargs)
 
@@ -719,6 +741,35 @@ class Operator(Callable):
                 raise ValueError("No value found for parameter %s" % p.name)
         return args
 
+    def bind(self, **kwargs):
+        """
+        Bind runtime arguments to the Operator, thus obtaining a BoundOperator.
+
+        The arguments are processed and validated only once. A BoundOperator may
+        then be executed repeatedly, with only the arguments that change from
+        one run to another to be supplied, at a fraction of the cost of `apply`.
+
+        Parameters
+        ----------
+        **kwargs
+            The same runtime arguments accepted by `apply`.
+
+        Examples
+        --------
+        >>> from devito import Eq, Grid, TimeFunction, Operator
+        >>> grid = Grid(shape=(3, 3))
+        >>> u = TimeFunction(name='u', grid=grid)
+        >>> op = Operator(Eq(u.forward, u + 1))
+        >>> bop = op.bind(time_M=2)
+
+        Now `bop` can be run many times, for example over a different TimeFunction
+
+        >>> u1 = TimeFunction(name='u1', grid=grid)
+        >>> bop.apply(u=u1)
+        >>> bop.apply(u=u1, time_M=4)
+        """
+        return BoundOperator(self, **kwargs)
+
     # Code generation and JIT compilation
 
     @cached_property
@@ -753,6 +804,14 @@ class Operator(Callable):
                 perf("Operator `%s` fetched `%s` in %.2f s from jit-cache" %
                      (self.name, src_file, elapsed))
 
+    @property
+    def build_profile(self):
+        """
+        The compile-time profile of the Operator as a BuildProfile, or None
+        unless `configuration['profiling-build']` was set upon construction.
+        """
+        return getattr(self._profiler, 'build_profile', None)
+
     @property
     def cfunction(self):
         """The JIT-compiled C function as a ctypes.FuncPtr object."""
@@ -1121,6 +1180,60 @@ def rcompile(expressions, kwargs, options, target=None):
     return cls._lower(expressions, **kwargs)
 
 
+def compile_all(operators, nprocs=None):
+    """
+    JIT-compile several Operators concurrently.
+
+    The code of each Operator is generated in the calling process, while the
+    C compiler is invoked, for several Operators at once, by a pool of worker
+    processes. Upon return, all Operators are ready to be applied, i.e. their
+    shared objects are loaded, as if their `cfunction` had been accessed.
+
+    The workers go through `Compiler.jit_compile`, and thus through the codepy
+    cache and its locks, so `compile_all` is safe to use alongside concurrent
+    processes (e.g., other MPI ranks) compiling the same Operators.
+
+    Parameters
+    ----------
+    operators : Operator or list of Operator
+        The Operators to be compiled.
+    nprocs : int, optional
+        The maximum number of worker processes. Defaults to the number of
+        available cores.
+
+    Examples
+    --------
+    >>> from devito import Eq, Grid, Function, Operator, compile_all
+    >>> grid = Grid(shape=(4, 4))
+    >>> f = Function(name='f', grid=grid)
+    >>> op0 = Operator(Eq(f, f + 1))
+    >>> op1 = Operator(Eq(f, f * 2))
+    >>> compile_all([op0, op1])
+    """
+    operators = [op for op in as_tuple(operators) if op._lib is None]
+
+    # Operators may share the same code (and therefore the same shared object)
+    mapper = OrderedDict()
+    for op in operators:
+        mapper.setdefault(op._soname, op)
+
+    nprocs = min(nprocs or os.cpu_count() or 1, len(mapper))
+    if nprocs > 1:
+        tic = seq_time()
+        with ProcessPoolExecutor(max_workers=nprocs) as executor:
+            futures = [executor.submit(op._compiler.jit_compile, soname, str(op))
+                       for soname, op in mapper.items()]
+            # Propagate any compilation error
+            for i in futures:
+                i.result()
+        perf("Jit-compiled %d Operators in %.2f s using %d processes"
+             % (len(mapper), seq_time() - tic, nprocs))
+
+    # Load the shared objects; with `nprocs > 1` this is merely a jit-cache lookup
+    for op in operators:
+        op.cfunction
+
+
 # Misc helpers
 
 
@@ -1254,6 +1367,239 @@ class ArgumentsMap(dict):
         return mapper
 
 
+class BoundOperator:
+
+    """
+    An Operator with a fully processed set of runtime arguments.
+
+    The runtime arguments are derived and validated only once, upon construction.
+    Upon execution, only the arguments supplied by the caller are patched, which
+    makes repeated executions (e.g., over many shots) practically free of Python
+    overhead. The following can be patched cheaply:
+
+        * Functions and SparseFunctions (or numpy arrays), provided they have
+          the same shape and type as those they replace;
+        * Constants and other scalar arguments;
+        * The iteration bounds (e.g., `time_m`, `time_M`).
+
+    Anything else, for example a Function with a different shape, triggers the
+    full (slow) processing of all arguments, as in `Operator.apply`.
+
+    Parameters
+    ----------
+    op : Operator
+        The Operator the arguments are bound to.
+    **kwargs
+        The runtime arguments, as in `Operator.apply`.
+
+    Notes
+    -----
+    Unlike `Operator.apply`, no performance summary is produced.
+    """
+
+    def __init__(self, op, **kwargs):
+        self.op = op
+        self.args = None
+
+        self._bind(**kwargs)
+
+    def __del__(self):
+        try:
+            self._release()
+        except Exception:
+            # E.g., at interpreter shutdown
+            pass
+
+    def _bind(self, **kwargs):
+        op = self.op
+
+        args = op._prepare_arguments(**kwargs)
+
+        self._release()
+
+        self.kwargs = dict(kwargs)
+        self.args = args
+
+        self._index = {p.name: n for n, p in enumerate(op.parameters)}
+        self._values = [args.get(p.name) for p in op.parameters]
+
+        # Missing arguments may still be supplied later on, as overrides
+        self._missing = {p.name for p in op.parameters if args.get(p.name) is None}
+
+        # The data carriers, whose values are ctypes objects to be patched
+        self._functions = {p.name: p for p in op.parameters if p.is_DiscreteFunction}
+
+        # Distributed SparseFunctions must be scattered before and gathered after
+        # each execution
+        self._volatile = [p for p in self._functions.values()
+                          if (p.is_SparseFunction or isinstance(p, SubFunction)) and
+                          p.grid is not None and p.grid.distributor.nprocs > 1]
+
+        # The iteration bounds that can be patched, mapped to the Dimension
+        # they belong to, the latter being possibly aliased (e.g., `t -> time`)
+        self._bounds = {}
+        for d in op.dimensions:
+            if d.is_Stepping:
+                root = d.parent
+            elif not d.is_Derived:
+                root = d
+            else:
+                continue
+            self._bounds.update({d.min_name: (root, 0), d.max_name: (root, 1),
+                                 d.name: (root, 1)})
+
+        # The checks against out-of-bounds accesses, grouped by Dimension
+        checks = []
+        for p in self._functions.values():
+            shape = args[p.name]._obj.underlying_array.shape
+            checks.extend((i, s, op._dspace[p][i]) for i, s in zip(p.dimensions, shape))
+        self._checks = as_mapper(checks, lambda i: i[0])
+
+    def _release(self):
+        """
+        Free any resources held by the arguments, e.g. buffers allocated for
+        the MPI halo exchanges.
+        """
+        if self.args is None:
+            return
+        for p in self.op.objects:
+            p._arg_apply(self.args[p.name], alias=self.kwargs.get(p.name))
+        self.args = None
+
+    def _patch(self, **kwargs):
+        """
+        Patch the bound arguments. Raise ValueError if it's not possible to do
+        so cheaply.
+        """
+        unknown = [k for k in kwargs
+                   if k not in self._functions and
+                   k not in self._bounds and
+                   k not in self._index]
+        if unknown:
+            raise ValueError("Cannot patch `%s`" % unknown)
+
+        # The iteration bounds go first, as they get validated
+        bounds = {k: v for k, v in kwargs.items() if k in self._bounds}
+        if bounds:
+            self._patch_bounds(**bounds)
+
+        for k, v in kwargs.items():
+            if k in self._functions:
+                self._patch_function(self._functions[k], v)
+            elif k in self._bounds:
+                continue
+            else:
+                p = self.op.parameters[self._index[k]]
+                if getattr(p, 'is_Constant', False):
+                    v = p._arg_values(**{k: v})[k]
+                self._values[self._index[k]] = self.args[k] = v
+                self._missing.discard(k)
+
+    def _patch_function(self, p, v):
+        metadata = self.op._arguments_metadata
+        if p.is_SparseFunction:
+            # Also carries the SubFunctions' data
+            values = p._arg_values(metadata=metadata, **{p.name: v})
+        elif getattr(v, 'is_DiscreteFunction', False):
+            values = {p.name: v._data_buffer(metadata=metadata)}
+        else:
+            values = {p.name: v}
+
+        # First make sure all data can be patched...
+        mapper = {}
+        for k, data in values.items():
+            try:
+                dataobj = self.args[k]
+                f = self._functions[k]
+            except KeyError:
+                # E.g., the sizes of the Dimensions
+                continue
+            current = dataobj._obj.underlying_array
+            if data.shape != current.shape or data.dtype != current.dtype:
+                raise ValueError("Cannot patch `%s`" % k)
+            mapper[f] = (dataobj, data)
+
+        # ... and only then patch it
+        for f, (dataobj, data) in mapper.items():
+            f._C_update_dataobj(dataobj, data)
+
+    def _patch_bounds(self, **kwargs):
+        op = self.op
+        grid = self.args.grid
+
+        mapper = {}
+        for k, v in kwargs.items():
+            d, i = self._bounds[k]
+            mapper.setdefault(d, [None, None])[i] = v
+
+        updated = {}
+        dimensions = set(mapper)
+        for d, (glb_minv, glb_maxv) in mapper.items():
+            if grid is not None and grid.is_distributed(d):
+                minv, maxv = grid.distributor.glb_to_loc(d, (glb_minv, glb_maxv))
+            else:
+                minv, maxv = glb_minv, glb_maxv
+            if minv is not None:
+                updated[d.min_name] = minv
+            if maxv is not None:
+                updated[d.max_name] = maxv
+
+            # The ConditionalDimensions iterating over a subset of `d`
+            for c in op.dimensions:
+                if c.is_Conditional and c.parent is d:
+                    updated.update(c._arg_values(op._dspace[c], grid,
+                                                 **{d.min_name: glb_minv,
+                                                    d.max_name: glb_maxv}))
+                    dimensions.add(c)
+
+        # Sanity check
+        args = {**self.args, **updated}
+        for d in dimensions:
+            for i, s, interval in self._checks.get(d, []):
+                i._arg_check(args, s, interval)
+
+        for k, v in updated.items():
+            self.args[k] = v
+            if k in self._index:
+                self._values[self._index[k]] = v
+                self._missing.discard(k)
+
+    def apply(self, **kwargs):
+        """
+        Execute the BoundOperator.
+
+        Parameters
+        ----------
+        **kwargs
+            Runtime arguments overriding the bound ones. The overrides persist
+            across executions.
+        """
+        if kwargs:
+            try:
+                self._patch(**kwargs)
+            except ValueError:
+                # Fallback to the full arguments processing
+                self._bind(**{**self.kwargs, **kwargs})
+            else:
+                self.kwargs.update(kwargs)
+
+        if self._missing:
+            raise ValueError("No value found for parameters %s" % sorted(self._missing))
+
+        for p in self._volatile:
+            if p.is_SparseFunction:
+                self._patch_function(p, self.kwargs.get(p.name, p))
+
+        retval = self.op.cfunction(*self._values)
+
+        self.op._postprocess_errors(retval)
+
+        for p in self._volatile:
+            p._arg_apply(self.args[p.name], alias=self.kwargs.get(p.name))
+
+    __call__ = apply
+
+
 def parse_kwargs(**kwargs):
     """
     Parse keyword arguments provided to an Operator.
@@ -1306,6 +1652,7 @@ def parse_kwargs(**kwargs):
     options = dict(options)
     options.setdefault('openmp', openmp)
     options.setdefault('mpi', configuration['mpi'])
+    options.setdefault('mpi-codec', configuration['mpi-codec'])
     for k, v in configuration['opt-options'].items():
         options.setdefault(k, v)
     # Handle deprecations
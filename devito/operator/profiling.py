@@ -5,6 +5,7 @@ from operator import mul
 from pathlib import Path
 from subprocess import DEVNULL, PIPE, run
 from time import time as seq_time
+import json
 import os
 
 import cgen as c
@@ -18,9 +19,9 @@ from devito.logger import warning, error
 from devito.mpi import MPI
 from devito.parameters import configuration
 from devito.symbolics import subs_op_args
-from devito.tools import DefaultOrderedDict, flatten
+from devito.tools import DefaultOrderedDict, PassRecord, flatten
 
-__all__ = ['create_profile']
+__all__ = ['create_profile', 'BuildProfile']
 
 
 SectionData = namedtuple('SectionData', 'ops sops points traffic itermaps')
@@ -52,6 +53,9 @@ class Profiler:
         # Python-level timers
         self.py_timers = OrderedDict()
 
+        # Compile-time profile, if requested via `configuration['profiling-build']`
+        self.build_profile = None
+
         self.initialized = True
 
     def analyze(self, iet):
@@ -500,6 +504,150 @@ class PerformanceSummary(OrderedDict):
         return OrderedDict([(k, v.time) for k, v in self.items()])
 
 
+class BuildProfile:
+
+    """
+    A structured compile-time profile: a tree of compiler passes, each with
+    wall time, number of invocations, peak Python memory and IR node counts
+    (Clusters or IET nodes) before and after the pass.
+
+    Obtained from `Operator.build_profile` when `configuration['profiling-build']`
+    is set, or by aggregating multiple profiles via `BuildProfile.aggregate`.
+
+    Parameters
+    ----------
+    name : str
+        The name of the profiled Operator(s).
+    root : PassRecord
+        The root of the pass tree.
+    operators : int, optional
+        The number of Operators folded into this profile. Defaults to 1.
+    """
+
+    def __init__(self, name, root, operators=1):
+        self.name = name
+        self.root = root
+        self.operators = operators
+
+    def __repr__(self):
+        return "BuildProfile<%s, %.2f s>" % (self.name, self.time)
+
+    @property
+    def time(self):
+        return self.root.time
+
+    @property
+    def memory(self):
+        return self.root.memory
+
+    @classmethod
+    def aggregate(cls, profiles, name='aggregate'):
+        """
+        Fold multiple BuildProfiles into a single one. Timings and node counts
+        are summed up, while peak memory is the maximum across all profiles.
+
+        Parameters
+        ----------
+        profiles : iterable of BuildProfile
+            The profiles to be aggregated. Those that are None (e.g., belonging
+            to Operators built without `profiling-build`) are ignored.
+        name : str, optional
+            The name of the aggregated profile.
+        """
+        profiles = [i for i in profiles if i is not None]
+
+        # The roots are all named after the same `timed_region`
+        root = PassRecord(profiles[0].root.name if profiles else name)
+        for i in profiles:
+            root.merge(i.root)
+
+        return cls(name, root, sum(i.operators for i in profiles))
+
+    def as_dict(self):
+        def _as_dict(record):
+            return OrderedDict([
+                ('name', record.name),
+                ('calls', record.calls),
+                ('time', record.time),
+                ('memory', record.memory),
+                ('nodes-in', record.nodes_in),
+                ('nodes-out', record.nodes_out),
+                ('children', [_as_dict(i) for i in record.children.values()])
+            ])
+
+        return OrderedDict([
+            ('name', self.name),
+            ('operators', self.operators),
+            ('passes', _as_dict(self.root))
+        ])
+
+    def _dump(self, obj, filename):
+        if filename is None:
+            return json.dumps(obj, indent=2)
+        with open(filename, 'w') as f:
+            json.dump(obj, f, indent=2)
+
+    def to_json(self, filename=None):
+        """
+        Serialize the profile to JSON.
+
+        Parameters
+        ----------
+        filename : str, optional
+            If provided, the profile is written to this file. Otherwise, it is
+            returned as a string.
+        """
+        return self._dump(self.as_dict(), filename)
+
+    def to_speedscope(self, filename=None):
+        """
+        Serialize the profile in the evented format understood by
+        https://www.speedscope.app.
+
+        As passes are folded by name, their invocations are laid out
+        back-to-back within the parent, so the resulting timeline reflects the
+        accumulated time, not the actual order of execution.
+
+        Parameters
+        ----------
+        filename : str, optional
+            If provided, the profile is written to this file. Otherwise, it is
+            returned as a string.
+        """
+        frames = OrderedDict()
+        events = []
+
+        def _emit(record, start):
+            index = frames.setdefault(record.name, len(frames))
+            events.append({'type': 'O', 'frame': index, 'at': start})
+            at = start
+            for i in record.children.values():
+                at = _emit(i, at)
+            # Guard against clock resolution, children can't outlive the parent
+            end = max(start + record.time, at)
+            events.append({'type': 'C', 'frame': index, 'at': end})
+            return end
+
+        end = _emit(self.root, 0.)
+
+        obj = OrderedDict([
+            ('$schema', 'https://www.speedscope.app/file-format-schema.json'),
+            ('name', self.name),
+            ('exporter', 'devito'),
+            ('shared', {'frames': [{'name': i} for i in frames]}),
+            ('profiles', [OrderedDict([
+                ('type', 'evented'),
+                ('name', self.name),
+                ('unit', 'seconds'),
+                ('startValue', 0.),
+                ('endValue', end),
+                ('events', events)
+            ])])
+        ])
+
+        return self._dump(obj, filename)
+
+
 def create_profile(name):
     """Create a new Profiler."""
     if configuration['log-level'] in ['DEBUG', 'PERF'] and \
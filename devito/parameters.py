@@ -143,17 +143,27 @@ env_vars_mapper = {
     'DEVITO_ARCH': 'compiler',
     'DEVITO_PLATFORM': 'platform',
     'DEVITO_PROFILING': 'profiling',
+    'DEVITO_PROFILING_BUILD': 'profiling-build',
     'DEVITO_DEVELOP': 'develop-mode',
     'DEVITO_OPT': 'opt',
     'DEVITO_MPI': 'mpi',
+    'DEVITO_MPI_CODEC': 'mpi-codec',
     'DEVITO_TOPOLOGY': 'topology',
     'DEVITO_LANGUAGE': 'language',
     'DEVITO_AUTOTUNING': 'autotuning',
+    'DEVITO_AUTOTUNING_DB': 'autotuning-db',
+    'DEVITO_AUTOTUNING_DB_DIR': 'autotuning-db-dir',
+    'DEVITO_AUTOTUNING_REFINE': 'autotuning-refine',
     'DEVITO_LOGGING': 'log-level',
     'DEVITO_FIRST_TOUCH': 'first-touch',
     'DEVITO_JIT_BACKDOOR': 'jit-backdoor',
     'DEVITO_IGNORE_UNKNOWN_PARAMS': 'ignore-unknowns',
-    'DEVITO_SAFE_MATH': 'safe-math'
+    'DEVITO_SAFE_MATH': 'safe-math',
+    'DEVITO_OPCACHE': 'opcache',
+    'DEVITO_OPCACHE_DIR': 'opcache-dir',
+    'DEVITO_OPCACHE_MAXSIZE': 'opcache-maxsize',
+    'DEVITO_JIT_STORE': 'jit-store',
+    'DEVITO_JIT_STORE_MAXSIZE': 'jit-store-maxsize'
 }
 
 env_vars_deprecated = {
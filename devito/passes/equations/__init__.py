@@ -1 +1,2 @@
 from .linearity import *  # noqa
+from .sparse import *  # noqa
@@ -0,0 +1,29 @@
+from devito.operations.interpolators import Injection, UnevaluatedSparseOperation
+from devito.tools import timed_pass
+
+__all__ = ['color_injections', 'tabulate_interpolation']
+
+
+@timed_pass()
+def color_injections(expressions):
+    """
+    Turn the Injections into conflict-free Injections. The sparse points are
+    colored such that no two points of the same color inject into the same grid
+    point; the colors are then processed one at a time, and the sparse points of
+    a given color in parallel, without resorting to atomic increments. The
+    sparse points in colors too small to be worth a parallel loop, which arise
+    from clustered sparse points, still resort to atomic increments.
+    """
+    return [e._rebuild(coloring=True) if isinstance(e, Injection) else e
+            for e in expressions]
+
+
+@timed_pass()
+def tabulate_interpolation(expressions):
+    """
+    Turn the Interpolations and the Injections into their tabulated variant, in
+    which the positions and the interpolation weights of the sparse points are
+    computed once, at Operator application time, rather than at each time step.
+    """
+    return [e._rebuild(tables=True) if isinstance(e, UnevaluatedSparseOperation)
+            else e for e in expressions]
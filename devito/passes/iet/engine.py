@@ -9,7 +9,8 @@ from devito.ir.support import SymbolRegistry
 from devito.mpi.distributed import MPINeighborhood
 from devito.passes import needs_transfer
 from devito.symbolics import FieldFromComposite, FieldFromPointer
-from devito.tools import DAG, as_tuple, filter_ordered, sorted_priority, timed_pass
+from devito.tools import (DAG, as_tuple, count_nodes, filter_ordered, sorted_priority,
+                          timed_pass)
 from devito.types import (Array, Bundle, CompositeObject, Lock, IncrDimension,
                           Indirection, Pointer, SharedData, ThreadArray, Temp,
                           NPThreads, NThreadsBase, Wildcard)
@@ -172,13 +173,18 @@ class Graph:
         return mapper
 
 
+@count_nodes.register(Graph)
+def _(graph):
+    return count_nodes(list(graph.efuncs.values()))
+
+
 def iet_pass(func):
     if isinstance(func, tuple):
         assert len(func) == 2 and func[0] is iet_visit
-        call = lambda graph: graph.visit
+        call = lambda graph, *args, **kwargs: graph.visit(*args, **kwargs)
         func = func[1]
     else:
-        call = lambda graph: graph.apply
+        call = lambda graph, *args, **kwargs: graph.apply(*args, **kwargs)
 
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -195,11 +201,11 @@ def iet_pass(func):
         try:
             # Pure function case
             graph, = args
-            return maybe_timed(call(graph), func.__name__)(func, **kwargs)
+            return maybe_timed(call, func.__name__)(graph, func, **kwargs)
         except ValueError:
             # Instance method case
             self, graph = args
-            return maybe_timed(call(graph), func.__name__)(partial(func, self), **kwargs)
+            return maybe_timed(call, func.__name__)(graph, partial(func, self), **kwargs)
     return wrapper
 
 
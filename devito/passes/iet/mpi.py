@@ -11,7 +11,7 @@ from devito.mpi.halo_scheme import HaloScheme
 from devito.mpi.reduction_scheme import DistReduce
 from devito.mpi.routines import HaloExchangeBuilder, ReductionBuilder
 from devito.passes.iet.engine import iet_pass
-from devito.tools import generator
+from devito.tools import filter_ordered, generator
 
 __all__ = ['mpiize']
 
@@ -314,6 +314,7 @@ def make_halo_exchanges(iet, mpimode=None, **kwargs):
         mapper[hs] = heb.make(hs)
 
     efuncs = sync_heb.efuncs + user_heb.efuncs
+    headers = filter_ordered(sync_heb.headers + user_heb.headers)
     iet = Transformer(mapper, nested=True).visit(iet)
 
     # Must drop the PARALLEL tag from the Iterations within which halo
@@ -330,7 +331,7 @@ def make_halo_exchanges(iet, mpimode=None, **kwargs):
                 break
     iet = Transformer(mapper, nested=True).visit(iet)
 
-    return iet, {'includes': ['mpi.h'], 'efuncs': efuncs}
+    return iet, {'includes': ['mpi.h'], 'efuncs': efuncs, 'headers': headers}
 
 
 @iet_pass
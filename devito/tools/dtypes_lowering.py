@@ -151,8 +151,10 @@ def dtype_to_ctype(dtype):
 def dtype_to_mpitype(dtype):
     """Map numpy types to MPI datatypes."""
 
-    # Resolve vector dtype if necessary
-    dtype = dtypes_vector_mapper.get_base_dtype(dtype)
+    # Resolve vector dtype if necessary; scalar dtypes with no vector
+    # counterpart (e.g., the `np.uint16` halo buffers of the bfloat16 codec)
+    # are taken as is
+    dtype = dtypes_vector_mapper.get_base_dtype(dtype, dtype)
 
     return {
         np.ubyte: 'MPI_BYTE',
@@ -1,9 +1,116 @@
 from collections import OrderedDict, defaultdict
-from functools import partial
+from functools import partial, singledispatch
 from threading import get_ident
 from time import time
+import tracemalloc
 
-__all__ = ['timed_pass', 'timed_region']
+__all__ = ['timed_pass', 'timed_region', 'PassRecord', 'count_nodes']
+
+
+@singledispatch
+def count_nodes(obj):
+    """
+    The number of IR nodes (Clusters, IET nodes, ...) in `obj`, or None if
+    `obj` is not an IR object. The IR modules register their own types.
+    """
+    return None
+
+
+@count_nodes.register(list)
+@count_nodes.register(tuple)
+def _(obj):
+    counts = [count_nodes(i) for i in obj]
+    if None in counts:
+        return None
+    return sum(counts)
+
+
+def _accumulate(v0, v1):
+    if v1 is None:
+        return v0
+    return (v0 or 0) + v1
+
+
+class PassRecord:
+
+    """
+    A node in the compile-time profile recorded within a
+    `timed_region(..., profile=True)`.
+
+    Multiple invocations of the same pass within the same parent (e.g., a
+    Cluster pass applied to each Cluster in turn) are folded into a single
+    PassRecord.
+
+    Parameters
+    ----------
+    name : str
+        The name of the pass.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+        self.calls = 0
+        self.time = 0.
+        self.memory = None
+        """Peak Python memory, in bytes, allocated on top of the entry level."""
+        self.nodes_in = None
+        self.nodes_out = None
+
+        self.children = OrderedDict()
+
+    def __repr__(self):
+        return "PassRecord<%s, %.3f s, %d calls>" % (self.name, self.time, self.calls)
+
+    def update(self, time, memory=None, nodes_in=None, nodes_out=None):
+        self.calls += 1
+        self.time += time
+        if memory is not None:
+            self.memory = max(self.memory or 0, memory)
+        self.nodes_in = _accumulate(self.nodes_in, nodes_in)
+        self.nodes_out = _accumulate(self.nodes_out, nodes_out)
+
+    def merge(self, other):
+        """
+        Fold `other`, a PassRecord for the same pass, into `self`.
+        """
+        self.calls += other.calls
+        self.time += other.time
+        if other.memory is not None:
+            self.memory = max(self.memory or 0, other.memory)
+        self.nodes_in = _accumulate(self.nodes_in, other.nodes_in)
+        self.nodes_out = _accumulate(self.nodes_out, other.nodes_out)
+
+        for k, v in other.children.items():
+            self.children.setdefault(k, PassRecord(k)).merge(v)
+
+
+class _ProfileFrame:
+
+    """
+    The bookkeeping of a `timed_pass` in flight within a profiled region.
+    """
+
+    def __init__(self, record):
+        self.record = record
+
+        if tracemalloc.is_tracing():
+            self.base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        else:
+            self.base = None
+        self.peak = self.base
+
+    def suspend(self):
+        # Called before a nested pass resets the tracemalloc peak
+        if self.base is not None:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+
+    def close(self):
+        if self.base is None:
+            return None
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        return self.peak - self.base
 
 
 class timed_pass:
@@ -24,6 +131,12 @@ class timed_pass:
     A ``thread_id -> stack`` mapper, to keep track of nested `timed_pass`.
     """
 
+    profiles = {}
+    """
+    A ``thread_id -> stack`` mapper of in-flight `_ProfileFrame`s. Only
+    populated within a `timed_region(..., profile=True)`.
+    """
+
     def __new__(cls, *args, name=None):
         if args:
             # The typical use case:
@@ -72,10 +185,30 @@ class timed_pass:
         stack = timed_pass.stack[tid]
         stack.append(frame)
 
+        profile = timed_pass.profiles.get(tid)
+        if profile is not None:
+            parent = profile[-1]
+            parent.suspend()
+            record = parent.record.children.setdefault(frame, PassRecord(frame))
+            nodes_in = self._count_input(args)
+            profile.append(_ProfileFrame(record))
+
         tic = time()
         retval = self.func(*args, **kwargs)
         toc = time()
 
+        if profile is not None:
+            child = profile.pop()
+            memory = child.close()
+            if memory is not None:
+                parent.peak = max(parent.peak, child.peak)
+            if retval is None:
+                # In-place transformation (e.g., Graph.apply)
+                nodes_out = self._count_input(args)
+            else:
+                nodes_out = count_nodes(retval)
+            record.update(toc - tic, memory, nodes_in, nodes_out)
+
         for f in stack:
             timings = timings.setdefault(f, {})
         if 'total' in timings:
@@ -87,6 +220,16 @@ class timed_pass:
 
         return retval
 
+    @classmethod
+    def _count_input(cls, args):
+        # The first argument that is an IR object, if any; e.g., methods and
+        # Cluster passes bound to an object take `self` first
+        for i in args:
+            v = count_nodes(i)
+            if v is not None:
+                return v
+        return None
+
     def __repr__(self):
         """Return the function's docstring."""
         return self.func.__doc__
@@ -100,22 +243,44 @@ class timed_region:
 
     """
     A context manager for code regions in which the `timed_pass` decorator is used.
+
+    Parameters
+    ----------
+    name : str
+        The name of the region.
+    profile : bool, optional
+        If True, also record a tree of PassRecords, available as `self.profile`
+        upon exit, with wall time, peak Python memory (via `tracemalloc`) and
+        IR node counts before and after each pass. Defaults to False.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, profile=False):
         self.name = name
+        self.profile = PassRecord(name) if profile else None
 
     def __enter__(self):
         if isinstance(timed_pass.timings.get(get_ident()), dict):
             raise ValueError("Cannot nest `timed_region`")
         self.timings = OrderedDict()
         timed_pass.timings[get_ident()] = self.timings
+        if self.profile is not None:
+            # NOTE: `tracemalloc` is process-wide; if the user is tracing
+            # already, we piggyback on it and leave it running upon exit
+            self._tracemalloc = not tracemalloc.is_tracing()
+            if self._tracemalloc:
+                tracemalloc.start()
+            timed_pass.profiles[get_ident()] = [_ProfileFrame(self.profile)]
         self.tic = time()
         return self
 
     def __exit__(self, *args):
         self.timings[self.name] = time() - self.tic
         del timed_pass.timings[get_ident()]
+        if self.profile is not None:
+            frame = timed_pass.profiles.pop(get_ident())[0]
+            self.profile.update(self.timings[self.name], frame.close())
+            if self._tracemalloc:
+                tracemalloc.stop()
         try:
             # Necessary clean up should one be constructing an Operator within
             # a try-except, with the Operator construction failing
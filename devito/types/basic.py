@@ -868,14 +868,16 @@ class AbstractFunction(sympy.Function, Basic, Pickable, Evaluable):
         # Extract the `indices`, as perhaps they're explicitly provided
         dimensions, indices = cls.__indices_setup__(*args, **kwargs)
 
-        # If it's an alias or simply has a different name, ignore `function`.
+        # If it's a new alias or simply has a different name, ignore `function`.
         # These cases imply the construction of a new AbstractFunction off
         # an existing one! This relieves the pressure on the caller by not
-        # requiring `function=None` explicitly at rebuild
+        # requiring `function=None` explicitly at rebuild. Objects derived
+        # from an alias (e.g., via .subs), instead, keep a reference to it
         name = kwargs.get('name')
         alias = kwargs.get('alias')
         function = kwargs.get('function')
-        if alias or (function and function.name != name):
+        if (alias and not (function and function.alias)) or \
+           (function and function.name != name):
             function = kwargs['function'] = None
 
         # If same name/indices and `function` isn't None, then it's
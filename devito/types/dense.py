@@ -713,6 +713,16 @@ class DiscreteFunction(AbstractFunction, ArgProvider, Differentiable):
 
         return dataobj
 
+    def _C_update_dataobj(self, dataobj, data):
+        """
+        Make a ctypes object produced by ``_C_make_dataobj`` point to ``data``,
+        which must have the same shape and type as the data it replaces.
+        """
+        dataobj._obj.data = data.ctypes.data_as(c_restrict_void_p)
+        dataobj._obj.underlying_array = data
+
+        return dataobj
+
     def _C_as_ndarray(self, dataobj):
         """Cast the data carried by a DiscreteFunction dataobj to an ndarray."""
         shape = tuple(dataobj._obj.size[i] for i in range(self.ndim))
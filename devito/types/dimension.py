@@ -19,7 +19,7 @@ __all__ = ['Dimension', 'SpaceDimension', 'TimeDimension', 'DefaultDimension',
            'CustomDimension', 'SteppingDimension', 'SubDimension',
            'MultiSubDimension', 'ConditionalDimension', 'ModuloDimension',
            'IncrDimension', 'BlockDimension', 'StencilDimension',
-           'VirtualDimension', 'Spacing', 'dimensions']
+           'VirtualDimension', 'ColorDimension', 'Spacing', 'dimensions']
 
 
 Thickness = namedtuple('Thickness', 'left right')
@@ -113,6 +113,7 @@ class Dimension(ArgProvider):
     is_Incr = False
     is_Block = False
     is_Virtual = False
+    is_Color = False
 
     # Prioritize self's __add__ and __sub__ to construct AffineIndexAccessFunction
     _op_priority = sympy.Expr._op_priority + 1.
@@ -1707,6 +1708,30 @@ class SteppingDimension(DerivedDimension):
         return values
 
 
+class ColorDimension(BasicDimension):
+
+    """
+    Symbol defining the iteration space over the colors of a coloring of the
+    points of a sparse Dimension, such that the points of the same color may
+    be processed in parallel without write conflicts.
+
+    Parameters
+    ----------
+    name : str
+        Name of the dimension.
+
+    Notes
+    -----
+    The points of a given color are iterated over by a Dimension whose bounds
+    depend on the ColorDimension, e.g. a CustomDimension ranging over
+    `offsets[c]` to `offsets[c + 1] - 1`. The compiler never parallelizes a
+    ColorDimension. Instead, the increments nested within such a Dimension are
+    not considered a reduction along it.
+    """
+
+    is_Color = True
+
+
 # *** Utils
 
 
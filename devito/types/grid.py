@@ -8,7 +8,7 @@ from sympy import prod
 from devito import configuration
 from devito.data import LEFT, RIGHT
 from devito.logger import warning
-from devito.mpi import Distributor, MPI
+from devito.mpi import AutoTopology, Distributor, MPI
 from devito.tools import ReducerMap, as_tuple
 from devito.types.args import ArgProvider
 from devito.types.basic import Scalar
@@ -87,6 +87,17 @@ class Grid(CartesianDiscretization, ArgProvider):
     comm : MPI communicator, optional
         The set of processes over which the grid is distributed. Only relevant in
         case of MPI execution.
+    topology : tuple of ints or AutoTopology, optional
+        The number of MPI processes along each Dimension. With an AutoTopology,
+        or `'auto'`, the topology is selected so as to minimize the predicted
+        halo exchange cost. Only relevant in case of MPI execution.
+    weights : tuple or callable, optional
+        The estimated cost of the points along each Dimension, to decompose the
+        grid into chunks of balanced cost rather than of balanced size. Either
+        a tuple with one entry per Dimension, each entry being None or an
+        array_like of the same size as the Dimension, or a callable
+        `weights(dimension, indices)` returning such an entry. Only relevant in
+        case of MPI execution. See also `devito.mpi.weights_from_summary`.
 
     Examples
     --------
@@ -138,7 +149,7 @@ class Grid(CartesianDiscretization, ArgProvider):
 
     def __init__(self, shape, extent=None, origin=None, dimensions=None,
                  time_dimension=None, dtype=np.float32, subdomains=None,
-                 comm=None, topology=None):
+                 comm=None, topology=None, weights=None):
         shape = as_tuple(shape)
 
         # Create or pull the SpaceDimensions
@@ -166,7 +177,9 @@ class Grid(CartesianDiscretization, ArgProvider):
         # by all Functions defined on this Grid
         topology = topology or configuration['topology']
         if topology:
-            if len(topology) == len(self.shape):
+            if topology == 'auto' or isinstance(topology, AutoTopology):
+                self._topology = topology
+            elif len(topology) == len(self.shape):
                 self._topology = topology
             else:
                 warning("Ignoring the provided topology `%s` as it "
@@ -175,7 +188,8 @@ class Grid(CartesianDiscretization, ArgProvider):
                 self._topology = None
         else:
             self._topology = None
-        self._distributor = Distributor(shape, dimensions, comm, self._topology)
+        self._distributor = Distributor(shape, dimensions, comm, self._topology,
+                                        weights)
 
         # The physical extent
         self._extent = as_tuple(extent or tuple(1. for _ in self.shape))
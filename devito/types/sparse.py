@@ -1,4 +1,5 @@
 from collections import OrderedDict
+from functools import wraps
 from itertools import product
 
 import sympy
@@ -10,7 +11,7 @@ from devito.mpi import MPI, SparseDistributor
 from devito.operations import (LinearInterpolator, PrecomputedInterpolator,
                                SincInterpolator)
 from devito.symbolics import indexify, retrieve_function_carriers
-from devito.tools import (ReducerMap, as_tuple, flatten, prod, filter_ordered,
+from devito.tools import (ReducerMap, as_tuple, prod, filter_ordered,
                           is_integer, dtype_to_mpidtype)
 from devito.types.dense import DiscreteFunction, SubFunction
 from devito.types.dimension import (Dimension, ConditionalDimension, DefaultDimension,
@@ -52,6 +53,13 @@ class AbstractSparseFunction(DiscreteFunction):
     _sub_functions = ()
     """SubFunctions encapsulated within this AbstractSparseFunction."""
 
+    _dist_color_min_points = 32
+    """
+    The colors holding fewer sparse points than this are dropped, and their
+    sparse points injected through atomic increments instead, as a parallel
+    loop over so few points doesn't pay off.
+    """
+
     __rkwargs__ = (DiscreteFunction.__rkwargs__ +
                    ('dimensions', 'npoint_global', 'space_order'))
 
@@ -60,6 +68,10 @@ class AbstractSparseFunction(DiscreteFunction):
         self._npoint = kwargs.get('npoint', kwargs.get('npoint_global'))
         self._space_order = kwargs.get('space_order', 0)
 
+        # The MPI metadata, as computed for a given position of the sparse points
+        self._dist_cache = {}
+        self._dist_cache_key = None
+
         # Dynamically add derivative short-cuts
         self._fd = self.__fd_setup__()
 
@@ -243,7 +255,47 @@ class AbstractSparseFunction(DiscreteFunction):
         return np.stack([minmax(self._coords_indices + s) for s in self._point_support],
                         axis=2)
 
+    def _dist_cached(func):
+        """
+        Cache the MPI metadata computed by `func` until the sparse points move,
+        as detected by `_dist_sync`.
+        """
+        @wraps(func)
+        def wrapper(self, *args):
+            key = (func.__name__,) + args
+            try:
+                return self._dist_cache[key]
+            except KeyError:
+                ret = self._dist_cache[key] = func(self, *args)
+                return ret
+        return wrapper
+
+    def _dist_sync(self):
+        """
+        Drop the cached MPI metadata if the sparse points have moved on any of
+        the MPI ranks, that is if the values of any of the SubFunctions differ
+        from those the metadata was computed for. The values rather than the
+        data accessors are checked, as the SubFunctions may be written to
+        through views held by the user. Under MPI, this is a collective
+        operation, which ensures that all MPI ranks agree on whether the
+        metadata, and in particular the collectively computed point counts,
+        must be rebuilt.
+        """
+        sfuncs = [getattr(self, i) for i in self._sub_functions]
+        values = [i.data_ro_domain._local for i in sfuncs if i is not None]
+
+        snapshot = self._dist_cache_key
+        stale = snapshot is None or \
+            any(not np.array_equal(i, j) for i, j in zip(values, snapshot))
+        if self._distributor.nprocs > 1:
+            stale = self._comm.allreduce(stale, op=MPI.LOR)
+
+        if stale:
+            self._dist_cache = {}
+            self._dist_cache_key = [np.array(i) for i in values]
+
     @property
+    @_dist_cached
     def _dist_datamap(self):
         """
         Mapper ``M : MPI rank -> required sparse data``.
@@ -394,7 +446,8 @@ class AbstractSparseFunction(DiscreteFunction):
                      if d is not self._sparse_dim)
         return ret
 
-    def _dist_scatter_mask(self, dmap=None):
+    @_dist_cached
+    def _dist_scatter_mask(self):
         """
         A mask to index into ``self.data``, which creates a new data array that
         logically contains N consecutive groups of sparse data values, where N
@@ -402,18 +455,19 @@ class AbstractSparseFunction(DiscreteFunction):
         values accessible by the i-th MPI rank.  Thus, sparse data values along
         the boundary of two or more MPI ranks are duplicated.
         """
-        dmap = dmap or self._dist_datamap
-        mask = np.array(flatten(dmap[i] for i in sorted(dmap)), dtype=int)
+        dmap = self._dist_datamap
+        mask = np.concatenate([[]] + [dmap[i] for i in sorted(dmap)]).astype(int)
         ret = [slice(None) for _ in range(self.ndim)]
         ret[self._sparse_position] = mask
         return tuple(ret)
 
-    def _dist_count(self, dmap=None):
+    @_dist_cached
+    def _dist_count(self):
         """
         A 2-tuple of comm-sized iterables, which tells how many sparse points
         is this MPI rank expected to send/receive to/from each other MPI rank.
         """
-        dmap = dmap or self._dist_datamap
+        dmap = self._dist_datamap
         comm = self._comm
 
         ssparse = np.array([len(dmap.get(i, [])) for i in range(comm.size)], dtype=int)
@@ -422,12 +476,13 @@ class AbstractSparseFunction(DiscreteFunction):
 
         return ssparse, rsparse
 
-    def _dist_alltoall(self, dmap=None):
+    @_dist_cached
+    def _dist_alltoall(self):
         """
         The metadata necessary to perform an ``MPI_Alltoallv`` distributing the
         sparse data values across the MPI ranks needing them.
         """
-        ssparse, rsparse = self._dist_count(dmap=dmap)
+        ssparse, rsparse = self._dist_count()
 
         # Per-rank shape of send/recv data
         sshape = []
@@ -463,13 +518,13 @@ class AbstractSparseFunction(DiscreteFunction):
 
         return sshape, scount, sdisp, rshape, rcount, rdisp
 
-    def _dist_subfunc_alltoall(self, subfunc, dmap=None):
+    @_dist_cached
+    def _dist_subfunc_alltoall(self, subfunc):
         """
         The metadata necessary to perform an ``MPI_Alltoallv`` distributing
         self's SubFunction values across the MPI ranks needing them.
         """
-        dmap = dmap or self._dist_datamap
-        ssparse, rsparse = self._dist_count(dmap=dmap)
+        ssparse, rsparse = self._dist_count()
 
         # Per-rank shape of send/recv `coordinates`
         shape = subfunc.shape[1:]
@@ -505,16 +560,15 @@ class AbstractSparseFunction(DiscreteFunction):
         if self._distributor.nprocs == 1:
             return data
 
-        # Compute dist map only once
-        dmap = self._dist_datamap
-        mask = self._dist_scatter_mask(dmap=dmap)
+        self._dist_sync()
+        mask = self._dist_scatter_mask()
 
         # Pack sparse data values so that they can be sent out via an Alltoallv
         data = data[mask]
         data = np.ascontiguousarray(np.transpose(data, self._dist_reorder_mask))
 
         # Send out the sparse point values
-        _, scount, sdisp, rshape, rcount, rdisp = self._dist_alltoall(dmap=dmap)
+        _, scount, sdisp, rshape, rcount, rdisp = self._dist_alltoall()
         scattered = np.empty(shape=rshape, dtype=self.dtype)
         self._comm.Alltoallv([data, scount, sdisp, self._mpitype],
                              [scattered, rcount, rdisp, self._mpitype])
@@ -527,16 +581,24 @@ class AbstractSparseFunction(DiscreteFunction):
         if self._distributor.nprocs == 1:
             return {subfunc: subfunc.data}
 
-        # Compute dist map only once
-        dmap = self._dist_datamap
-        mask = self._dist_scatter_mask(dmap=dmap)
+        self._dist_sync()
+
+        # A copy, as the Operator may write to it
+        return {subfunc: self._dist_subfunc_values(subfunc).copy()}
+
+    @_dist_cached
+    def _dist_subfunc_values(self, subfunc):
+        """
+        The SubFunction values required by the calling MPI rank, translated
+        into local values.
+        """
+        mask = self._dist_scatter_mask()
 
         # Pack (reordered) SubFuncion values so that they can be sent out via an Alltoallv
-        sfuncd = subfunc.data._local[mask[self._sparse_position]]
+        sfuncd = subfunc.data_ro_domain._local[mask[self._sparse_position]]
 
         # Send out the sparse point SubFuncion
-        _, scount, sdisp, rshape, rcount, rdisp = \
-            self._dist_subfunc_alltoall(subfunc, dmap=dmap)
+        _, scount, sdisp, rshape, rcount, rdisp = self._dist_subfunc_alltoall(subfunc)
         scattered = np.empty(shape=rshape, dtype=subfunc.dtype)
         self._comm.Alltoallv([sfuncd, scount, sdisp, self._smpitype[subfunc]],
                              [scattered, rcount, rdisp, self._smpitype[subfunc]])
@@ -545,26 +607,115 @@ class AbstractSparseFunction(DiscreteFunction):
         # Translate global SubFuncion values into local SubFuncion values
         if self.dist_origin[subfunc] is not None:
             sfuncd = sfuncd - np.array(self.dist_origin[subfunc], dtype=subfunc.dtype)
-        return {subfunc: sfuncd}
+        return sfuncd
+
+    def _dist_positions(self):
+        """
+        The positions, in grid point units, of the sparse points held by the
+        calling MPI rank, relative to the origin of the rank's local domain.
+        These are integers if the sparse points are given as grid points.
+        """
+        gridpoints = getattr(self, '_gridpoints', None)
+        subfunc = self.coordinates if gridpoints is None else gridpoints
+
+        if self._distributor.nprocs == 1:
+            values = subfunc.data_ro_domain._local.view(np.ndarray)
+        else:
+            values = self._dist_subfunc_values(subfunc)
+
+        if subfunc is gridpoints:
+            return values
+        else:
+            return (values - np.array(self.grid.origin)) / np.array(self.grid.spacing)
+
+    def _dist_interp_tables(self, interpolator=None):
+        """
+        The positions and the interpolation weights of the sparse points held by
+        the calling MPI rank, as tabulated by `interpolator`, which defaults to
+        self's interpolator.
+        """
+        self._dist_sync()
+        return self._dist_tabulation(interpolator or self.interpolator)
+
+    @_dist_cached
+    def _dist_tabulation(self, interpolator):
+        return interpolator._tabulate(self._dist_positions())
+
+    def _dist_colors(self, r=None):
+        """
+        The coloring of the sparse points held by the calling MPI rank, such
+        that no two sparse points of the same color inject into the same grid
+        point through an operator of radius `r`, which defaults to self's
+        radius. This is a dict with:
+
+            * `perm`, the sparse points sorted by color;
+            * `offsets`, the offsets of each color within `perm`, followed by
+              those of the uncolored sparse points and of the end of `perm`.
+        """
+        self._dist_sync()
+        return self._dist_coloring(r or self.r)
+
+    @_dist_cached
+    def _dist_coloring(self, r):
+        """
+        Color the sparse points by binning them into cells of `2*r + 1` grid
+        points per Dimension. Two sparse points share a color if they fall within
+        the same slot of two cells whose indices have the same parity along all
+        Dimensions; hence, along at least one Dimension, they are at least
+        `2*r + 2` grid points apart, while their supports only overlap below
+        `2*r`. The extra margin absorbs an off-by-one rounding discrepancy, in
+        either direction and for both sparse points, between the positions
+        computed here and in C-land, e.g. in single precision.
+        """
+        positions = np.floor(self._dist_positions()).astype(np.int64)
+        npoint, ndim = positions.shape
+        if npoint == 0:
+            return {'perm': np.zeros(0, dtype=np.int32),
+                    'offsets': np.zeros(2, dtype=np.int32)}
+
+        cells = np.floor_divide(positions, 2*r + 1)
+        parity = np.mod(cells, 2) @ (2**np.arange(ndim))
+
+        # The slot of each sparse point within its cell
+        _, inverse, counts = np.unique(cells, axis=0, return_inverse=True,
+                                       return_counts=True)
+        order = np.argsort(inverse.ravel(), kind='stable')
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        slots = np.empty(npoint, dtype=np.int64)
+        slots[order] = np.arange(npoint) - starts
+
+        colors = slots*2**ndim + parity
+
+        # Drop the sparsely populated colors, which arise from clustered sparse
+        # points, in favour of a trailing group of uncolored sparse points
+        counts = np.bincount(colors)
+        kept = np.flatnonzero(counts >= self._dist_color_min_points)
+        mapper = np.full(counts.size, kept.size)
+        mapper[kept] = np.arange(kept.size)
+        colors = mapper[colors]
+
+        perm = np.argsort(colors, kind='stable')
+        offsets = np.cumsum(np.bincount(colors, minlength=kept.size + 1))
+        offsets = np.concatenate([[0], offsets])
+
+        return {'perm': perm.astype(np.int32), 'offsets': offsets.astype(np.int32)}
 
     def _dist_data_gather(self, data):
         # If not using MPI, don't waste time
         if self._distributor.nprocs == 1:
             return
 
-        # Compute dist map only once
         try:
             data = self._C_as_ndarray(data)
         except AttributeError:
             pass
-        dmap = self._dist_datamap
-        mask = self._dist_scatter_mask(dmap=dmap)
+        mask = self._dist_scatter_mask()
 
         # Pack sparse data values so that they can be sent out via an Alltoallv
         data = np.ascontiguousarray(np.transpose(data, self._dist_reorder_mask))
 
         # Send back the sparse point values
-        sshape, scount, sdisp, rshape, rcount, rdisp = self._dist_alltoall(dmap=dmap)
+        sshape, scount, sdisp, rshape, rcount, rdisp = self._dist_alltoall()
         gathered = np.empty(shape=sshape, dtype=self.dtype)
 
         self._comm.Alltoallv([data, rcount, rdisp, self._mpitype],
@@ -583,17 +734,20 @@ class AbstractSparseFunction(DiscreteFunction):
         if self._distributor.nprocs == 1:
             return
 
-        # Compute dist map only once
-        dmap = self._dist_datamap
-        mask = self._dist_scatter_mask(dmap=dmap)
+        # Nothing to send back unless the Operator has written to the SubFunction
+        # on some MPI rank
+        changed = not np.array_equal(sfuncd, self._dist_subfunc_values(subfunc))
+        if not self._comm.allreduce(changed, op=MPI.LOR):
+            return
+
+        mask = self._dist_scatter_mask()
 
         # Pack (reordered) SubFuncion values so that they can be sent out via an Alltoallv
         if self.dist_origin[subfunc] is not None:
             sfuncd = sfuncd + np.array(self.dist_origin[subfunc], dtype=subfunc.dtype)
 
         # Send out the sparse point SubFuncion values
-        sshape, scount, sdisp, _, rcount, rdisp = \
-            self._dist_subfunc_alltoall(subfunc, dmap=dmap)
+        sshape, scount, sdisp, _, rcount, rdisp = self._dist_subfunc_alltoall(subfunc)
         gathered = np.empty(shape=sshape, dtype=subfunc.dtype)
         self._comm.Alltoallv([sfuncd, rcount, rdisp, self._smpitype[subfunc]],
                              [gathered, scount, sdisp, self._smpitype[subfunc]])
@@ -872,15 +1026,6 @@ class SparseFunction(AbstractSparseFunction):
         mapper = {self._sparse_dim: self._distributor.decomposition[self._sparse_dim]}
         return tuple(mapper.get(d) for d in self.dimensions)
 
-    def _arg_defaults(self, alias=None):
-        defaults = super()._arg_defaults(alias=alias)
-
-        key = alias or self
-        coords = defaults.get(key.coordinates.name, key.coordinates.data)
-        defaults.update(key.interpolator._arg_defaults(coords=coords,
-                                                       sfunc=key))
-        return defaults
-
 
 class SparseTimeFunction(AbstractSparseTimeFunction, SparseFunction):
     """
@@ -33,7 +33,7 @@ def freesurface(model, eq):
     # Antisymmetric mirror at negative indices
     # TODO: Make a proper "mirror_indices" tool function
     for f in funcs:
-        zind = f.indices[-1]
+        zind = f.indices[z]
         if (zind - z).as_coeff_Mul()[0] < 0:
             s = sign(zind.subs({z: zfs, z.spacing: 1}))
             mapper.update({f: s * f.subs({zind: INT(abs(zind))})})
@@ -107,6 +107,39 @@ def iso_stencil(field, model, kernel, **kwargs):
     return eqns
 
 
+def wavefield(model, geometry, space_order, save=False, name='u'):
+    """
+    Create a wavefield, with an additional Dimension iterating over the
+    shots if these are batched in `geometry`.
+
+    Parameters
+    ----------
+    model : Model
+        Object containing the physical parameters.
+    geometry : AcquisitionGeometry
+        Geometry object that contains the source and receivers.
+    space_order : int
+        Space discretization order.
+    save : bool, optional
+        Whether or not to save the entire (unrolled) wavefield.
+    name : str, optional
+        Name of the wavefield. Defaults to `u`.
+    """
+    grid = model.grid
+    save = geometry.nt if save else None
+    if not geometry.batched:
+        return TimeFunction(name=name, grid=grid, save=save, time_order=2,
+                            space_order=space_order)
+
+    # The shots are innermost, hence the model parameters are reused
+    # across the shots
+    time_dim = grid.time_dim if save else grid.stepping_dim
+    dimensions = (time_dim,) + grid.dimensions + (geometry.shot_dim,)
+    shape = (save or 3,) + grid.shape + (geometry.nshots,)
+    return TimeFunction(name=name, grid=grid, dimensions=dimensions, shape=shape,
+                        save=save, time_order=2, space_order=space_order)
+
+
 def ForwardOperator(model, geometry, space_order=4,
                     save=False, kernel='OT2', **kwargs):
     """
@@ -130,20 +163,28 @@ def ForwardOperator(model, geometry, space_order=4,
     m = model.m
 
     # Create symbols for forward wavefield, source and receivers
-    u = TimeFunction(name='u', grid=model.grid,
-                     save=geometry.nt if save else None,
-                     time_order=2, space_order=space_order)
+    u = wavefield(model, geometry, space_order, save=save)
     src = geometry.src
     rec = geometry.rec
 
     s = model.grid.stepping_dim.spacing
     eqn = iso_stencil(u, model, kernel)
 
+    # With batched shots, each source (receiver) only injects into
+    # (interpolates from) the wavefield of its own shot
+    if geometry.batched:
+        shot = geometry.shot_dim
+        usrc = u.forward.subs(shot, geometry.shot_index(src))
+        urec = u.subs(shot, geometry.shot_index(rec))
+    else:
+        usrc = u.forward
+        urec = u
+
     # Construct expression to inject source values
-    src_term = src.inject(field=u.forward, expr=src * s**2 / m)
+    src_term = src.inject(field=usrc, expr=src * s**2 / m)
 
     # Create interpolation expression for receivers
-    rec_term = rec.interpolate(expr=u)
+    rec_term = rec.interpolate(expr=urec)
 
     # Substitute spacing terms to reduce flops
     return Operator(eqn + src_term + rec_term, subs=model.spacing_map,
@@ -167,6 +208,9 @@ def AdjointOperator(model, geometry, space_order=4,
     kernel : str, optional
         Type of discretization, 'OT2' or 'OT4'.
     """
+    if geometry.batched:
+        raise NotImplementedError("Batched shots are only supported by "
+                                  "ForwardOperator")
     m = model.m
 
     v = TimeFunction(name='v', grid=model.grid, save=None,
@@ -207,6 +251,9 @@ def GradientOperator(model, geometry, space_order=4, save=True,
     kernel : str, optional
         Type of discretization, centered or shifted.
     """
+    if geometry.batched:
+        raise NotImplementedError("Batched shots are only supported by "
+                                  "ForwardOperator")
     m = model.m
 
     # Gradient symbol and wavefield symbols
@@ -249,6 +296,9 @@ def BornOperator(model, geometry, space_order=4,
     kernel : str, optional
         Type of discretization, centered or shifted.
     """
+    if geometry.batched:
+        raise NotImplementedError("Batched shots are only supported by "
+                                  "ForwardOperator")
     m = model.m
 
     # Create source and receiver symbols
@@ -1,11 +1,13 @@
-from devito import Function, TimeFunction, DevitoCheckpoint, CheckpointOperator, Revolver
+from devito import (Function, TimeFunction, DevitoCheckpoint, CheckpointOperator,
+                    Revolver)
 from devito.tools import memoized_meth
+from examples.seismic import PrecompileMixin
 from examples.seismic.acoustic.operators import (
-    ForwardOperator, AdjointOperator, GradientOperator, BornOperator
+    ForwardOperator, AdjointOperator, GradientOperator, BornOperator, wavefield
 )
 
 
-class AcousticWaveSolver:
+class AcousticWaveSolver(PrecompileMixin):
     """
     Solver object that provides operators for seismic inversion problems
     and encapsulates the time and space discretization for a given problem
@@ -71,6 +73,11 @@ class AcousticWaveSolver:
                             kernel=self.kernel, space_order=self.space_order,
                             **self._kwargs)
 
+    def _precompiled(self, save):
+        """The forward, adjoint, gradient and Born Operators."""
+        return [self.op_fwd(save), self.op_adj(), self.op_grad(),
+                self.op_born()]
+
     def forward(self, src=None, rec=None, u=None, model=None, save=None, **kwargs):
         """
         Forward modelling function that creates the necessary
@@ -94,6 +101,13 @@ class AcousticWaveSolver:
         Returns
         -------
         Receiver, wavefield and performance summary
+
+        Notes
+        -----
+        If the geometry batches multiple shots, these are all modelled by a
+        single Operator run. The wavefield then has a trailing shot Dimension,
+        while the traces of a given shot are retrieved via
+        `geometry.shot_record(rec, shot)`.
         """
         # Source term is read-only, so re-use the default
         src = src or self.geometry.src
@@ -101,9 +115,7 @@ class AcousticWaveSolver:
         rec = rec or self.geometry.rec
 
         # Create the forward wavefield if not provided
-        u = u or TimeFunction(name='u', grid=self.model.grid,
-                              save=self.geometry.nt if save else None,
-                              time_order=2, space_order=self.space_order)
+        u = u or wavefield(self.model, self.geometry, self.space_order, save=save)
 
         model = model or self.model
         # Pick vp from model unless explicitly provided
@@ -1,10 +1,11 @@
 from devito.tools import memoized_meth
 from devito import VectorTimeFunction, TensorTimeFunction
 
+from examples.seismic import PrecompileMixin
 from examples.seismic.elastic.operators import ForwardOperator
 
 
-class ElasticWaveSolver:
+class ElasticWaveSolver(PrecompileMixin):
     """
     Solver object that provides operators for seismic inversion problems
     and encapsulates the time and space discretization for a given problem
@@ -39,6 +40,10 @@ class ElasticWaveSolver:
         return ForwardOperator(self.model, save=save, geometry=self.geometry,
                                space_order=self.space_order, **self._kwargs)
 
+    def _precompiled(self, save):
+        """The forward Operator."""
+        return [self.op_fwd(save)]
+
     def forward(self, src=None, rec1=None, rec2=None, v=None, tau=None,
                 model=None, save=None, **kwargs):
         """
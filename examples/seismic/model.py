@@ -6,7 +6,8 @@ except:
     pass
 
 from devito import (Grid, SubDomain, Function, Constant, warning,
-                    SubDimension, Eq, Inc, Operator, div, sin, Abs)
+                    SubDimension, Eq, Inc, Operator, div, sin, Abs, AutoTopology,
+                    configuration)
 from devito.builtins import initialize_function, gaussian_smooth, mmax, mmin
 from devito.tools import as_tuple
 
@@ -94,7 +95,7 @@ class GenericModel:
     """
     def __init__(self, origin, spacing, shape, space_order, nbl=20,
                  dtype=np.float32, subdomains=(), bcs="damp", grid=None,
-                 fs=False):
+                 fs=False, weights=None):
         self.shape = shape
         self.space_order = space_order
         self.nbl = int(nbl)
@@ -118,8 +119,14 @@ class GenericModel:
         if grid is None:
             # Physical extent is calculated per cell, so shape - 1
             extent = tuple(np.array(spacing) * (shape_pml - 1))
+            # An automatic topology may account for the actual halo width
+            if configuration['topology'] == 'auto':
+                topology = AutoTopology(space_order)
+            else:
+                topology = None
             self.grid = Grid(extent=extent, shape=shape_pml, origin=origin_pml,
-                             dtype=dtype, subdomains=subdomains)
+                             dtype=dtype, subdomains=subdomains, weights=weights,
+                             topology=topology)
         else:
             self.grid = grid
 
@@ -267,6 +274,9 @@ class SeismicModel(GenericModel):
         P-wave attenuation.
     qs : array_like or float
         S-wave attenuation.
+    weights : tuple or callable, optional
+        The estimated cost of the grid points, e.g. higher in the absorbing
+        layers, to balance the MPI domain decomposition. See `Grid.__doc__`.
     """
     _known_parameters = ['vp', 'damp', 'vs', 'b', 'epsilon', 'delta',
                          'theta', 'phi', 'qp', 'qs', 'lam', 'mu']
@@ -274,7 +284,8 @@ class SeismicModel(GenericModel):
     def __init__(self, origin, spacing, shape, space_order, vp, nbl=20, fs=False,
                  dtype=np.float32, subdomains=(), bcs="mask", grid=None, **kwargs):
         super().__init__(origin, spacing, shape, space_order, nbl,
-                         dtype, subdomains, grid=grid, bcs=bcs, fs=fs)
+                         dtype, subdomains, grid=grid, bcs=bcs, fs=fs,
+                         weights=kwargs.get('weights'))
 
         # Initialize physics
         self._initialize_physics(vp, space_order, **kwargs)
@@ -1,10 +1,11 @@
 from devito import Function, TimeFunction
 from devito.tools import memoized_meth
+from examples.seismic import PrecompileMixin
 from examples.seismic.self_adjoint.operators import IsoFwdOperator, IsoAdjOperator, \
     IsoJacobianFwdOperator, IsoJacobianAdjOperator
 
 
-class SaIsoAcousticWaveSolver:
+class SaIsoAcousticWaveSolver(PrecompileMixin):
     """
     Solver object for a scalar isotropic variable density visco- acoustic
     self adjoint wave equation that provides operators for seismic inversion problems
@@ -78,6 +79,11 @@ class SaIsoAcousticWaveSolver:
         return IsoJacobianFwdOperator(self.model, save=save, geometry=self.geometry,
                                       space_order=self.space_order, **self._kwargs)
 
+    def _precompiled(self, save):
+        """The forward, adjoint, Jacobian and Jacobian adjoint Operators."""
+        return [self.op_fwd(save), self.op_adj(None), self.op_jac(None),
+                self.op_jacadj()]
+
     def forward(self, src=None, rec=None, b=None, vp=None, damp=None, u=None,
                 save=None, **kwargs):
         """
@@ -2,12 +2,13 @@
 from devito import (Function, TimeFunction, warning, NODE,
                     DevitoCheckpoint, CheckpointOperator, Revolver)
 from devito.tools import memoized_meth
+from examples.seismic import PrecompileMixin
 from examples.seismic.tti.operators import ForwardOperator, AdjointOperator
 from examples.seismic.tti.operators import JacobianOperator, JacobianAdjOperator
 from examples.seismic.tti.operators import particle_velocity_fields
 
 
-class AnisotropicWaveSolver:
+class AnisotropicWaveSolver(PrecompileMixin):
     """
     Solver object that provides operators for seismic inversion problems
     and encapsulates the time and space discretization for a given problem
@@ -80,6 +81,11 @@ class AnisotropicWaveSolver:
         return JacobianAdjOperator(self.model, save=save, geometry=self.geometry,
                                    space_order=self.space_order, **self._kwargs)
 
+    def _precompiled(self, save):
+        """The forward, adjoint, Jacobian and Jacobian adjoint Operators."""
+        return [self.op_fwd(bool(save)), self.op_adj(), self.op_jac(),
+                self.op_jacadj()]
+
     def forward(self, src=None, rec=None, u=None, v=None, model=None,
                 save=False, **kwargs):
         """
@@ -1,13 +1,14 @@
 import numpy as np
 from argparse import Action, ArgumentError, ArgumentParser
 
-from devito import error, configuration, warning
+from devito import (Dimension, SparseFunction, compile_all, error, configuration,
+                    warning)
 from devito.tools import Pickable
 from devito.types.sparse import _default_radius
 
 from .source import *
 
-__all__ = ['AcquisitionGeometry', 'setup_geometry', 'seismic_args']
+__all__ = ['AcquisitionGeometry', 'PrecompileMixin', 'setup_geometry', 'seismic_args']
 
 
 def setup_geometry(model, tn, f0=0.010, interpolation='linear', **kwargs):
@@ -60,22 +61,43 @@ class AcquisitionGeometry(Pickable):
 
     In practice this would only point to a segy file with the
     necessary information
+
+    Multiple shots may be batched into a single modelling run, in which case
+    `src_positions` has shape `(nshots, nsrc, ndim)` and `rec_positions` has
+    shape either `(nrec, ndim)`, if all shots share the same receivers, or
+    `(nshots, nrec, ndim)`. Alternatively, `nshots` may be passed explicitly,
+    along with positions concatenated over the shots. The sources and
+    receivers of all shots are then stacked, shot after shot, into a single
+    PointSource, while the model parameters are shared by all shots.
     """
 
     __rargs__ = ('grid', 'rec_positions', 'src_positions', 't0', 'tn')
-    __rkwargs__ = ('f0', 'src_type', 'interpolation', 'r')
+    __rkwargs__ = ('f0', 'src_type', 'interpolation', 'r', 'nshots')
 
     def __init__(self, model, rec_positions, src_positions, t0, tn, **kwargs):
         """
         In practice would be __init__(segyfile) and all below parameters
         would come from a segy_read (at property call rather than at init)
         """
+        nshots = kwargs.get('nshots')
+        if nshots is None and np.ndim(src_positions) == 3:
+            nshots = np.shape(src_positions)[0]
+            if np.ndim(rec_positions) < 3:
+                # Receivers shared by all shots
+                rec_positions = np.reshape(rec_positions, (-1, model.dim))
+                rec_positions = np.tile(rec_positions, (nshots, 1))
+        self._nshots = nshots
+        self._shot_dim = Dimension(name='shot') if nshots is not None else None
+
         src_positions = np.reshape(src_positions, (-1, model.dim))
         rec_positions = np.reshape(rec_positions, (-1, model.dim))
         self.rec_positions = rec_positions
         self._nrec = rec_positions.shape[0]
         self.src_positions = src_positions
         self._nsrc = src_positions.shape[0]
+        if nshots is not None and (self._nsrc % nshots or self._nrec % nshots):
+            raise ValueError("The number of sources and receivers must be "
+                             "a multiple of `nshots=%d`" % nshots)
         self._src_type = kwargs.get('src_type')
         assert (self.src_type in sources or self.src_type is None)
         self._f0 = kwargs.get('f0')
@@ -147,6 +169,20 @@ class AcquisitionGeometry(Pickable):
     def nsrc(self):
         return self._nsrc
 
+    @property
+    def nshots(self):
+        """The number of batched shots, or None if shots aren't batched."""
+        return self._nshots
+
+    @property
+    def batched(self):
+        return self._nshots is not None
+
+    @property
+    def shot_dim(self):
+        """The Dimension iterating over the batched shots."""
+        return self._shot_dim
+
     @property
     def dtype(self):
         return self.grid.dtype
@@ -163,6 +199,33 @@ class AcquisitionGeometry(Pickable):
     def rec(self):
         return self.new_rec()
 
+    def shot_index(self, sfunc):
+        """
+        The shot of each point of `sfunc`, a PointSource created by this
+        geometry, or None if shots aren't batched.
+        """
+        if not self.batched:
+            return None
+        # A SparseFunction sharing the coordinates of `sfunc`, rather than a
+        # plain Function, so that under MPI the shot indices are distributed
+        # alongside the points they refer to
+        index = SparseFunction(name='%s_shot' % sfunc.name, grid=self.grid,
+                               npoint=sfunc.npoint, dimensions=(sfunc._sparse_dim,),
+                               coordinates=sfunc.coordinates, dtype=np.int32)
+        index.data[:] = np.repeat(np.arange(self.nshots, dtype=np.int32),
+                                  sfunc.npoint // self.nshots)
+        return index
+
+    def shot_record(self, rec, shot):
+        """
+        The traces of `rec`, a Receiver created by this geometry, recorded
+        for the given `shot`.
+        """
+        if not self.batched:
+            return rec.data
+        nrec = self.nrec // self.nshots
+        return rec.data[:, shot*nrec:(shot+1)*nrec]
+
     def new_rec(self, name='rec', coordinates=None):
         coords = coordinates or self.rec_positions
         rec = Receiver(name=name, grid=self.grid,
@@ -211,6 +274,32 @@ class AcquisitionGeometry(Pickable):
 sources = {'Wavelet': WaveletSource, 'Ricker': RickerSource, 'Gabor': GaborSource}
 
 
+class PrecompileMixin:
+
+    """
+    Mixin for the wave solvers to build and jit-compile all of their
+    Operators upfront. Solvers list their Operators in `_precompiled`.
+    """
+
+    def _precompiled(self, save):
+        raise NotImplementedError
+
+    def precompile(self, save=None, nprocs=None):
+        """
+        Eagerly build and jit-compile the Operators of the solver, rather
+        than at their first use. The C compiler is invoked for several
+        Operators concurrently.
+
+        Parameters
+        ----------
+        save : bool, optional
+            The forward Operator to be compiled, as in `forward`.
+        nprocs : int, optional
+            The maximum number of concurrent compiler invocations.
+        """
+        compile_all(self._precompiled(save), nprocs=nprocs)
+
+
 def seismic_args(description):
     """
     Command line options for the seismic examples
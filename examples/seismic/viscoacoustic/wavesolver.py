@@ -1,12 +1,13 @@
 from devito import (VectorTimeFunction, TimeFunction, Function, NODE,
                     DevitoCheckpoint, CheckpointOperator, Revolver)
 from devito.tools import memoized_meth
+from examples.seismic import PrecompileMixin
 from examples.seismic.viscoacoustic.operators import (
     ForwardOperator, AdjointOperator, GradientOperator, BornOperator
 )
 
 
-class ViscoacousticWaveSolver:
+class ViscoacousticWaveSolver(PrecompileMixin):
     """
     Solver object that provides operators for seismic inversion problems
     and encapsulates the time and space discretization for a given problem
@@ -73,6 +74,11 @@ class ViscoacousticWaveSolver:
                             space_order=self.space_order, kernel=self.kernel,
                             time_order=self.time_order, **self._kwargs)
 
+    def _precompiled(self, save):
+        """The forward, adjoint, gradient and Born Operators."""
+        return [self.op_fwd(save), self.op_adj(), self.op_grad(),
+                self.op_born()]
+
     def forward(self, src=None, rec=None, v=None, r=None, p=None, model=None,
                 save=None, **kwargs):
         """
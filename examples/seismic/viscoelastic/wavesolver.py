@@ -1,9 +1,10 @@
 from devito import VectorTimeFunction, TensorTimeFunction
 from devito.tools import memoized_meth
+from examples.seismic import PrecompileMixin
 from examples.seismic.viscoelastic.operators import ForwardOperator
 
 
-class ViscoelasticWaveSolver:
+class ViscoelasticWaveSolver(PrecompileMixin):
     """
     Solver object that provides operators for seismic inversion problems
     and encapsulates the time and space discretization for a given problem
@@ -47,6 +48,10 @@ class ViscoelasticWaveSolver:
         return ForwardOperator(self.model, save=save, geometry=self.geometry,
                                space_order=self.space_order, **self._kwargs)
 
+    def _precompiled(self, save):
+        """The forward Operator."""
+        return [self.op_fwd(save)]
+
     def forward(self, src=None, rec1=None, rec2=None, v=None, tau=None, r=None,
                 model=None, save=None, **kwargs):
         """
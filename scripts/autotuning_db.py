@@ -0,0 +1,98 @@
+"""
+Inspect and prune the persistent autotuning database.
+
+Examples
+--------
+List all entries, from the least to the most recently used:
+
+    python scripts/autotuning_db.py list
+
+Drop the entries not used in the last 30 days:
+
+    python scripts/autotuning_db.py prune --older-than 30
+"""
+
+from time import time
+import json
+import os
+
+import click
+
+from devito.core.autotuning import TuningDatabase
+
+
+@click.group()
+@click.option('--path', default=None,
+              help='The database directory. Defaults to DEVITO_AUTOTUNING_DB_DIR '
+                   'or, if unset, to the default temporary directory')
+@click.pass_context
+def cli(ctx, path):
+    ctx.obj = TuningDatabase(path)
+
+
+@cli.command(name='list')
+@click.pass_obj
+def list_entries(db):
+    """List the database entries."""
+    for key in db.entries:
+        entry = db.load(key)
+        if entry is None:
+            continue
+        shape = 'x'.join(str(v) for _, v in entry['shape'])
+        best = ','.join('%s=%s' % tuple(i) for i in entry['best'])
+        click.echo("%s  %s[%s]  %s  %s  nthreads=%d  runs=%d  <%s>" %
+                   (key[:12], entry['name'], shape, entry['platform'],
+                    entry['compiler'], entry['nthreads'], len(entry['timings']),
+                    best))
+
+
+@cli.command()
+@click.argument('key')
+@click.pass_obj
+def show(db, key):
+    """Show the entry whose key starts with KEY."""
+    matches = [i for i in db.entries if i.startswith(key)]
+    if len(matches) != 1:
+        raise click.ClickException("Found %d entries matching `%s`"
+                                   % (len(matches), key))
+    click.echo(json.dumps(db.load(matches[0]), indent=2))
+
+
+@cli.command()
+@click.option('--all', 'drop_all', is_flag=True, help='Drop all entries')
+@click.option('--older-than', type=float, default=None,
+              help='Drop the entries not used in the last given number of days')
+@click.option('--name', default=None, help='Drop the entries of the given Operator')
+@click.pass_obj
+def prune(db, drop_all, older_than, name):
+    """Drop entries from the database."""
+    if not (drop_all or older_than is not None or name):
+        raise click.UsageError("Expected at least one of --all, --older-than, --name")
+
+    now = time()
+    ndropped = 0
+    for key in db.entries:
+        if not drop_all:
+            if older_than is not None:
+                try:
+                    mtime = os.path.getmtime(db._file(key))
+                except FileNotFoundError:
+                    continue
+                if now - mtime < older_than*86400:
+                    continue
+            if name:
+                # Not via `db.load`, which would mark the entry as recently used
+                try:
+                    with open(db._file(key)) as f:
+                        entry = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if entry['name'] != name:
+                    continue
+        db.remove(key)
+        ndropped += 1
+    click.echo("Dropped %d entries" % ndropped)
+
+
+if __name__ == "__main__":
+    cli()
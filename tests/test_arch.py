@@ -1,7 +1,12 @@
+import os
+
+import numpy as np
 import pytest
 
-from devito import switchconfig, configuration
+import devito
+from devito import Eq, Function, Grid, Operator, switchconfig, configuration
 from devito.arch.compiler import sniff_compiler_version, compiler_registry, GNUCompiler
+from devito.arch.store import LocalBinaryStore
 
 
 @pytest.mark.parametrize("cc", [
@@ -29,3 +34,73 @@ def test_switcharch():
     assert isinstance(tmp_comp, old_compiler.__class__)
     assert old_compiler.suffix == tmp_comp.suffix
     assert old_compiler.name == tmp_comp.name
+
+
+class TestBinaryStore:
+
+    @pytest.fixture
+    def compiler(self, tmp_path, monkeypatch):
+        # Emulate a pristine machine, with empty local jit-caches
+        compiler = configuration['compiler']
+
+        def pristine():
+            local = tmp_path.joinpath('local%d' % len(list(tmp_path.iterdir())))
+            monkeypatch.setattr(compiler, 'get_jit_dir', lambda: local)
+            monkeypatch.setattr(compiler, 'get_codepy_dir', lambda: local)
+            local.mkdir()
+
+        pristine()
+        compiler.pristine = pristine
+        yield compiler
+        del compiler.pristine
+
+    def test_fetch(self, compiler, tmp_path, monkeypatch):
+        grid = Grid(shape=(4, 4))
+        f = Function(name='f', grid=grid)
+        op = Operator(Eq(f, f + 1.))
+
+        store = LocalBinaryStore(tmp_path.joinpath('store'))
+        with switchconfig(jit_store=store.path):
+            recompiled, _ = compiler.jit_compile(op._soname, str(op))
+            assert recompiled
+            assert len(store.entries) == 1
+
+            # Another machine, sharing the store, won't need to compile
+            compiler.pristine()
+            monkeypatch.setattr(devito.arch.compiler, 'compile_from_string', None)
+
+            recompiled, _ = compiler.jit_compile(op._soname, str(op))
+            assert not recompiled
+
+            op.apply()
+            assert np.all(f.data == 1.)
+
+    def test_unreachable(self, compiler, tmp_path):
+        grid = Grid(shape=(4, 4))
+        f = Function(name='f', grid=grid)
+        op = Operator(Eq(f, f + 2.))
+
+        # A regular file can't be the store directory
+        fake = tmp_path.joinpath('store')
+        fake.touch()
+
+        with switchconfig(jit_store=str(fake)):
+            recompiled, _ = compiler.jit_compile(op._soname, str(op))
+            assert recompiled
+
+            op.apply()
+            assert np.all(f.data == 2.)
+
+    def test_eviction(self, tmp_path):
+        store = LocalBinaryStore(tmp_path.joinpath('store'), maxsize=25)
+
+        for i in range(4):
+            binary = tmp_path.joinpath('bin%d' % i)
+            binary.write_bytes(bytes(10))
+            store.publish('key%d' % i, str(binary))
+            os.utime(store._file('key%d' % i), (i, i))
+
+        # Only the two most recently published binaries fit in the store
+        assert len(store.entries) == 2
+        assert store.fetch('key3', str(tmp_path.joinpath('out')))
+        assert not store.fetch('key0', str(tmp_path.joinpath('out')))
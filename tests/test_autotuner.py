@@ -4,7 +4,7 @@ import numpy as np
 from conftest import assert_blocking, skipif
 from devito import Grid, Function, TimeFunction, Eq, Operator, configuration, switchconfig
 from devito.data import LEFT
-from devito.core.autotuning import options  # noqa
+from devito.core.autotuning import options, tuning_database  # noqa
 
 
 @switchconfig(log_level='DEBUG', develop_mode=True)
@@ -345,3 +345,68 @@ def test_few_timesteps():
     op.apply(autotune=True)
     assert op._state['autotuning'][0]['runs'] == 2
     assert op._state['autotuning'][0]['tpr'] == 2  # Induced by `save`
+
+
+@switchconfig(develop_mode=True)
+def test_model_based():
+    grid = Grid(shape=(96, 96, 96))
+    f = TimeFunction(name='f', grid=grid, space_order=4)
+
+    op = Operator(Eq(f.forward, f.laplace + 1.), opt=('advanced', {'openmp': True}))
+
+    op.apply(time=0, autotune='aggressive')
+    nruns = op._state['autotuning'][0]['runs']
+
+    op.apply(time=0, autotune='model')
+    summary = op._state['autotuning'][1]
+    assert 0 < summary['runs'] <= options['model-probes'] + options['model-topk']
+    assert summary['runs'] < nruns
+    assert {'x0_blk0_size', 'y0_blk0_size'} <= set(summary['tuned'])
+
+
+class TestTuningDatabase:
+
+    def test_lookup(self, tmpdir):
+        grid = Grid(shape=(96, 96, 96))
+        f = TimeFunction(name='f', grid=grid)
+
+        op = Operator(Eq(f.forward, f.dx + 1.), opt=('advanced', {'openmp': False}))
+
+        with switchconfig(autotuning_db=1, autotuning_db_dir=str(tmpdir)):
+            op.apply(time=0, autotune=True)
+            assert op._state['autotuning'][0]['runs'] == 6
+            assert len(tuning_database.entries) == 1
+
+            # Same Operator, same shape -> the autotuning phase is skipped
+            op.apply(time=0, autotune=True)
+            summary = op._state['autotuning'][1]
+            assert summary['runs'] == 0
+            assert summary['cached']
+            assert summary['tuned'] == op._state['autotuning'][0]['tuned']
+
+            # Different shape -> new entry
+            grid1 = Grid(shape=(64, 64, 64))
+            f1 = TimeFunction(name='f', grid=grid1)
+            op.apply(time=0, f=f1, autotune=True)
+            assert op._state['autotuning'][2]['runs'] == 5
+            assert len(tuning_database.entries) == 2
+
+    def test_refine(self, tmpdir):
+        grid = Grid(shape=(96, 96, 96))
+        f = TimeFunction(name='f', grid=grid)
+
+        op = Operator(Eq(f.forward, f.dx + 1.), opt=('advanced', {'openmp': False}))
+
+        with switchconfig(autotuning_db=1, autotuning_db_dir=str(tmpdir),
+                          autotuning_refine=2):
+            op.apply(time=0, autotune=True)
+            assert op._state['autotuning'][0]['runs'] == 6
+
+            # In `aggressive` mode there are many more candidates; only two new
+            # ones get explored in each run
+            for i in range(1, 3):
+                op.apply(time=0, autotune='aggressive')
+                assert op._state['autotuning'][i]['runs'] == 2
+
+            key, = tuning_database.entries
+            assert len(tuning_database.load(key)['timings']) == 10
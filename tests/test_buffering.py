@@ -7,6 +7,7 @@ from devito import (Constant, Grid, TimeFunction, Operator, Eq, SubDimension,
 from devito.arch.archinfo import AppleArm
 from devito.ir import FindSymbols, retrieve_iteration_tree
 from devito.exceptions import InvalidOperator
+from devito.types import Lock, PThreadArray
 
 
 def test_read_write():
@@ -193,6 +194,44 @@ def test_async_degree(async_degree):
     assert np.all(u.data == u1.data)
 
 
+@pytest.mark.parametrize('async_degree', [1, 2])
+def test_async_offload(async_degree):
+    """
+    Snapshots are drained from the buffer into `usave` by a helper thread.
+    """
+    nt = 16
+    grid = Grid(shape=(4, 4, 4))
+    time_dim = grid.time_dim
+
+    factor = 4
+    time_sub = ConditionalDimension(name='time_sub', parent=time_dim, factor=factor)
+
+    u = TimeFunction(name='u', grid=grid)
+    u1 = TimeFunction(name='u', grid=grid)
+    usave = TimeFunction(name='usave', grid=grid, time_dim=time_sub, save=nt//factor)
+    usave1 = TimeFunction(name='usave', grid=grid, time_dim=time_sub,
+                          save=nt//factor)
+
+    eqns = [Eq(u.forward, u*1.1 + 1),
+            Eq(usave, u)]
+
+    op0 = Operator(eqns, opt='noop')
+    op1 = Operator(eqns, opt=('buffering', 'tasking', 'orchestrate',
+                              {'buf-async-degree': async_degree}))
+
+    # Check generated code
+    symbols = FindSymbols().visit(op1)
+    assert len([i for i in symbols if isinstance(i, Lock)]) == 1
+    assert len([i for i in symbols if isinstance(i, PThreadArray)]) == 1
+    assert 'copy_from_host0' in op1._func_table
+
+    op0.apply(time_M=nt-1)
+    op1.apply(time_M=nt-1, u=u1, usave=usave1)
+
+    assert np.all(u.data == u1.data)
+    assert np.all(usave.data == usave1.data)
+
+
 def test_two_homogeneous_buffers():
     nt = 10
     grid = Grid(shape=(4, 4))
@@ -1,11 +1,14 @@
 import pytest
 import numpy as np
-from scipy.ndimage import gaussian_filter
+from scipy.ndimage import gaussian_filter, uniform_filter
 from scipy.misc import ascent
 
 from devito import ConditionalDimension, Grid, Function, TimeFunction, switchconfig
-from devito.builtins import (assign, norm, gaussian_smooth, initialize_function,
-                             inner, mmin, mmax, sum, sumall)
+from devito.builtins import (assign, norm, box_smooth, gaussian_smooth,
+                             initialize_function, inner, mmin, mmax, multi_reduce,
+                             sum, sumall)
+from devito.builtins.arithmetic import _kernels
+from devito.builtins.initializers import _scratch
 from devito.data import LEFT, RIGHT
 from devito.tools import as_tuple
 from devito.types import SubDomain, SparseTimeFunction
@@ -195,6 +198,81 @@ class TestGaussianSmooth:
         slices = as_tuple(slices)
         assert np.all(sp_smoothed[slices] - np.array(dv_smoothed.data[:]) == 0)
 
+    @pytest.mark.parametrize('mode, sp_mode', [('reflect', 'reflect'),
+                                               ('constant', 'nearest')])
+    def test_gs_3d_function(self, mode, sp_mode):
+        grid = Grid(shape=(20, 21, 22))
+
+        f = Function(name='f', grid=grid, space_order=2)
+        a = np.random.rand(*grid.shape).astype(np.float32)
+        f.data[:] = a
+
+        _kernels.clear()
+
+        sp_smoothed = gaussian_filter(a, sigma=(1, 2, 3), mode=sp_mode)
+        dv_smoothed = gaussian_smooth(f, sigma=(1, 2, 3), mode=mode)
+
+        # In place
+        assert dv_smoothed is f
+        assert np.allclose(sp_smoothed, f.data, rtol=0, atol=1e-6)
+
+        # The Operators are cached and reused
+        nkernels = len(_kernels)
+        gaussian_smooth(f, sigma=(1, 2, 3), mode=mode)
+        assert len(_kernels) == nkernels
+
+    def test_box_smooth(self):
+        grid = Grid(shape=(20, 21, 22))
+
+        f = Function(name='f', grid=grid)
+        a = np.random.rand(*grid.shape).astype(np.float32)
+        f.data[:] = a
+
+        box_smooth(f, width=(3, 5, 7))
+
+        assert np.allclose(uniform_filter(a, size=(3, 5, 7)), f.data, rtol=0, atol=1e-6)
+
+        with pytest.raises(ValueError):
+            box_smooth(f, width=4)
+
+    def test_smooth_scratch_reuse(self):
+        grid = Grid(shape=(20, 21))
+
+        f = Function(name='f', grid=grid)
+        g = Function(name='g', grid=grid)
+        a = np.random.rand(*grid.shape).astype(np.float32)
+
+        f.data[:] = a
+        box_smooth(f, width=5)
+        scratch, = _scratch.values()
+
+        # Same Grid and data type, and a narrower filter
+        g.data[:] = a
+        box_smooth(g, width=3)
+        assert next(iter(_scratch.values())) is scratch
+        assert np.allclose(uniform_filter(a, size=3), g.data, rtol=0, atol=1e-6)
+
+        # A wider filter requires a new scratch Function, replacing the old one
+        g.data[:] = a
+        box_smooth(g, width=7)
+        assert len(_scratch) == 1
+        assert next(iter(_scratch.values())) is not scratch
+        assert np.allclose(uniform_filter(a, size=7), g.data, rtol=0, atol=1e-6)
+
+    @pytest.mark.parallel(mode=4)
+    def test_box_smooth_parallel(self, mode):
+        a = np.arange(400, dtype=np.float32).reshape((20, 20))
+        grid = Grid(shape=a.shape)
+
+        f = Function(name='f', grid=grid)
+        f.data[:] = a
+
+        box_smooth(f, width=5)
+
+        sp_smoothed = uniform_filter(a, size=5)
+        slices = tuple(grid.distributor.glb_slices[d] for d in grid.dimensions)
+        assert np.allclose(sp_smoothed[slices], np.array(f.data[:]), atol=1e-4)
+
 
 class TestInitializeFunction:
 
@@ -339,6 +417,53 @@ class TestInitializeFunction:
             assert np.all(a[::-1, :] - np.array(i.data[0:4, 4:8]) == 0)
             assert np.all(a[::-1, :] - np.array(i.data[8:12, 4:8]) == 0)
 
+    @pytest.mark.parametrize('mode', ['constant', 'reflect'])
+    def test_batching_memmap(self, mode, tmpdir):
+        grid = Grid(shape=(14, 15, 16))
+
+        datas = []
+        for i in range(3):
+            filename = str(tmpdir.join('a%d.npy' % i))
+            np.save(filename, np.random.rand(8, 9, 10).astype(np.float32))
+            datas.append(np.load(filename, mmap_mode='r'))
+
+        functions = [Function(name='f%d' % i, grid=grid, space_order=4)
+                     for i in range(3)]
+
+        _kernels.clear()
+
+        initialize_function(functions, datas, 3, mode=mode)
+
+        # All Functions are initialized by the same Operator
+        assert len(_kernels) == 1
+
+        pad = 'edge' if mode == 'constant' else 'symmetric'
+        for f, a in zip(functions, datas):
+            expected = np.pad(np.pad(a, 3, pad), 4, 'edge')
+            assert np.all(f._data_with_outhalo == expected)
+
+        # Same number of Functions with the same properties, same Operator,
+        # whatever the padding mode
+        g = [Function(name='g%d' % i, grid=grid, space_order=4) for i in range(3)]
+        initialize_function(g, datas, 3, mode='reflect')
+        assert len(_kernels) == 1
+
+    @pytest.mark.parallel(mode=4)
+    def test_batching_mpi(self, mode):
+        grid = Grid(shape=(14, 16))
+
+        a = np.arange(80, dtype=np.float32).reshape((8, 10))
+
+        f = Function(name='f', grid=grid)
+        g = Function(name='g', grid=grid, space_order=4)
+
+        initialize_function([f, g], [a, a], 3, mode='reflect')
+
+        expected = np.pad(a, 3, 'symmetric')
+        slices = tuple(grid.distributor.glb_slices[d] for d in grid.dimensions)
+        for i in [f, g]:
+            assert np.all(np.array(i.data) == expected[slices])
+
 
 class TestBuiltinsResult:
 
@@ -518,3 +643,138 @@ class TestBuiltinsResult:
         assert type(v1) is np.int32
         assert type(v2) is np.float32
         assert type(v3) is np.float64
+
+    def test_reduction_kernels_cache(self):
+        grid = Grid(shape=(11, 11))
+
+        f = Function(name='f', grid=grid)
+        g = Function(name='g', grid=grid)
+        h = Function(name='h', grid=grid, dtype=np.float64)
+        f.data[:] = 1.
+        g.data[:] = 2.
+        h.data[:] = 3.
+
+        _kernels.clear()
+
+        assert np.isclose(norm(f), 11.)
+        assert len(_kernels) == 1
+        op = list(_kernels.values())[0].op
+
+        # Same kernel, different Function
+        assert np.isclose(norm(g), 22.)
+        assert len(_kernels) == 1
+        assert list(_kernels.values())[0].op is op
+
+        # Different data type, different kernel
+        assert np.isclose(norm(h), 33.)
+        assert len(_kernels) == 2
+
+        # Different Grid, different kernel
+        grid1 = Grid(shape=(5, 5))
+        f1 = Function(name='f', grid=grid1)
+        f1.data[:] = 1.
+        assert np.isclose(norm(f1), 5.)
+        assert len(_kernels) == 3
+
+        # Different halo, different kernel
+        f2 = Function(name='f2', grid=grid, space_order=4)
+        f2.data[:] = 1.
+        assert np.isclose(norm(f2), 11.)
+        assert len(_kernels) == 4
+
+    def test_reduction_kernels_cache_sparse(self):
+        grid = Grid(shape=(11, 11))
+
+        recs = []
+        for i in range(3):
+            rec = SparseTimeFunction(name='rec%d' % i, grid=grid, nt=7, npoint=5)
+            rec.coordinates.data[:] = np.random.rand(5, 2)
+            rec.data[:] = np.random.rand(7, 5)
+            recs.append(rec)
+
+        _kernels.clear()
+
+        for rec in recs:
+            assert np.isclose(norm(rec), np.linalg.norm(rec.data), rtol=1e-5)
+        assert len(_kernels) == 1
+
+    @switchconfig(language='openmp')
+    def test_reduction_kernels_reproducible(self):
+        grid = Grid(shape=(17, 19, 23))
+
+        f = Function(name='f', grid=grid, dtype=np.float32)
+        f.data[:] = np.random.RandomState(0).rand(*grid.shape)
+
+        _kernels.clear()
+
+        v = sumall(f)
+        assert np.isclose(v, np.sum(f.data.astype(np.float64)), rtol=1e-6)
+
+        # Whatever the number of threads, the partial sums are always combined
+        # in the same order
+        kernel = list(_kernels.values())[0]
+        v0 = kernel.retval.data[0]
+        for nthreads in [1, 2, 3, 5]:
+            kernel.op.apply(nthreads=nthreads, **kernel.arguments([f]))
+            assert kernel.retval.data[0] == v0
+
+        # Unless the user says otherwise
+        with switchconfig(**{'opt-options': {'tree-reduce': False}}):
+            assert np.isclose(sumall(f), v)
+        assert len(_kernels) == 2
+
+    def test_multi_reduce(self):
+        grid = Grid(shape=(11, 11))
+
+        f = Function(name='f', grid=grid)
+        u = TimeFunction(name='u', grid=grid)
+        rec = SparseTimeFunction(name='rec', grid=grid, nt=7, npoint=5)
+        f.data[:] = np.random.rand(11, 11) - .5
+        u.data[:] = np.random.rand(2, 11, 11)
+        rec.coordinates.data[:] = np.random.rand(5, 2)
+        rec.data[:] = np.random.rand(7, 5)
+
+        values = multi_reduce([('norm', f), ('norm', u, 1), ('inner', f, f),
+                               ('min', f), ('max', u)])
+
+        # All computed by a single Operator
+        assert list(_kernels.values())[-1].op.name == 'reduce'
+
+        assert np.isclose(values[0], norm(f), rtol=1e-6)
+        assert np.isclose(values[1], np.sum(np.abs(u.data)), rtol=1e-5)
+        assert np.isclose(values[2], inner(f, f), rtol=1e-6)
+        assert values[3] == np.min(f.data)
+        assert values[4] == np.max(u.data)
+        assert all(type(v) is np.float32 for v in values)
+
+        vsum, vmax = multi_reduce([('sum', rec), ('max', rec)])
+        assert np.isclose(vsum, np.sum(rec.data), rtol=1e-5)
+        assert vmax == np.max(rec.data)
+
+        assert multi_reduce([]) == []
+        with pytest.raises(ValueError):
+            multi_reduce([('avg', f)])
+        with pytest.raises(ValueError):
+            multi_reduce([('inner', f)])
+        with pytest.raises(ValueError):
+            # Different number of time steps
+            multi_reduce([('norm', u), ('norm', rec)])
+
+    @pytest.mark.parallel(mode=4)
+    def test_multi_reduce_mpi(self, mode):
+        grid = Grid(shape=(100, 100))
+
+        f = Function(name='f', grid=grid)
+        g = Function(name='g', grid=grid)
+        f.data[:] = np.arange(1, 10001).reshape((100, 100))
+        g.data[:] = 2.
+
+        vnorm, vinner, vsum, vmin, vmax = multi_reduce([
+            ('norm', g), ('inner', f, g), ('sum', g), ('min', f), ('max', f)
+        ])
+
+        assert np.isclose(vnorm, 2.*100)
+        assert np.isclose(vinner, 10000*10001, rtol=1e-6)
+        assert vsum == 2.*10000
+        assert vmin == 1
+        assert vmax == 10000
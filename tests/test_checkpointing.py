@@ -3,9 +3,9 @@ from functools import reduce
 import pytest
 import numpy as np
 
-from conftest import skipif
 from devito import (Grid, TimeFunction, Operator, Function, Eq, switchconfig, Constant,
-                    Revolver, CheckpointOperator, DevitoCheckpoint)
+                    Revolver, CheckpointOperator, DevitoCheckpoint, NativeRevolver)
+from devito.checkpointing.revolve import revolve_schedule
 from examples.seismic.acoustic.acoustic_example import acoustic_setup
 
 
@@ -107,7 +107,6 @@ def test_segmented_averaging():
     assert (f_ref.data_with_halo[1, -1] == 1.).all()
 
 
-@skipif('chkpnt')
 @switchconfig(log_level='WARNING')
 @pytest.mark.parametrize('space_order', [4])
 @pytest.mark.parametrize('kernel', ['OT2'])
@@ -161,7 +160,6 @@ def test_acoustic_save_and_nosave(shape=(50, 50), spacing=(15.0, 15.0), tn=500.,
     assert(np.allclose(rec.data, rec_bk))
 
 
-@skipif('chkpnt')
 def test_index_alignment():
     """ A much simpler test meant to ensure that the forward and reverse indices are
     correctly aligned (i.e. u * v , where u is the forward field and v the reverse field
@@ -244,3 +242,106 @@ def test_index_alignment():
     wrp.apply_reverse()
     assert(np.allclose(v.data[0, :, :], 0))
     assert(np.allclose(prod.data, final_value))
+
+
+@pytest.mark.parametrize('nt,ncp', [(1, 1), (7, 1), (10, 3), (31, 4), (50, 50)])
+def test_revolve_schedule(nt, ncp):
+    """
+    Symbolically execute a Revolve schedule, checking that the timesteps are
+    reversed in order, that checkpoints are restored at the right timestep, and
+    that no more than `ncp` checkpoints are ever used.
+    """
+    capo = 0
+    slots = {}
+    reversed_steps = []
+    for a in revolve_schedule(nt, ncp):
+        if a.type in ('advance', 'lastfw'):
+            assert a.start == capo
+            capo = a.end
+        elif a.type == 'takeshot':
+            assert a.start == capo and a.slot not in slots
+            slots[a.slot] = capo
+        elif a.type == 'restore':
+            capo = slots[a.slot]
+            assert a.start == capo
+        elif a.type == 'cpdel':
+            slots.pop(a.slot)
+        elif a.type == 'reverse':
+            assert a.start == capo
+            capo += 1
+            reversed_steps.append(a.start)
+        elif a.type == 'revstart':
+            assert a.start == capo - 1 == nt - 1
+            reversed_steps.append(a.start)
+        assert len(slots) <= ncp
+    assert reversed_steps == list(reversed(range(nt)))
+    assert not slots
+
+
+@pytest.mark.parametrize('ncp,ndisk,compression', [
+    (2, 0, None), (1, 2, None), (3, 0, 'float16'), (1, 2, 'bfloat16'), (2, 1, 'zlib')
+])
+def test_native_revolver(ncp, ndisk, compression):
+    """
+    As in `test_index_alignment`, but with the native checkpointing engine,
+    a longer time range, and multistage storage.
+    """
+    nt = 16
+    grid = Grid(shape=(4, 4))
+    const = Constant(name="constant")
+
+    u = TimeFunction(name='u', grid=grid)
+    v = TimeFunction(name='v', grid=grid)
+    prod = Function(name="prod", grid=grid)
+
+    fwd_op = Operator(Eq(u.forward, u + 1.*const))
+    rev_op = Operator([Eq(v, v.forward - 1.*const), Eq(prod, prod + u * v)])
+
+    cp = DevitoCheckpoint([u])
+    wrap_fw = CheckpointOperator(fwd_op, constant=1)
+    wrap_rev = CheckpointOperator(rev_op, constant=1)
+    wrp = NativeRevolver(cp, wrap_fw, wrap_rev, ncp, nt, n_disk=ndisk,
+                         compression=compression)
+
+    wrp.apply_forward()
+    assert np.all(u.data[nt % 2] == nt)
+
+    v.data[nt % 2] = u.data[nt % 2]
+    wrp.apply_reverse()
+    assert np.all(v.data[0] == 0)
+    assert np.all(prod.data == sum(n**2 for n in range(nt)))
+    assert wrp.recomputations > 0
+
+    wrp.storage.close()
+
+
+@switchconfig(log_level='WARNING')
+def test_native_revolver_acoustic(shape=(50, 50), spacing=(15., 15.)):
+    """
+    Compare the acoustic FWI gradient computed via native checkpointing, with
+    disk storage and lossless compression, to that computed with the entire
+    forward wavefield in memory.
+    """
+    solver = acoustic_setup(shape=shape, spacing=spacing, tn=500., space_order=4)
+    rec, u_save, _ = solver.forward(save=True)
+    grad_ref, _ = solver.gradient(rec, u_save)
+
+    grad = Function(name='grad', grid=solver.model.grid)
+    u = TimeFunction(name='u', grid=solver.model.grid, time_order=2, space_order=4)
+    v = TimeFunction(name='v', grid=solver.model.grid, time_order=2, space_order=4)
+    rec0 = rec.func(name='rec0')
+    dt = solver.model.critical_dt
+
+    cp = DevitoCheckpoint([u])
+    wrap_fw = CheckpointOperator(solver.op_fwd(save=False), src=solver.geometry.src,
+                                 u=u, rec=rec0, dt=dt)
+    wrap_rev = CheckpointOperator(solver.op_grad(save=False), u=u, v=v, rec=rec,
+                                  grad=grad, dt=dt)
+    wrp = NativeRevolver(cp, wrap_fw, wrap_rev, 4, rec.data.shape[0]-2, n_disk=2,
+                         compression='zlib')
+    wrp.apply_forward()
+    assert np.allclose(rec0.data, rec.data)
+    wrp.apply_reverse()
+
+    atol = 1e-5*np.max(np.abs(grad_ref.data))
+    assert np.allclose(grad.data, grad_ref.data, rtol=1e-5, atol=atol)
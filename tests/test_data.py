@@ -4,10 +4,11 @@ import numpy as np
 from devito import (Grid, Function, TimeFunction, SparseTimeFunction, Dimension, # noqa
                     Eq, Operator, ALLOC_GUARD, ALLOC_ALIGNED, configuration,
                     switchconfig, SparseFunction, PrecomputedSparseFunction,
-                    PrecomputedSparseTimeFunction)
+                    PrecomputedSparseTimeFunction, MmapAllocator, Snapshots, Traces,
+                    load_data, save_data, stream_apply)
 from devito.data import LEFT, RIGHT, Decomposition, loc_data_idx, convert_index
 from devito.data.allocators import DataReference
-from devito.tools import as_tuple
+from devito.tools import as_tuple, make_tempdir
 from devito.types import Scalar
 
 
@@ -1587,6 +1588,187 @@ def test_boolean_masking_array():
     assert all(f.data == [1, 1, 0, 0, 1])
 
 
+class TestDataIO:
+    """
+    Tests for the parallel I/O of Function data.
+    """
+
+    def test_save_load(self, tmp_path):
+        grid = Grid(shape=(8, 6))
+        f = Function(name='f', grid=grid, space_order=2)
+        f.data[:] = np.arange(48).reshape(8, 6)
+
+        filename = str(tmp_path.joinpath('f.dat'))
+        save_data(f, filename)
+
+        # No extension appended, and readable by numpy
+        assert np.all(np.load(filename) == f.data)
+
+        g = Function(name='g', grid=grid)
+        load_data(g, filename)
+        assert np.all(g.data == f.data)
+
+        h = Function(name='h', grid=grid, dtype=np.float64)
+        with pytest.raises(ValueError):
+            load_data(h, filename)
+
+    def test_snapshots(self, tmp_path):
+        grid = Grid(shape=(8, 6))
+        u = TimeFunction(name='u', grid=grid)
+        op = Operator(Eq(u.forward, u + 1))
+
+        filename = str(tmp_path.joinpath('u.npy'))
+        with Snapshots(filename, u, nt=4, mode='w') as snaps:
+            for i in range(4):
+                op.apply(time_M=0)
+                snaps.write(i, u.data[1])
+                u.data[0] = u.data[1]
+
+        assert np.load(filename).shape == (4, 8, 6)
+
+        with Snapshots(filename, u) as snaps:
+            assert len(snaps) == 4
+            for i, v in enumerate(snaps):
+                assert np.all(v == i + 1)
+            snaps.read(2, out=u.data[0])
+        assert np.all(u.data[0] == 3)
+
+    @pytest.mark.parallel(mode=4)
+    def test_save_load_distributed(self, mode):
+        grid = Grid(shape=(10, 7))
+        f = Function(name='f', grid=grid, space_order=2, dtype=np.int32)
+        res = np.arange(70, dtype=np.int32).reshape(10, 7)
+        f.data[:] = res
+
+        filename = str(make_tempdir('io').joinpath('f.npy'))
+        save_data(f, filename)
+        grid.distributor.comm.Barrier()
+
+        # The file is the same as a sequential `numpy.save` would produce
+        assert np.all(np.load(filename) == res)
+
+        g = Function(name='g', grid=grid, dtype=np.int32)
+        load_data(g, filename)
+        assert np.all(g.data_ro_domain == f.data_ro_domain)
+
+    @pytest.mark.parallel(mode=4)
+    def test_snapshots_distributed(self, mode):
+        grid = Grid(shape=(10, 7))
+        u = TimeFunction(name='u', grid=grid)
+        u.data[:] = np.arange(70).reshape(1, 10, 7)
+
+        filename = str(make_tempdir('io').joinpath('u.npy'))
+        with Snapshots(filename, u, nt=3, mode='w') as snaps:
+            for i in range(3):
+                snaps.write(i, u.data[0])
+                u.data._local[0] += 100
+
+        with Snapshots(filename, u) as snaps:
+            for i, v in enumerate(snaps):
+                assert np.all(v == u.data_ro_domain[1] + 100*i)
+        grid.distributor.comm.Barrier()
+
+        expected = np.arange(70).reshape(10, 7) + 100*np.arange(3).reshape(3, 1, 1)
+        assert np.all(np.load(filename) == expected)
+
+    @pytest.mark.parametrize('layout', ['time', 'trace'])
+    def test_traces(self, layout, tmp_path):
+        grid = Grid(shape=(11, 11))
+        u = TimeFunction(name='u', grid=grid)
+        coords = [(.2, .4), (.5, .5), (.8, .1)]
+        rec = SparseTimeFunction(name='rec', grid=grid, npoint=3, nt=4,
+                                 time_dim=grid.stepping_dim, coordinates=coords)
+        src = SparseTimeFunction(name='src', grid=grid, npoint=3, nt=4,
+                                 time_dim=grid.stepping_dim, coordinates=coords)
+
+        # Record 10 time steps through a ring buffer of 4 time steps
+        op = Operator([Eq(u.forward, u + 1), rec.interpolate(expr=u)])
+        filename = str(tmp_path.joinpath('rec.npy'))
+        with Traces(filename, rec, nt=10, mode='w', layout=layout) as traces:
+            summaries = stream_apply(op, traces, time_M=9)
+        assert len(summaries) == 3
+
+        expected = np.tile(np.arange(10).reshape(10, 1), (1, 3))
+        if layout == 'trace':
+            expected = expected.T
+        assert np.allclose(np.load(filename), expected)
+
+        # Now use the recorded data as a source, streaming it back
+        u.data[:] = 0
+        op = Operator([Eq(u.forward, u), src.inject(field=u.forward, expr=src)])
+        with Traces(filename, src, layout=layout) as traces:
+            assert len(traces) == 10
+            stream_apply(op, traces, time_M=9)
+        assert np.isclose(np.sum(u.data[0]), 3*sum(range(10)))
+
+    def test_traces_illegal(self, tmp_path):
+        grid = Grid(shape=(11, 11))
+        rec = SparseTimeFunction(name='rec', grid=grid, npoint=3, nt=4)
+        filename = str(tmp_path.joinpath('rec.npy'))
+
+        # Not a ring buffer
+        with pytest.raises(ValueError):
+            Traces(filename, rec, nt=10, mode='w')
+
+        rec = SparseTimeFunction(name='rec', grid=grid, npoint=3, nt=4,
+                                 time_dim=grid.stepping_dim)
+        with Traces(filename, rec, nt=10, mode='w') as traces:
+            # More time steps than the ring buffer holds
+            with pytest.raises(ValueError):
+                traces.write(0, 5)
+
+    @pytest.mark.parallel(mode=4)
+    def test_traces_distributed(self, mode):
+        grid = Grid(shape=(11, 11))
+        u = TimeFunction(name='u', grid=grid)
+        rec = SparseTimeFunction(name='rec', grid=grid, npoint=4, nt=3,
+                                 time_dim=grid.stepping_dim,
+                                 coordinates=[(.2, .2), (.2, .8), (.8, .2), (.8, .8)])
+
+        op = Operator([Eq(u.forward, u + 1), rec.interpolate(expr=u)])
+        filename = str(make_tempdir('io').joinpath('rec.npy'))
+        with Traces(filename, rec, nt=8, mode='w') as traces:
+            stream_apply(op, traces, time_M=7)
+        grid.distributor.comm.Barrier()
+
+        expected = np.tile(np.arange(8).reshape(8, 1), (1, 4))
+        assert np.allclose(np.load(filename), expected)
+
+
+class TestMmapAllocator:
+    """
+    Tests for Functions backed by memory-mapped files.
+    """
+
+    def test_timefunction_save(self, tmp_path):
+        grid = Grid(shape=(8, 8))
+        allocator = MmapAllocator(path=str(tmp_path))
+
+        u = TimeFunction(name='u', grid=grid, save=20, allocator=allocator)
+        v = TimeFunction(name='v', grid=grid, save=20)
+        for f in [u, v]:
+            Operator(Eq(f.forward, f + 1.)).apply()
+
+        assert np.all(u.data == v.data)
+        assert u.data[-1, 0, 0] == 19.
+
+        # The backing file is unlinked upon creation
+        assert not list(tmp_path.iterdir())
+
+    def test_prefetch_release(self):
+        grid = Grid(shape=(8, 8))
+        allocator = MmapAllocator()
+
+        u = TimeFunction(name='u', grid=grid, save=20, allocator=allocator)
+        u.data[:] = np.arange(20).reshape(20, 1, 1)
+
+        allocator.release(u.data[:10])
+        allocator.prefetch(u.data[10:])
+
+        # Released data is paged back in on access
+        assert np.all(u.data[:, 4, 4] == np.arange(20))
+
+
 class TestDataReference:
     """
     Tests for passing data to a Function using a reference to a
@@ -11,7 +11,7 @@ from devito import (Grid, Function, TimeFunction, SparseTimeFunction, SpaceDimen
                     PrecomputedSparseTimeFunction, Eq, Inc, ReduceMin, ReduceMax,
                     Operator, configuration, dimensions, info, cos)
 from devito.exceptions import InvalidArgument
-from devito.ir.iet import (Iteration, FindNodes, IsPerfectIteration,
+from devito.ir.iet import (Iteration, FindNodes, FindSymbols, IsPerfectIteration,
                            retrieve_iteration_tree, Expression)
 from devito.passes.iet.languages.openmp import Ompizer, OmpRegion
 from devito.tools import as_tuple
@@ -928,6 +928,40 @@ class TestNodeParallelism:
         op1()
         assert n0.data[0] == 11
 
+    def test_tree_reduction(self):
+        grid = Grid(shape=(17, 19, 23))
+        i = Dimension(name='i')
+
+        f = Function(name='f', grid=grid, dtype=np.float32)
+        n = Function(name='n', shape=(2,), dimensions=(i,), dtype=np.float32)
+        f.data[:] = np.random.RandomState(0).rand(*grid.shape)
+
+        s0 = Symbol(name='s0', dtype=np.float32)
+        s1 = Symbol(name='s1', dtype=np.float32)
+
+        eqns = [Eq(s0, 0), Inc(s0, f*f), ReduceMax(s1, f),
+                Eq(n[0], s0), Eq(n[1], s1)]
+        op = Operator(eqns, opt=('advanced', {'openmp': True, 'tree-reduce': True}))
+
+        # The partial sums are stored in one Array per level of the tree
+        arrays = [a for a in FindSymbols().visit(op) if a.is_Array]
+        assert sorted(a.ndim for a in arrays) == [1, 1, 2, 2]
+
+        # The sum is never handed over to an OpenMP reduction, while the
+        # max, being exact, may be
+        pragmas = [i.pragmas[0].ccode.value for i in FindNodes(Iteration).visit(op)
+                   if i.pragmas]
+        assert not any('reduction(+' in i for i in pragmas)
+
+        op.apply(nthreads=1)
+        v = n.data.copy()
+        assert np.isclose(v[0], np.sum(f.data.astype(np.float64)**2), rtol=1e-6)
+        assert v[1] == f.data.max()
+
+        for nthreads in [2, 3, 5]:
+            op.apply(nthreads=nthreads)
+            assert np.all(n.data == v)
+
     def test_array_max_reduction(self):
         """
         Test generation of OpenMP max-reduction clauses involving Function's.
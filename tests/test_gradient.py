@@ -14,7 +14,7 @@ from examples.seismic.viscoacoustic import viscoacoustic_setup as vsc_setup
 
 class TestGradient:
 
-    @skipif(['chkpnt', 'cpu64-icc', 'cpu64-arm'])
+    @skipif(['cpu64-icc', 'cpu64-arm'])
     @switchconfig(safe_math=True)
     @pytest.mark.parametrize('dtype', [np.float32, np.float64])
     @pytest.mark.parametrize('opt', [('advanced', {'openmp': True}),
@@ -149,13 +149,13 @@ class TestGradient:
 
     @skipif('cpu64-icc')
     @pytest.mark.parametrize('kernel, shape, ckp, setup_func, time_order', [
-        pytest.param('OT2', (50, 60), True, iso_setup, 2, marks=skipif('chkpnt')),
+        ('OT2', (50, 60), True, iso_setup, 2),
         ('OT2', (50, 60), False, iso_setup, 2),
-        pytest.param('centered', (50, 60), True, tti_setup, 2, marks=skipif('chkpnt')),
+        ('centered', (50, 60), True, tti_setup, 2),
         ('centered', (50, 60), False, tti_setup, 2),
-        pytest.param('sls', (50, 60), True, vsc_setup, 2, marks=skipif('chkpnt')),
+        ('sls', (50, 60), True, vsc_setup, 2),
         ('sls', (50, 60), False, vsc_setup, 2),
-        pytest.param('sls', (50, 60), True, vsc_setup, 1, marks=skipif('chkpnt')),
+        ('sls', (50, 60), True, vsc_setup, 1),
         ('sls', (50, 60), False, vsc_setup, 1),
     ])
     @pytest.mark.parametrize('space_order', [4])
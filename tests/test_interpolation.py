@@ -7,6 +7,7 @@ from devito import (Grid, Operator, Dimension, SparseFunction, SparseTimeFunctio
                     Function, TimeFunction, DefaultDimension, Eq, switchconfig,
                     PrecomputedSparseFunction, PrecomputedSparseTimeFunction,
                     MatrixSparseTimeFunction)
+from devito.ir.iet import FindNodes, Iteration
 from devito.operations.interpolators import LinearInterpolator, SincInterpolator
 from examples.seismic import (demo_model, TimeAxis, RickerSource, Receiver,
                               AcquisitionGeometry)
@@ -610,6 +611,53 @@ def test_position(shape):
     assert(np.allclose(rec.data, rec1.data, atol=1e-5))
 
 
+@pytest.mark.parametrize('shared_rec', [True, False])
+def test_batched_shots(shared_rec):
+    nshots = 3
+    nrec = 31
+
+    model = demo_model('layers-isotropic', spacing=(10., 10.), shape=(61, 71),
+                       nbl=10)
+
+    src_coordinates = np.empty((nshots, 1, 2))
+    src_coordinates[:, 0, 0] = [100., 300., 500.]
+    src_coordinates[:, 0, 1] = 20.
+
+    rec_coordinates = np.empty((nshots, nrec, 2))
+    for i in range(nshots):
+        rec_coordinates[i, :, 0] = np.linspace(10.*i, 600. - 10.*i, num=nrec)
+    rec_coordinates[..., 1] = 30.
+    if shared_rec:
+        rec_coordinates[:] = rec_coordinates[0]
+
+    geometry = AcquisitionGeometry(model,
+                                   rec_coordinates[0] if shared_rec else rec_coordinates,
+                                   src_coordinates,
+                                   t0=0., tn=300., src_type='Ricker', f0=0.015)
+    assert geometry.nshots == nshots
+    assert geometry.nsrc == nshots
+    assert geometry.nrec == nshots*nrec
+
+    # All shots in a single Operator run
+    solver = AcousticWaveSolver(model, geometry, space_order=4)
+    rec, u, _ = solver.forward()
+    assert u.shape == (3,) + model.grid.shape + (nshots,)
+
+    # One Operator run per shot
+    for i in range(nshots):
+        geometry1 = AcquisitionGeometry(model, rec_coordinates[i],
+                                        src_coordinates[i], t0=0., tn=300.,
+                                        src_type='Ricker', f0=0.015)
+        solver1 = AcousticWaveSolver(model, geometry1, space_order=4)
+        rec1, u1, _ = solver1.forward()
+
+        # Only equal up to rounding, as the generated code differs
+        assert np.linalg.norm(geometry.shot_record(rec, i) - rec1.data) <= \
+            1e-5 * np.linalg.norm(rec1.data)
+        assert np.linalg.norm(u.data[..., i] - u1.data) <= \
+            1e-5 * np.linalg.norm(u1.data)
+
+
 def test_edge_sparse():
     """
     Test that interpolation uses the correct point for the edge case
@@ -838,3 +886,180 @@ def test_sinc_accuracy(r, tol):
     assert np.isclose(err_sinc, 0, rtol=0, atol=tol)
     assert err_sinc < err_lin
     assert err_lin > 0.01
+
+
+@pytest.mark.parametrize('interp', ['linear', 'sinc'])
+@pytest.mark.parametrize('shape', [(21, 21), (11, 12, 13)])
+@pytest.mark.parametrize('min_points', [1, 32])
+def test_inject_coloring(interp, shape, min_points):
+    grid = Grid(shape=shape, extent=tuple(1. for _ in shape))
+    u = TimeFunction(name='u', grid=grid, space_order=8)
+    src = SparseTimeFunction(name='src', grid=grid, npoint=50, nt=4,
+                             interpolation=interp)
+    src._dist_color_min_points = min_points
+
+    np.random.seed(0)
+    src.coordinates.data[:] = np.random.rand(50, len(shape))
+    # Some sparse points sharing the same position
+    src.coordinates.data[:5] = .5
+    src.data[:] = np.random.rand(*src.data.shape)
+
+    eq = src.inject(field=u.forward, expr=src)
+
+    op0 = Operator(eq, opt=('advanced', {'openmp': True}))
+    op1 = Operator(eq, opt=('advanced', {'openmp': True, 'inject-coloring': True}))
+
+    # The sparse points of each color are injected without atomics, while
+    # the uncolored ones still need them
+    assert 'omp atomic' in str(op0)
+    iters = {i.dim.name: i for i in FindNodes(Iteration).visit(op1)}
+    assert 'omp atomic' not in str(iters['ksrc'])
+    assert 'omp atomic' in str(iters['kasrc'])
+
+    # A view held across Operator runs
+    view = src.coordinates.data
+
+    op0.apply(time_M=2)
+    ref = u.data.copy()
+    u.data[:] = 0.
+
+    op1.apply(time_M=2)
+    assert np.allclose(u.data, ref, rtol=1e-5, atol=1e-6)
+
+    # All sparse points are colored unless the colors are too small
+    offsets = src._dist_colors()['offsets']
+    ncolors = offsets.size - 2
+    if min_points == 1:
+        assert ncolors >= 5
+        assert offsets[-2] == offsets[-1] == 50
+    else:
+        assert np.all(np.diff(offsets[:-1]) >= min_points)
+
+    # The coloring is only recomputed once the sparse points move, even
+    # through a view held across Operator runs
+    coloring = src._dist_colors()
+    assert src._dist_colors() is coloring
+    view[:5] = .25
+    assert src._dist_colors() is not coloring
+
+    u.data[:] = 0.
+    op0.apply(time_M=2)
+    ref = u.data.copy()
+    u.data[:] = 0.
+
+    op1.apply(time_M=2)
+    assert np.allclose(u.data, ref, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize('r', [1, 2, 4])
+def test_inject_coloring_margin(r):
+    """
+    Check that the supports of the sparse points sharing a color don't overlap
+    even if both positions are off by one, in opposite directions, w.r.t. those
+    computed in C-land.
+    """
+    grid = Grid(shape=(41, 41), extent=(40., 40.))
+    sf = SparseFunction(name='sf', grid=grid, npoint=400)
+    sf._dist_color_min_points = 1
+
+    np.random.seed(0)
+    # Positions close to the grid points, where rounding may go either way
+    sf.coordinates.data[:] = np.random.randint(0, 40, (400, 2)) - 1e-7
+
+    positions = np.floor(sf._dist_positions()).astype(np.int64)
+    coloring = sf._dist_colors(r)
+    perm, offsets = coloring['perm'], coloring['offsets']
+    for c in range(offsets.size - 2):
+        p = positions[perm[offsets[c]:offsets[c+1]]]
+        distance = np.abs(p[:, None, :] - p[None, :, :]).max(axis=-1)
+        np.fill_diagonal(distance, 2*r + 2)
+        assert np.all(distance >= 2*r + 2)
+
+
+def test_inject_coloring_precomputed():
+    coords = [(.05, .95), (.45, .45), (.45, .45)]
+    r = 2
+
+    m = unit_box(shape=(11, 11), space_order=r)
+    m.data[:] = 0.
+
+    gridpoints, interpolation_coeffs = precompute_linear_interpolation(coords,
+                                                                       m.grid, (0, 0),
+                                                                       r=r)
+    sf = PrecomputedSparseFunction(name='s', grid=m.grid, r=r, npoint=len(coords),
+                                   gridpoints=gridpoints,
+                                   interpolation_coeffs=interpolation_coeffs)
+
+    op = Operator(sf.inject(m, Float(1.)), opt=('advanced', {'inject-coloring': True}))
+    op()
+
+    assert np.allclose(m.data[0:2, 9:11], 0.25, rtol=1.e-5)
+    assert np.allclose(m.data[4:6, 4:6], 0.5, rtol=1.e-5)
+
+
+@pytest.mark.parametrize('interp', ['linear', 'sinc'])
+def test_interp_tables(interp):
+    grid = Grid(shape=(21, 21), extent=(1., 1.), origin=(.1, .1))
+    u = TimeFunction(name='u', grid=grid, space_order=4)
+    v = TimeFunction(name='v', grid=grid, space_order=4)
+    src = SparseTimeFunction(name='src', grid=grid, npoint=20, nt=4,
+                             interpolation=interp)
+    rec = SparseTimeFunction(name='rec', grid=grid, npoint=20, nt=4,
+                             interpolation=interp)
+
+    np.random.seed(0)
+    u.data[:] = np.random.rand(*u.shape)
+    src.coordinates.data[:] = .1 + np.random.rand(20, 2)
+    rec.coordinates.data[:] = .1 + np.random.rand(20, 2)
+    src.data[:] = np.random.rand(*src.data.shape)
+
+    eqns = [src.inject(field=v.forward, expr=src), rec.interpolate(expr=u)]
+
+    op0 = Operator(eqns)
+    op1 = Operator(eqns, opt=('advanced', {'interp-tables': True}))
+
+    # The positions are read from the tables
+    assert 'floor' in str(op0)
+    assert 'floor' not in str(op1)
+
+    op0.apply(time_M=2)
+    vref = v.data.copy()
+    recref = rec.data.copy()
+    v.data[:] = 0.
+    rec.data[:] = 0.
+
+    op1.apply(time_M=2)
+    assert np.allclose(v.data, vref, atol=1e-5)
+    assert np.allclose(rec.data, recref, atol=1e-5)
+
+    # The tables are only recomputed once the sparse points move
+    tables = rec._dist_interp_tables()
+    op1.apply(time_M=2)
+    assert rec._dist_interp_tables() is tables
+    rec.coordinates.data[:] = .2
+    assert rec._dist_interp_tables() is not tables
+
+
+def test_interp_tables_held_view():
+    """
+    Check that the tables are recomputed once the sparse points are moved
+    through a view of the coordinates held across Operator runs.
+    """
+    grid = Grid(shape=(8, 8), extent=(7., 7.))
+
+    f = Function(name='f', grid=grid)
+    f.data[:] = np.arange(8).reshape(8, 1) + 10*np.arange(8).reshape(1, 8)
+
+    coords = np.array([(1., 1.), (1., 6.), (6., 1.), (6., 6.)])
+    sf = SparseFunction(name='sf', grid=grid, npoint=4, coordinates=coords)
+
+    op = Operator(sf.interpolate(f), opt=('advanced', {'interp-tables': True}))
+
+    view = sf.coordinates.data
+
+    op.apply()
+    assert np.all(sf.data == [11, 61, 16, 66])
+
+    view[:] = coords[::-1]
+    op.apply()
+    assert np.all(sf.data == [66, 16, 61, 11])
@@ -14,8 +14,10 @@ from devito.ir.iet import (Call, Conditional, Iteration, FindNodes, FindSymbols,
                            retrieve_iteration_tree)
 from devito.mpi import MPI
 from devito.mpi.routines import (HaloUpdateCall, HaloUpdateList, MPICall,
-                                 ComputeCall)
-from devito.mpi.distributed import CustomTopology
+                                 ComputeCall, IrecvCall, IsendCall)
+from devito.mpi.distributed import (AutoTopology, CustomTopology, auto_topology,
+                                    weighted_split, weights_from_summary)
+from devito.operator.profiling import PerformanceSummary
 from devito.tools import Bunch
 
 from examples.seismic.acoustic import acoustic_setup
@@ -238,6 +240,86 @@ class TestDistributor:
         # along that instead
         assert f.shape == (4,)
 
+    @pytest.mark.parametrize('shape, nprocs, space_order, nprocs_local, expected', [
+        ((8, 8), 1, 1, 1, (1, 1)),
+        ((10,), 4, 1, 1, (4,)),
+        ((2, 100), 4, 1, 1, (1, 4)),
+        ((100, 100), 8, 1, 1, (4, 2)),
+        ((100, 100, 100), 8, 1, 1, (2, 2, 2)),
+        ((1000, 100, 100), 8, 1, 1, (8, 1, 1)),
+        ((1000, 100, 100), 8, 16, 1, (8, 1, 1)),
+        # Halos within a node are cheaper
+        ((100, 100), 8, 1, 4, (2, 4)),
+        ((120, 120, 120), 16, 4, 1, (4, 2, 2)),
+        ((120, 120, 120), 16, 4, 4, (2, 2, 4)),
+    ])
+    def test_auto_topology(self, shape, nprocs, space_order, nprocs_local, expected):
+        topology = auto_topology(shape, nprocs, space_order, nprocs_local)
+        assert topology == expected
+        assert AutoTopology(space_order).select(shape, nprocs, nprocs_local) == expected
+
+    @pytest.mark.parallel(mode=[4])
+    def test_auto_topology_grid(self, mode):
+        grid = Grid(shape=(64, 16), topology='auto')
+        assert grid.distributor.topology == (4, 1)
+
+        grid = Grid(shape=(16, 64), topology=AutoTopology(space_order=8))
+        assert grid.distributor.topology == (1, 4)
+
+        f = Function(name='f', grid=grid, space_order=8)
+        assert f.shape == (16, 16)
+
+    @pytest.mark.parametrize('n, nparts, weights, expected', [
+        (8, 2, None, (4, 4)),
+        (8, 2, [1]*8, (4, 4)),
+        (8, 2, [3, 3, 1, 1, 1, 1, 1, 1], (2, 6)),
+        (20, 4, [3]*2 + [1]*16 + [3]*2, (3, 7, 7, 3)),
+        (5, 4, [100, 0, 0, 0, 0], (1, 1, 1, 2)),
+        (5, 4, [0, 0, 0, 0, 100], (2, 1, 1, 1)),
+        (6, 3, [0]*6, (2, 2, 2)),
+    ])
+    def test_weighted_split(self, n, nparts, weights, expected):
+        chunks = weighted_split(n, nparts, weights)
+        assert tuple(len(i) for i in chunks) == expected
+        assert np.all(np.concatenate(chunks) == np.arange(n))
+
+    @pytest.mark.parallel(mode=[4])
+    def test_weighted_partitioning(self, mode):
+        # E.g., absorbing layers twice as expensive as the interior
+        def cost(d, indices):
+            return np.where((indices < 2) | (indices >= 14), 2., 1.)
+
+        grid = Grid(shape=(16, 16), topology=(4, 1), weights=cost)
+        f = Function(name='f', grid=grid)
+
+        expected = [(3, 16), (5, 16), (5, 16), (3, 16)]
+        assert f.shape == expected[grid.distributor.myrank]
+
+        grid = Grid(shape=(16, 16), topology=(4, 1), weights=([2]*6 + [1]*10, None))
+        f = Function(name='f', grid=grid)
+
+        expected = [(3, 16), (3, 16), (5, 16), (5, 16)]
+        assert f.shape == expected[grid.distributor.myrank]
+
+    @pytest.mark.parallel(mode=[4])
+    def test_weights_from_summary(self, mode):
+        grid = Grid(shape=(16, 16), topology=(4, 1))
+
+        # Rank 0 is a straggler, its points being three times as expensive
+        summary = PerformanceSummary()
+        for rank in range(4):
+            summary.add('section0', rank, 3. if rank == 0 else 1.)
+
+        weights = weights_from_summary(summary, grid)
+        assert np.all(weights[0] == [3/64]*4 + [1/64]*12)
+        assert np.all(weights[1] == 6/256)
+
+        grid = Grid(shape=(16, 16), topology=(4, 1), weights=weights)
+        f = Function(name='f', grid=grid)
+
+        expected = [(2, 16), (2, 16), (6, 16), (6, 16)]
+        assert f.shape == expected[grid.distributor.myrank]
+
 
 class TestFunction:
 
@@ -467,6 +549,95 @@ class TestSparseFunction:
         ownership = grid.distributor.glb_to_rank(sf.gridpoints)
         assert list(ownership.keys()) == [grid.distributor.myrank]
 
+    @pytest.mark.parallel(mode=4)
+    def test_cached_ownership(self, mode):
+        """Check that the MPI metadata of a SparseFunction is reused across
+        Operator runs, and only rebuilt once the sparse points have moved."""
+        grid = Grid(shape=(8, 8), extent=(7., 7.))
+
+        f = Function(name='f', grid=grid)
+        f.data[:] = np.arange(8).reshape(8, 1) + 10*np.arange(8).reshape(1, 8)
+
+        coords = np.array([(1., 1.), (1., 6.), (6., 1.), (6., 6.)])
+        sf = SparseFunction(name='sf', grid=grid, npoint=4, coordinates=coords)
+
+        op = Operator(sf.interpolate(f))
+
+        # A view held across Operator runs
+        view = sf.coordinates.data
+
+        op.apply()
+        mask = sf._dist_scatter_mask()
+        local = coords[sf.local_indices[0]]
+        assert np.all(sf.data == local[:, 0] + 10*local[:, 1])
+
+        op.apply()
+        assert sf._dist_scatter_mask() is mask
+
+        view[:] = coords[::-1]
+        op.apply()
+        assert sf._dist_scatter_mask() is not mask
+        local = coords[::-1][sf.local_indices[0]]
+        assert np.all(sf.data == local[:, 0] + 10*local[:, 1])
+
+    @pytest.mark.parallel(mode=4)
+    def test_inject_coloring(self, mode):
+        """Check that a colored injection matches an atomic one when the sparse
+        points straddle the MPI ranks."""
+        grid = Grid(shape=(12, 12), extent=(11., 11.))
+
+        u = Function(name='u', grid=grid, space_order=2)
+        coords = np.array([(5.5, 5.5), (5.5, 5.5), (5.2, 6.1), (1., 1.), (10., 3.)])
+        sf = SparseFunction(name='sf', grid=grid, npoint=5, coordinates=coords)
+        sf.data[:] = np.arange(1, 6)
+        # Color all sparse points, however few
+        sf._dist_color_min_points = 1
+
+        eq = sf.inject(field=u, expr=sf)
+
+        Operator(eq)()
+        ref = u.data._local.copy()
+
+        u.data[:] = 0.
+        Operator(eq, opt=('advanced', {'inject-coloring': True}))()
+        assert np.allclose(u.data._local, ref)
+
+    @pytest.mark.parallel(mode=4)
+    def test_interp_tables(self, mode):
+        """Check that tabulated interpolation and injection match the default
+        ones when the sparse points straddle the MPI ranks."""
+        grid = Grid(shape=(12, 12), extent=(11., 11.))
+
+        u = Function(name='u', grid=grid, space_order=2)
+        v = Function(name='v', grid=grid, space_order=2)
+        u.data[:] = np.arange(12).reshape(12, 1) + 10*np.arange(12).reshape(1, 12)
+
+        coords = np.array([(5.5, 5.5), (5.2, 6.1), (1., 1.), (10., 3.)])
+        sf = SparseFunction(name='sf', grid=grid, npoint=4, coordinates=coords)
+        rec = SparseFunction(name='rec', grid=grid, npoint=4, coordinates=coords)
+        sf.data[:] = np.arange(1, 5)
+
+        eqns = [sf.inject(field=v, expr=sf), rec.interpolate(expr=u)]
+
+        Operator(eqns)()
+        vref = v.data._local.copy()
+        recref = np.array(rec.data)
+
+        v.data[:] = 0.
+        rec.data[:] = 0.
+        op = Operator(eqns, opt=('advanced', {'interp-tables': True}))
+        view = rec.coordinates.data
+        op()
+        assert np.allclose(v.data._local, vref)
+        assert np.allclose(rec.data, recref)
+
+        # The tables are recomputed once the sparse points are moved, even
+        # through a view held across Operator runs
+        view[:] = coords[::-1]
+        op()
+        local = coords[::-1][rec.local_indices[0]]
+        assert np.allclose(rec.data, local[:, 0] + 10*local[:, 1])
+
     @pytest.mark.parallel(mode=4)
     @pytest.mark.parametrize('coords,expected,expectedinds', [
         ([(0.5, 0.5), (1.5, 2.5), (1.5, 1.5), (2.5, 1.5)], [[0.], [1.], [2.], [3.]],
@@ -779,7 +950,8 @@ class TestOperatorSimple:
             assert np.all(f.data_ro_domain[-1, :-time_M] == 31.)
 
     @pytest.mark.parallel(mode=[(4, 'basic'), (4, 'diag'), (4, 'overlap'),
-                                (4, 'overlap2'), (4, 'diag2'), (4, 'full')])
+                                (4, 'overlap2'), (4, 'diag2'), (4, 'full'),
+                                (4, 'persistent'), (4, 'shared')])
     def test_trivial_eq_2d(self, mode):
         grid = Grid(shape=(8, 8,))
         x, y = grid.dimensions
@@ -814,6 +986,36 @@ class TestOperatorSimple:
             assert np.all(f.data_ro_domain[0, :-1, -1:] == side)
             assert np.all(f.data_ro_domain[0, -1:, :-1] == side)
 
+    @pytest.mark.parallel(mode=[(4, 'basic'), (4, 'diag2'), (4, 'full')])
+    def test_halo_codec(self, mode):
+        grid = Grid(shape=(8, 8,))
+        x, y = grid.dimensions
+        t = grid.stepping_dim
+
+        f = TimeFunction(name='f', grid=grid, space_order=1)
+
+        eqn = Eq(f.forward, f[t, x-1, y] + f[t, x+1, y] + f[t, x, y-1] + f[t, x, y+1])
+        op0 = Operator(eqn)
+        op1 = Operator(eqn, opt=('advanced', {'mpi-codec': 'bfloat16'}))
+
+        assert 'DEVITO_F2BF16' not in str(op0)
+        assert 'DEVITO_F2BF16' in str(op1)
+        assert 'MPI_UNSIGNED_SHORT' in str(op1)
+
+        # 1.1 isn't representable in bfloat16, so the halo values will differ
+        f.data_with_halo[:] = 0.
+        f.data[:] = 1.1
+        op0.apply(time=1)
+        v0 = np.array(f.data_ro_domain[0])
+
+        f.data_with_halo[:] = 0.
+        f.data[:] = 1.1
+        op1.apply(time=1)
+        v1 = np.array(f.data_ro_domain[0])
+
+        assert not np.all(v0 == v1)
+        assert np.allclose(v0, v1, rtol=1e-2)
+
     @pytest.mark.parallel(mode=[(8, 'basic'), (8, 'diag'), (8, 'overlap'),
                                 (8, 'overlap2'), (8, 'diag2'), (8, 'full')])
     def test_trivial_eq_3d(self, mode):
@@ -1544,6 +1746,8 @@ class TestCodeGeneration:
         (1, 'overlap2'),
         (1, 'diag2'),
         (1, 'full'),
+        (1, 'persistent'),
+        (1, 'shared'),
     ])
     def test_min_code_size(self, mode):
         grid = Grid(shape=(10, 10, 10))
@@ -1584,6 +1788,24 @@ class TestCodeGeneration:
             assert len(calls) == 4
             assert 'haloupdate1' not in op._func_table
             assert len(FindNodes(ComputeCall).visit(op)) == 1
+        elif configuration['mpi'] in ('persistent',):
+            assert len(op._func_table) == 6
+            assert len(calls) == 4  # haloupdate, compute, halowait, remainder
+            assert 'haloupdate1' not in op._func_table
+            # Requests are only started, not posted, within the time loop
+            haloupdate = op._func_table['haloupdate0'].root
+            assert not FindNodes((IrecvCall, IsendCall)).visit(haloupdate)
+            assert [i.name for i in FindNodes(Call).visit(haloupdate)
+                    if i.name.startswith('MPI')] == ['MPI_Start', 'MPI_Start']
+        elif configuration['mpi'] in ('shared',):
+            assert len(op._func_table) == 6
+            assert len(calls) == 4  # haloupdate, compute, halowait, remainder
+            assert 'haloupdate1' not in op._func_table
+            # Messages are only exchanged with the peers on other nodes
+            for i in ['haloupdate0', 'halowait0']:
+                efunc = op._func_table[i].root
+                assert efunc.body.body[0].name == 'MPI_Barrier'
+                assert len(FindNodes(Conditional).visit(efunc)) == 3
 
     @pytest.mark.parallel(mode=[(1, 'diag2')])
     def test_many_functions(self, mode):
@@ -2713,7 +2935,8 @@ class TestIsotropicAcoustic:
 
     @pytest.mark.parametrize('nd', [1, 2, 3])
     @pytest.mark.parallel(mode=[(4, 'basic'), (4, 'diag'), (4, 'overlap'),
-                                (4, 'overlap2'), (4, 'full')])
+                                (4, 'overlap2'), (4, 'full'), (4, 'persistent'),
+                                (4, 'shared')])
     def test_adjoint_F(self, nd, mode):
         self.run_adjoint_F(nd)
 
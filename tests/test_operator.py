@@ -9,9 +9,10 @@ from devito import (Grid, Eq, Operator, Constant, Function, TimeFunction,
                     SparseFunction, SparseTimeFunction, Dimension, error, SpaceDimension,
                     NODE, CELL, dimensions, configuration, TensorFunction,
                     TensorTimeFunction, VectorFunction, VectorTimeFunction,
-                    div, grad, switchconfig)
+                    ConditionalDimension, div, grad, switchconfig, compile_all,
+                    BuildProfile)
 from devito import  Inc, Le, Lt, Ge, Gt  # noqa
-from devito.exceptions import InvalidOperator
+from devito.exceptions import InvalidArgument, InvalidOperator
 from devito.finite_differences.differentiable import diff2sympy
 from devito.ir.equations import ClusterizedEq
 from devito.ir.equations.algorithms import lower_exprs
@@ -1270,6 +1271,137 @@ class TestApplyArguments:
 
 
 @skipif('device')
+class TestBoundOperator:
+
+    def setup_op(self):
+        grid = Grid(shape=(11, 11))
+
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        v = Function(name='v', grid=grid)
+        src = SparseTimeFunction(name='src', grid=grid, npoint=2, nt=10,
+                                 coordinates=[(0.1, 0.2), (0.5, 0.5)])
+        c = Constant(name='c', value=1.)
+
+        eqns = [Eq(u.forward, u + c*v)] + src.inject(field=u.forward, expr=src)
+
+        return Operator(eqns), u, v, src, c
+
+    def test_basic(self):
+        op, u, v, src, _ = self.setup_op()
+        v.data[:] = 1.
+        src.data[:] = 2.
+
+        op.apply(time_M=5)
+        expected = u.data.copy()
+        u.data[:] = 0.
+
+        bop = op.bind(time_M=5)
+        bop.apply()
+        assert np.all(u.data == expected)
+
+        # Repeated executions with the same arguments
+        for _ in range(3):
+            u.data[:] = 0.
+            bop()
+            assert np.all(u.data == expected)
+
+    def test_patch_functions(self):
+        op, u, v, src, _ = self.setup_op()
+        v.data[:] = 1.
+
+        bop = op.bind(time_M=5)
+
+        u1 = TimeFunction(name='u1', grid=u.grid, space_order=2)
+        v1 = Function(name='v1', grid=u.grid)
+        v1.data[:] = 2.
+        src1 = SparseTimeFunction(name='src1', grid=u.grid, npoint=2, nt=10,
+                                  coordinates=[(0.3, 0.3), (0.7, 0.5)])
+        src1.data[:] = 3.
+
+        bop.apply(u=u1, v=v1, src=src1)
+        assert np.all(u.data == 0.)
+
+        u2 = TimeFunction(name='u2', grid=u.grid, space_order=2)
+        op.apply(u=u2, v=v1, src=src1, time_M=5)
+        assert np.all(u1.data == u2.data)
+
+        # The overrides persist across executions
+        u1.data[:] = 0.
+        bop.apply()
+        assert np.all(u1.data == u2.data)
+
+        # Plain numpy arrays are patched too
+        u1.data[:] = 0.
+        bop.apply(v=np.ones(v.shape_allocated, dtype=v.dtype))
+        u2.data[:] = 0.
+        op.apply(u=u2, v=v, src=src1, time_M=5)
+        assert np.all(u1.data == u2.data)
+
+    def test_patch_scalars_and_bounds(self):
+        op, u, v, src, c = self.setup_op()
+        v.data[:] = 1.
+
+        bop = op.bind(time_M=5)
+        bop.apply(c=2., time_m=1, time_M=3)
+        assert np.all(u.data[0] == 6.)
+
+        u.data[:] = 0.
+        bop.apply()
+        assert np.all(u.data[0] == 6.)
+
+        u.data[:] = 0.
+        bop.apply(x_m=2, x_M=3)
+        assert np.all(u.data[0, 2:4] == 6.)
+        assert np.all(u.data[0, :2] == 0.)
+        assert np.all(u.data[0, 4:] == 0.)
+
+    def test_conditional_dimension(self):
+        grid = Grid(shape=(4, 4))
+        time = grid.time_dim
+
+        u = TimeFunction(name='u', grid=grid)
+        time_sub = ConditionalDimension('t_sub', parent=time, factor=2)
+        usave = TimeFunction(name='usave', grid=grid, time_dim=time_sub, save=6)
+
+        op = Operator([Eq(u.forward, u + 1), Eq(usave, u)])
+
+        bop = op.bind(time_M=5)
+        bop.apply(time_M=9)
+        assert all(np.all(usave.data[i] == 2*i) for i in range(5))
+
+    def test_fallback(self):
+        op, u, v, src, _ = self.setup_op()
+        v.data[:] = 1.
+
+        bop = op.bind(time_M=5)
+
+        # Different shape, hence the arguments get reprocessed from scratch
+        grid = Grid(shape=(13, 13))
+        u1 = TimeFunction(name='u1', grid=grid, space_order=2)
+        v1 = Function(name='v1', grid=grid)
+        v1.data[:] = 1.
+        src1 = SparseTimeFunction(name='src1', grid=grid, npoint=2, nt=10)
+
+        bop.apply(u=u1, v=v1, src=src1)
+        assert bop.args['x_M'] == 12
+        assert np.all(u1.data[0] == 6.)
+
+    def test_illegal(self):
+        op, u, _, _, _ = self.setup_op()
+
+        bop = op.bind(time_M=5)
+
+        with pytest.raises(InvalidArgument):
+            bop.apply(time_M=100)
+
+        # The bound arguments are still valid
+        bop.apply()
+        assert bop.args['time_M'] == 5
+
+        with pytest.raises(ValueError):
+            bop.apply(unknown=1)
+
+
 class TestDeclarator:
 
     def test_conditional_declarations(self):
@@ -2017,3 +2149,220 @@ class TestInternals:
 
         assert np.all(f.data[0] == 0.)
         assert np.all(f.data[i] == 3. for i in range(1, 10))
+
+
+class TestOperatorCache:
+
+    @pytest.fixture
+    def opcache(self, tmp_path):
+        from devito.operator.cache import OperatorCache
+        with switchconfig(opcache=True, opcache_dir=str(tmp_path)):
+            yield OperatorCache()
+
+    def test_hit(self, opcache):
+        grid = Grid(shape=(5, 5))
+
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        c = Constant(name='c', value=2.)
+        eqn = Eq(u.forward, u.laplace + c)
+
+        op0 = Operator(eqn)
+        assert len(opcache.entries) == 1
+
+        op0.apply(time_M=2)
+        expected = u.data.copy()
+        u.data[:] = 0.
+
+        op1 = Operator(eqn)
+        assert op1 is not op0
+        assert len(opcache.entries) == 1
+
+        # The restored Operator is bound to the user-level objects
+        assert u in op1.input
+        assert c in op1.input
+
+        op1.apply(time_M=2)
+        assert np.all(u.data == expected)
+
+    def test_hit_sparse(self, opcache):
+        grid = Grid(shape=(11, 11))
+
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        src = SparseTimeFunction(name='src', grid=grid, npoint=2, nt=4,
+                                 coordinates=[(0.1, 0.2), (0.5, 0.5)])
+        src.data[:] = 1.
+        eqns = [Eq(u.forward, u + 1)] + src.inject(field=u.forward, expr=src)
+
+        Operator(eqns).apply(time_M=2)
+        expected = u.data.copy()
+        u.data[:] = 0.
+
+        op = Operator(eqns)
+        assert len(opcache.entries) == 1
+        assert src.coordinates in op.input
+
+        op.apply(time_M=2)
+        assert np.all(u.data == expected)
+
+    @pytest.mark.parametrize('kwargs', [
+        {'space_order': 4},
+        {'space_order': 2, 'staggered': NODE},
+        {'space_order': 2, 'time_order': 2},
+    ])
+    def test_miss(self, opcache, kwargs):
+        grid = Grid(shape=(5, 5))
+
+        u0 = TimeFunction(name='u', grid=grid, space_order=2)
+        u1 = TimeFunction(name='u', grid=grid, **kwargs)
+
+        Operator(Eq(u0.forward, u0.dx + 1))
+        Operator(Eq(u1.forward, u1.dx + 1))
+        assert len(opcache.entries) == 2
+
+        Operator(Eq(u0.forward, u0.dx + 1), opt='noop')
+        assert len(opcache.entries) == 3
+
+    def test_signature_deterministic(self, opcache):
+        grid = Grid(shape=(5, 5))
+        x, _ = grid.dimensions
+
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+        eqn = Eq(u.forward, u.dx(x0=x + x.spacing/2) + u.dy)
+
+        kwargs = {'mode': 'advanced', 'options': {}, 'language': 'C',
+                  'platform': configuration['platform'],
+                  'compiler': configuration['compiler']}
+
+        key0, bindings0 = opcache.signature([eqn], **kwargs)
+        key1, bindings1 = opcache.signature([eqn], **kwargs)
+        assert key0 == key1
+        assert bindings0 == bindings1
+        assert any(i is u for i in bindings0)
+        assert any(i is grid for i in bindings0)
+
+        key2, _ = opcache.signature([Eq(u.forward, u.dx + u.dy)], **kwargs)
+        assert key0 != key2
+
+    def test_eviction(self, opcache):
+        grid = Grid(shape=(5, 5))
+
+        for i in range(3):
+            f = Function(name='f%d' % i, grid=grid)
+            Operator(Eq(f, f + 1))
+        entries = opcache.entries
+        assert len(entries) == 3
+
+        # LRU eviction
+        opcache.evict(maxsize=opcache.nbytes - 1)
+        assert opcache.entries == entries[1:]
+
+        opcache.clear()
+        assert len(opcache.entries) == 0
+
+
+class TestBuildProfile:
+
+    def test_disabled(self):
+        grid = Grid(shape=(4, 4))
+        u = TimeFunction(name='u', grid=grid)
+
+        op = Operator(Eq(u.forward, u + 1))
+
+        assert op.build_profile is None
+
+    @switchconfig(profiling_build=True)
+    def test_pass_tree(self):
+        grid = Grid(shape=(4, 4))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+
+        op = Operator(Eq(u.forward, u.laplace + 1))
+
+        profile = op.build_profile
+        root = profile.root
+        assert root.name == 'op-compile'
+        assert root.time == op._profiler.py_timers['op-compile']
+        assert root.memory > 0
+
+        passes = root.children
+        assert list(passes) == ['lowering.Expressions', 'lowering.Clusters',
+                                'lowering.ScheduleTree', 'lowering.uIET',
+                                'lowering.IET']
+        assert sum(i.time for i in passes.values()) <= root.time
+
+        # Cluster passes report Cluster counts, IET passes IET node counts
+        clusters = passes['lowering.Clusters']
+        assert clusters.nodes_out == 3
+        assert clusters.children['schedule'].nodes_in == 1
+        iet = passes['lowering.IET'].children['specializing.IET']
+        assert iet.nodes_in > clusters.nodes_out
+        assert iet.children['place_definitions'].calls == 1
+        assert all(0 <= i.memory <= root.memory for i in passes.values())
+
+    @switchconfig(profiling_build=True)
+    def test_export(self, tmpdir):
+        import json
+
+        grid = Grid(shape=(4, 4))
+        u = TimeFunction(name='u', grid=grid)
+        f = Function(name='f', grid=grid)
+
+        op0 = Operator(Eq(u.forward, u.dx + 1))
+        op1 = Operator(Eq(f, f + 1))
+
+        profile = BuildProfile.aggregate([op0.build_profile, op1.build_profile, None])
+        assert profile.operators == 2
+        assert np.isclose(profile.time, op0.build_profile.time + op1.build_profile.time)
+        assert profile.memory == max(op0.build_profile.memory,
+                                     op1.build_profile.memory)
+
+        filename = str(tmpdir.join('profile.json'))
+        profile.to_json(filename)
+        with open(filename) as f:
+            data = json.load(f)
+        assert data['operators'] == 2
+        assert data['name'] == 'aggregate'
+        assert data['passes']['name'] == 'op-compile'
+        assert data['passes']['calls'] == 2
+        assert data['passes']['children'][0]['name'] == 'lowering.Expressions'
+
+        data = json.loads(profile.to_speedscope())
+        events = data['profiles'][0]['events']
+        assert len(events) >= 2*len(data['shared']['frames'])
+        assert [i['type'] for i in events[:2]] == ['O', 'O']
+        assert events[-1]['type'] == 'C'
+        assert all(i['at'] <= j['at'] for i, j in zip(events, events[1:]))
+        assert events[-1]['at'] == data['profiles'][0]['endValue']
+
+
+class TestCompileAll:
+
+    def test_basic(self):
+        grid = Grid(shape=(4, 4))
+        f = Function(name='f', grid=grid)
+        g = Function(name='g', grid=grid)
+
+        op0 = Operator(Eq(f, f + 1.))
+        op1 = Operator(Eq(g, g*2. + 3.))
+        op2 = Operator(Eq(f, f + 1.))
+
+        compile_all([op0, op1, op2], nprocs=2)
+
+        for op in [op0, op1, op2]:
+            assert op._lib is not None
+
+        op0.apply()
+        op1.apply()
+        op2.apply()
+        assert np.all(f.data == 2.)
+        assert np.all(g.data == 3.)
+
+    def test_already_compiled(self):
+        grid = Grid(shape=(4, 4))
+        f = Function(name='f', grid=grid)
+
+        op = Operator(Eq(f, f + 1.))
+        op.cfunction
+        lib = op._lib
+
+        compile_all(op)
+        assert op._lib is lib